@@ -0,0 +1,126 @@
+"""
+Check that the helpers shared by the two apps have not drifted apart
+
+The merge/search app (core/) and the data processor app
+(sysy/excel-data-processor/src/) are packaged and run separately, so each
+keeps its own copy of the text sniffer and the workbook metadata reader. The
+copies may differ in docstrings, logging and helper names, but the code of
+the shared functions and constants must stay the same: a bug fixed in one
+copy has to be fixed in the other.
+
+Usage:
+    python check_copies.py
+
+Exits with status 1 and lists the functions that differ when the copies
+are out of step.
+"""
+import ast
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DATA_PROCESSOR = os.path.join('sysy', 'excel-data-processor', 'src', 'data')
+
+# (root app module, data processor module, {root app name: data processor name})
+COPIES = [
+    (
+        os.path.join('core', 'text_sniffer.py'),
+        os.path.join(DATA_PROCESSOR, 'sniffer.py'),
+        {
+            'SAMPLE_SIZE': 'SAMPLE_SIZE',
+            'SAMPLE_LINES': 'SAMPLE_LINES',
+            'CANDIDATE_DELIMITERS': 'CANDIDATE_DELIMITERS',
+            'BOMS': 'BOMS',
+            'detect_encoding': 'detect_encoding',
+            '_is_number': '_is_number',
+            '_detect_delimiter': '_detect_delimiter',
+            '_has_header': '_has_header',
+        }
+    ),
+    (
+        os.path.join('core', 'xlsx_metadata.py'),
+        os.path.join(DATA_PROCESSOR, 'xlsx_metadata.py'),
+        {
+            'CELL_REF': 'CELL_REF',
+            'column_number': '_column_number',
+            'parse_dimension': 'parse_dimension',
+            'local_name': '_local_name',
+            'read_workbook': '_read_workbook',
+            '_sheet_dimension': '_read_dimension',
+            'describe_sheet_size': 'describe_sheet_size',
+        }
+    ),
+]
+
+
+class _Normalizer(ast.NodeTransformer):
+    """Strip docstrings and logger calls and rename helpers to their root app names"""
+    def __init__(self, renames):
+        self.renames = renames
+
+    def visit_FunctionDef(self, node):
+        node.name = self.renames.get(node.name, node.name)
+        if ast.get_docstring(node) is not None:
+            node.body = node.body[1:]
+        self.generic_visit(node)
+        return node
+
+    def visit_Expr(self, node):
+        call = node.value
+        if (isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute)
+                and isinstance(call.func.value, ast.Name) and call.func.value.id == 'logger'):
+            return ast.Pass()
+        return self.generic_visit(node)
+
+    def visit_Name(self, node):
+        node.id = self.renames.get(node.id, node.id)
+        return node
+
+
+def _definitions(path, renames):
+    """Normalized source of the top-level functions and constants of a module"""
+    with open(os.path.join(ROOT, path), encoding='utf-8') as f:
+        tree = _Normalizer(renames).visit(ast.parse(f.read()))
+
+    definitions = {}
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            definitions[node.name] = ast.dump(node)
+        elif isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            definitions[node.targets[0].id] = ast.dump(node.value)
+    return definitions
+
+
+def check_copies():
+    """
+    Compare every pair of copies
+
+    Returns:
+        List of messages describing the definitions that differ
+    """
+    problems = []
+    for root_path, copy_path, names in COPIES:
+        original = _definitions(root_path, {})
+        # Only the data processor's names are mapped back to the root app's
+        copy = _definitions(copy_path, {copy: root for root, copy in names.items()})
+        for name, copy_name in names.items():
+            if name not in original or name not in copy:
+                problems.append(f"{name} ({root_path}) / {copy_name} ({copy_path}): missing")
+            elif original[name] != copy[name]:
+                problems.append(f"{name} ({root_path}) / {copy_name} ({copy_path}): code differs")
+    return problems
+
+
+def main():
+    problems = check_copies()
+    for problem in problems:
+        print(problem)
+    if problems:
+        print("The shared copies are out of step; apply the same change to both")
+        return 1
+    print("The shared copies are in step")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
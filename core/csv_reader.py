@@ -0,0 +1,154 @@
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+# Files smaller than this are read with pandas; Arrow only pays off on large inputs
+ARROW_MIN_SIZE = 32 * 1024 * 1024
+
+
+def _arrow_string_types(arrow_type):
+    """Keep string columns Arrow-backed; other types convert to the usual numpy dtypes"""
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def read_csv_arrow(file_path, sep=',', quotechar='"', header=0, encoding='utf-8', skip_bad_lines=False):
+    """
+    Read a delimited file with the multithreaded Arrow CSV reader
+
+    String columns come back as Arrow-backed dtypes, which take far less
+    memory than Python string objects.
+
+    Returns:
+        DataFrame with the file data
+    """
+    read_options = pa_csv.ReadOptions(
+        use_threads=True,
+        encoding=encoding,
+        autogenerate_column_names=header is None
+    )
+    parse_options = pa_csv.ParseOptions(
+        delimiter=sep,
+        quote_char=quotechar or False,
+        invalid_row_handler=(lambda row: 'skip') if skip_bad_lines else None
+    )
+    table = pa_csv.read_csv(file_path, read_options=read_options, parse_options=parse_options)
+    df = table.to_pandas(types_mapper=_arrow_string_types)
+    if header is None:
+        # Match pandas, which numbers unnamed columns from 0
+        df.columns = range(len(df.columns))
+    return df
+
+
+def read_delimited(file_path, sep=',', quotechar='"', header=0, encoding='utf-8', skip_bad_lines=False, use_arrow=None,
+                   usecols=None):
+    """
+    Read a delimited text file with Arrow when available, otherwise with the
+    pandas C engine
+
+    Args:
+        file_path: File to read
+        sep: Field delimiter
+        quotechar: Quote character
+        header: Row number of the header, or None when there is no header
+        encoding: File encoding
+        skip_bad_lines: Skip rows with the wrong number of fields instead of failing
+        use_arrow: Force (True) or disable (False) the Arrow reader; by default it
+            is used for files of at least ARROW_MIN_SIZE bytes when pyarrow is installed
+        usecols: Optional list of columns to keep; columns missing from the file are ignored
+
+    Returns:
+        DataFrame with the file data
+    """
+    wanted = set(usecols) if usecols is not None else None
+    if use_arrow is None:
+        use_arrow = os.path.getsize(file_path) >= ARROW_MIN_SIZE
+    if use_arrow and HAS_ARROW:
+        try:
+            df = read_csv_arrow(file_path, sep, quotechar, header, encoding, skip_bad_lines)
+            if wanted is not None:
+                # Arrow needs the exact names up front, so the projection is applied after parsing
+                df = df[[col for col in df.columns if col in wanted]]
+            return df
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, LookupError) as e:
+            # Layouts Arrow can't parse (e.g. unsupported encodings) go through pandas
+            print(f"Arrow reader failed for {file_path}, using pandas: {str(e)}")
+
+    return pd.read_csv(
+        file_path,
+        sep=sep,
+        quotechar=quotechar,
+        header=header,
+        encoding=encoding,
+        on_bad_lines='skip' if skip_bad_lines else 'error',
+        usecols=(lambda col: col in wanted) if wanted is not None else None
+    )
+
+
+def _block_size_for_rows(file_path, rows, sample_size=1024 * 1024):
+    """Arrow block size (in bytes) holding about the given number of rows, judged from the file's first bytes"""
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+    lines = sample.count(b'\n') or 1
+    row_bytes = max(len(sample) // lines, 1)
+    # Arrow needs a block to hold at least one whole row
+    return int(min(max(row_bytes * rows, 1024 * 1024), 1024 ** 3))
+
+
+def iter_delimited_chunks(file_path, sep=',', quotechar='"', header=0, encoding='utf-8', chunk_size=100000):
+    """
+    Read a delimited text file chunk by chunk
+
+    Uses the Arrow streaming reader when pyarrow is installed, otherwise
+    pandas with chunksize, so only one chunk is in memory at a time. Arrow
+    blocks are sized to hold about chunk_size rows. Arrow infers the column
+    types from the first block; when a later block doesn't fit them (e.g. text
+    further down a column of numbers) the rest of the file is read by pandas.
+
+    Yields:
+        Tuples of (DataFrame, fraction) where fraction is the share of the
+        file read so far (between 0 and 1)
+    """
+    file_size = os.path.getsize(file_path) or 1
+    rows_done = 0
+
+    if HAS_ARROW:
+        with open(file_path, 'rb') as f:
+            try:
+                reader = pa_csv.open_csv(
+                    f,
+                    read_options=pa_csv.ReadOptions(
+                        encoding=encoding,
+                        autogenerate_column_names=header is None,
+                        block_size=_block_size_for_rows(file_path, chunk_size)
+                    ),
+                    parse_options=pa_csv.ParseOptions(delimiter=sep, quote_char=quotechar or False)
+                )
+                for batch in reader:
+                    df = batch.to_pandas(types_mapper=_arrow_string_types)
+                    if header is None:
+                        df.columns = range(len(df.columns))
+                    rows_done += len(df)
+                    yield df, min(f.tell() / file_size, 1.0)
+                return
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, LookupError) as e:
+                print(f"Arrow reader failed for {file_path} after {rows_done} rows, using pandas: {str(e)}")
+
+    # Rows already yielded by Arrow are skipped; the header line stays in place
+    skiprows = (range(1, rows_done + 1) if header is not None else rows_done) if rows_done else None
+    with open(file_path, 'rb') as f:
+        chunks = pd.read_csv(
+            f, sep=sep, quotechar=quotechar, header=header, encoding=encoding,
+            chunksize=chunk_size, skiprows=skiprows
+        )
+        for df in chunks:
+            # The parser reads ahead in blocks, so the position is approximate
+            yield df, min(f.tell() / file_size, 1.0)
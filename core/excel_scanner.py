@@ -0,0 +1,203 @@
+import zipfile
+import xml.etree.ElementTree as ET
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_datetime, is_timedelta_format
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import MAC_EPOCH, WINDOWS_EPOCH, from_excel
+
+from core.text_search import contains_any, normalize_search_terms
+from core.xlsx_metadata import local_name, read_workbook
+
+
+def _element_text(element):
+    """Concatenate the text of all <t> elements below an element (rich text runs)"""
+    return "".join(node.text or "" for node in element.iter() if local_name(node.tag) == "t")
+
+
+def _format_date(value, kind, epoch):
+    """Text of a date-formatted number such as '2023-05-01', or None if it is out of range"""
+    try:
+        serial = float(value)
+        if kind == "timedelta":
+            return str(from_excel(serial, epoch, timedelta=True))
+        moment = from_excel(serial, epoch)
+    except (ValueError, OverflowError):
+        return None
+    if kind == "date" and hasattr(moment, "date"):
+        moment = moment.date()
+    elif kind == "time" and hasattr(moment, "time"):
+        moment = moment.time()
+    return str(moment)
+
+
+class XlsxCellScanner:
+    """
+    Streams cell values straight from the XML parts of an .xlsx file.
+
+    Nothing is loaded into a DataFrame or an openpyxl workbook: shared strings
+    are read once and matched in bulk (each distinct string is tested only
+    once however many cells use it), then every worksheet is parsed
+    incrementally and matching cells are yielded as they are found.
+
+    Numbers are compared by their stored value; cells whose style has a date or
+    time number format are converted first, so a date matches '2023-05-01'
+    rather than its serial number.
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def date_styles(self, archive):
+        """
+        Find the cell styles that display numbers as dates or times
+
+        Args:
+            archive: Open ZipFile of the workbook
+
+        Returns:
+            Dictionary of style index -> 'date', 'time', 'datetime' or 'timedelta'
+        """
+        styles = {}
+        if "xl/styles.xml" not in archive.namelist():
+            return styles
+
+        root = ET.fromstring(archive.read("xl/styles.xml"))
+        formats = dict(BUILTIN_FORMATS)
+        for element in root.iter():
+            if local_name(element.tag) == "numFmt":
+                formats[int(element.get("numFmtId"))] = element.get("formatCode", "")
+
+        cell_formats = next((element for element in root if local_name(element.tag) == "cellXfs"), None)
+        if cell_formats is None:
+            return styles
+        for index, xf in enumerate(element for element in cell_formats if local_name(element.tag) == "xf"):
+            code = formats.get(int(xf.get("numFmtId", 0)))
+            if not code:
+                continue
+            kind = "timedelta" if is_timedelta_format(code) else is_datetime(code)
+            if kind:
+                styles[index] = kind
+        return styles
+
+    def matching_shared_strings(self, archive, needles):
+        """
+        Read the shared string table and keep only the strings that match
+
+        Args:
+            archive: Open ZipFile of the workbook
+            needles: List of lower-case search terms, or None to keep every string
+
+        Returns:
+            Dictionary of shared string index -> text
+        """
+        matches = {}
+        if "xl/sharedStrings.xml" not in archive.namelist():
+            return matches
+
+        with archive.open("xl/sharedStrings.xml") as strings_file:
+            index = 0
+            for _, element in ET.iterparse(strings_file, events=("end",)):
+                if local_name(element.tag) != "si":
+                    continue
+                text = _element_text(element)
+                if needles is None or contains_any(text, needles):
+                    matches[index] = text
+                index += 1
+                element.clear()
+        return matches
+
+    def iter_cells(self, search_string=None, max_hits=None):
+        """
+        Yield the cells whose value contains any of the search terms (case-insensitive)
+
+        Args:
+            search_string: A search term or a list of terms, or None to yield every non-empty cell
+            max_hits: Stop after this many hits (None for no limit)
+
+        Yields:
+            Tuples of (sheet_name, cell_reference, text)
+        """
+        needles = None
+        if search_string is not None:
+            needles = [term.lower() for term in normalize_search_terms(search_string)]
+        hits = 0
+
+        with zipfile.ZipFile(self.file_path) as archive:
+            shared_strings = self.matching_shared_strings(archive, needles)
+            date_styles = self.date_styles(archive)
+            sheets, date1904 = read_workbook(archive)
+            epoch = MAC_EPOCH if date1904 else WINDOWS_EPOCH
+
+            for sheet in sheets:
+                if not sheet["part"]:
+                    continue
+                sheet_name = sheet["name"]
+                with archive.open(sheet["part"]) as sheet_file:
+                    row_number = 0
+                    column_number = 0
+
+                    for event, element in ET.iterparse(sheet_file, events=("start", "end")):
+                        tag = local_name(element.tag)
+
+                        if event == "start":
+                            if tag == "row":
+                                row_number = int(element.get("r", row_number + 1))
+                                column_number = 0
+                            continue
+
+                        if tag == "row":
+                            # Cells are done with once their row is complete
+                            element.clear()
+                            continue
+                        if tag != "c":
+                            continue
+
+                        reference = element.get("r")
+                        if reference is None:
+                            # Some writers omit references; count positions instead
+                            column_number += 1
+                            reference = f"{get_column_letter(column_number)}{row_number}"
+                        text = self._cell_text(element, shared_strings, date_styles, epoch)
+
+                        if text is None or not text.strip():
+                            continue
+                        if needles is not None and element.get("t") != "s" and not contains_any(text, needles):
+                            continue
+
+                        yield sheet_name, reference, text
+                        hits += 1
+                        if max_hits is not None and hits >= max_hits:
+                            return
+
+    def _cell_text(self, element, shared_strings, date_styles=None, epoch=WINDOWS_EPOCH):
+        """Text of a cell, or None for shared strings that did not match"""
+        cell_type = element.get("t")
+
+        if cell_type == "inlineStr":
+            return _element_text(element)
+
+        value = next((child.text for child in element if local_name(child.tag) == "v"), None)
+        if value is None:
+            return None
+        if cell_type == "s":
+            return shared_strings.get(int(value))
+        if cell_type == "b":
+            return "TRUE" if value == "1" else "FALSE"
+        if cell_type in (None, "n") and date_styles:
+            kind = date_styles.get(int(element.get("s", 0)))
+            if kind:
+                return _format_date(value, kind, epoch) or value
+        return value
+
+
+def scan_xlsx(file_path, search_string, max_hits=None):
+    """
+    Search an .xlsx file cell by cell without loading it
+
+    Returns:
+        List of (location, content) tuples such as ('Sheet1!B7', 'value')
+    """
+    scanner = XlsxCellScanner(file_path)
+    return [
+        (f"{sheet_name}!{reference}", text)
+        for sheet_name, reference, text in scanner.iter_cells(search_string, max_hits)
+    ]
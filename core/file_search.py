@@ -0,0 +1,232 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from core.excel_scanner import XlsxCellScanner, scan_xlsx
+from core.text_search import contains_any, normalize_search_terms, search_text_file_mmap
+
+DEFAULT_EXTENSIONS = ['.txt', '.xlsx', '.xls', '.csv']
+TEXT_EXTENSIONS = ('.txt', '.csv')
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+
+
+def search_text_file(file_path, search_string, max_hits=None):
+    """
+    Search for a string (or a list of strings) in a text file and return
+    matches with line numbers.
+    """
+    try:
+        return search_text_file_mmap(file_path, search_string, max_hits)
+    except Exception as e:
+        return [f"Error reading file: {str(e)}"]
+
+
+def search_excel_file(file_path, search_string, max_hits=None):
+    """
+    Search for a string (or a list of strings) in an Excel file and return
+    matches with cell references.
+    """
+    try:
+        if os.path.splitext(file_path)[1].lower() == '.xlsx':
+            # Stream the cells straight from the workbook XML
+            try:
+                return scan_xlsx(file_path, search_string, max_hits)
+            except Exception:
+                return _search_workbook_read_only(file_path, search_string, max_hits)
+
+        return _search_excel_with_pandas(file_path, search_string, max_hits)
+    except Exception as e:
+        return [f"Error reading Excel file: {str(e)}"]
+
+
+def _search_workbook_read_only(file_path, search_string, max_hits=None):
+    """Search a workbook through openpyxl in read-only mode"""
+    needles = [term.lower() for term in normalize_search_terms(search_string)]
+    matches = []
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet in wb.worksheets:
+            for row in sheet.iter_rows():
+                for cell in row:
+                    if cell.value is not None and contains_any(str(cell.value), needles):
+                        matches.append((f"{sheet.title}!{cell.coordinate}", str(cell.value)))
+                        if max_hits is not None and len(matches) >= max_hits:
+                            return matches
+    finally:
+        wb.close()
+    return matches
+
+
+def _search_excel_with_pandas(file_path, search_string, max_hits=None):
+    """Search legacy .xls files, which only pandas can read"""
+    needles = [term.lower() for term in normalize_search_terms(search_string)]
+    matches = []
+    excel_file = pd.ExcelFile(file_path)
+    for sheet_name in excel_file.sheet_names:
+        df = pd.read_excel(excel_file, sheet_name=sheet_name, dtype=str)
+
+        # Match whole columns at once and only visit the hits
+        for col in df.columns:
+            lowered = df[col].str.lower()
+            hits = lowered.str.contains(needles[0], regex=False, na=False)
+            for needle in needles[1:]:
+                hits |= lowered.str.contains(needle, regex=False, na=False)
+            for row_idx in hits.to_numpy().nonzero()[0]:
+                cell_ref = f"{sheet_name}!{col}{row_idx+2}"  # +2 because of 0-indexing and header
+                matches.append((cell_ref, df[col].iat[row_idx]))
+                if max_hits is not None and len(matches) >= max_hits:
+                    return matches
+    return matches
+
+
+def search_file(file_path, search_string, max_hits=None):
+    """Search a single file with the searcher matching its extension."""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in EXCEL_EXTENSIONS:
+        return search_excel_file(file_path, search_string, max_hits)
+    if extension in TEXT_EXTENSIONS:
+        return search_text_file(file_path, search_string, max_hits)
+    return []
+
+
+def iter_file_entries(file_path):
+    """
+    Yield every searchable piece of text in a file with its location
+
+    Text files yield one entry per line, Excel files one entry per non-empty cell.
+
+    Yields:
+        Tuples of (location, text)
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+
+    if extension in TEXT_EXTENSIONS:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
+            for line_num, line in enumerate(file, 1):
+                line = line.strip()
+                if line:
+                    yield f"Line {line_num}", line
+
+    elif extension == '.xlsx':
+        for sheet_name, reference, text in XlsxCellScanner(file_path).iter_cells():
+            yield f"{sheet_name}!{reference}", text
+
+    elif extension in EXCEL_EXTENSIONS:
+        # Legacy formats are read through pandas; cells are referenced by header name
+        excel_file = pd.ExcelFile(file_path)
+        for sheet_name in excel_file.sheet_names:
+            df = pd.read_excel(excel_file, sheet_name=sheet_name)
+            for col in df.columns:
+                for row_idx, value in enumerate(df[col]):
+                    if pd.notna(value) and str(value).strip():
+                        yield f"{sheet_name}!{col}{row_idx+2}", str(value)
+
+
+def iter_files(folder_path, file_extensions=None):
+    """
+    Walk a folder lazily and yield the files with one of the given extensions
+
+    Args:
+        folder_path: Folder to walk
+        file_extensions: List of extensions (with leading dot) to include
+
+    Yields:
+        Full file paths
+    """
+    if file_extensions is None:
+        file_extensions = DEFAULT_EXTENSIONS
+    file_extensions = {ext.lower() for ext in file_extensions}
+
+    for root, _, files in os.walk(folder_path):
+        for file in files:
+            if os.path.splitext(file)[1].lower() in file_extensions:
+                yield os.path.join(root, file)
+
+
+class FolderSearch:
+    """
+    Searches the files of a folder on a bounded worker pool and yields the
+    matches of each file as soon as that file has been searched.
+    """
+    def __init__(self, max_workers=None, use_processes=True, search_func=search_file, max_hits_per_file=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.search_func = search_func
+        self.max_hits_per_file = max_hits_per_file
+
+        # Never queue more than this many files ahead of the workers
+        self.max_pending = self.max_workers * 4
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """
+        Stop the running search (safe to call from any thread)
+
+        A cancelled FolderSearch stays cancelled, even if the search has not
+        started yet; use a new one for the next search.
+        """
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def iter_results(self, folder_path, search_string, file_extensions=None):
+        """
+        Search a folder and yield results as they are found
+
+        Args:
+            folder_path: Folder to search recursively
+            search_string: Text to search for, or a list of texts (a line or
+                cell matches when it contains any of them)
+            file_extensions: List of extensions to include
+
+        Yields:
+            Tuples of (file_path, matches) for files with at least one match,
+            in completion order
+        """
+        executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        executor = executor_class(max_workers=self.max_workers)
+
+        files = iter_files(folder_path, file_extensions)
+        files_exhausted = False
+        pending = {}
+
+        try:
+            while not self._cancel_event.is_set():
+                # Keep the pool busy without walking the whole tree up front
+                while not files_exhausted and len(pending) < self.max_pending:
+                    file_path = next(files, None)
+                    if file_path is None:
+                        files_exhausted = True
+                        break
+                    pending[executor.submit(self.search_func, file_path, search_string, self.max_hits_per_file)] = file_path
+
+                if not pending:
+                    break
+
+                # Wake up regularly so a cancel request is noticed quickly
+                done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = pending.pop(future)
+                    try:
+                        matches = future.result()
+                    except Exception as e:
+                        matches = [f"Error reading file: {str(e)}"]
+
+                    if matches:
+                        yield file_path, matches
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def search(self, folder_path, search_string, file_extensions=None):
+        """
+        Search a folder and collect all results
+
+        Returns:
+            Dictionary with file paths as keys and matches as values
+        """
+        return dict(self.iter_results(folder_path, search_string, file_extensions))
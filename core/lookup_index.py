@@ -0,0 +1,389 @@
+import csv
+import threading
+from bisect import bisect_right
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+# Characters that make a search term a regular expression (str.contains semantics)
+REGEX_CHARACTERS = set(".^$*+?{}[]\\|()")
+
+# Columns added by the merge, left out of the context shown with a match
+SOURCE_COLUMNS = ('Source_File', 'Sheet_Name', 'Source_Folder')
+
+RESULT_HEADERS = ['Folder', 'File', 'Sheet', 'Row', 'Column', 'Matching Value', 'Context']
+
+
+def _gather_ranges(values, starts, stops):
+    """Concatenate values[start:stop] for every pair of bounds without a Python loop"""
+    lengths = stops - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return values[:0]
+    # Offset of each output position within its range, added to the range start
+    range_starts = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return values[range_starts + np.arange(total)]
+
+
+class LookupIndex:
+    """
+    Inverted index over the cells of the merged DataFrames.
+
+    Every distinct cell text is stored once and indexed by the character
+    n-grams of its lower-case form. For each column of each DataFrame the
+    index keeps the value id of every non-empty cell sorted by value id, so
+    the rows holding a set of matching values are found with binary search.
+
+    A search first finds the matching distinct values (n-gram intersection,
+    then a substring check on the candidates only) and then maps them to
+    rows, so its cost depends on the number of distinct values and hits
+    rather than on the number of cells.
+
+    Frames can be added and removed one at a time, so the index is kept up to
+    date incrementally after each merge. Every value counts the indexed
+    columns that hold it; values no longer held by any column are dropped
+    with their n-gram postings and their ids are reused.
+    """
+    NGRAM_SIZE = 3
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self.ready = False
+        self.source = None  # What the frame keys refer to, e.g. the merged folder
+        self._generation = 0  # Id of the latest requested sync
+        self._pending_changes = set()  # Changed keys of requested syncs not run yet
+        self.clear()
+
+    def clear(self):
+        """Drop all frames and values"""
+        with self._lock:
+            self.values = []  # Distinct cell texts, indexed by value id (None for free ids)
+            self._value_ids = {}
+            self._ngrams = defaultdict(list)  # n-gram -> value ids
+            self._refcounts = []  # Number of indexed columns holding each value id
+            self._free_ids = []  # Ids of dropped values, reused by _intern
+            self._entries = {}  # frame key -> list of (column, sorted value ids, rows)
+            self._values_series = None  # Cached Series of self.values for full scans
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _grams(self, text):
+        lowered = text.lower()
+        n = self.NGRAM_SIZE
+        return {lowered[i:i + n] for i in range(len(lowered) - n + 1)}
+
+    def _intern(self, text):
+        """Return the value id of a text, adding it to the index if it is new"""
+        value_id = self._value_ids.get(text)
+        if value_id is None:
+            if self._free_ids:
+                value_id = self._free_ids.pop()
+                self.values[value_id] = text
+                self._refcounts[value_id] = 0
+            else:
+                value_id = len(self.values)
+                self.values.append(text)
+                self._refcounts.append(0)
+            self._value_ids[text] = value_id
+
+            for gram in self._grams(text):
+                self._ngrams[gram].append(value_id)
+        return value_id
+
+    def _release(self, entries):
+        """Drop the references of a frame's entries, and the values no column holds any more"""
+        dropped = []
+        for _, cell_ids, _ in entries:
+            for value_id in np.unique(cell_ids):
+                self._refcounts[value_id] -= 1
+                if self._refcounts[value_id] == 0:
+                    dropped.append(int(value_id))
+        if not dropped:
+            return
+
+        dropped_set = set(dropped)
+        grams = set()
+        for value_id in dropped:
+            text = self.values[value_id]
+            del self._value_ids[text]
+            grams.update(self._grams(text))
+            self.values[value_id] = None
+        for gram in grams:
+            kept = [value_id for value_id in self._ngrams[gram] if value_id not in dropped_set]
+            if kept:
+                self._ngrams[gram] = kept
+            else:
+                del self._ngrams[gram]
+        self._free_ids.extend(dropped)
+
+    def add_frame(self, key, df):
+        """Index (or re-index) all cells of a DataFrame under the given key"""
+        prepared = []
+        for col in df.columns:
+            # Factorize outside the lock; only the distinct values are interned
+            codes, uniques = pd.factorize(df[col])
+            prepared.append((col, codes, pd.Index(uniques).astype(str)))
+
+        with self._lock:
+            entries = []
+            for col, codes, texts in prepared:
+                value_ids = np.fromiter((self._intern(text) for text in texts), dtype=np.int64, count=len(texts))
+
+                rows = np.flatnonzero(codes >= 0)  # Empty cells are not indexed
+                cell_ids = value_ids[codes[rows]]
+                order = np.argsort(cell_ids, kind='stable')
+                for value_id in np.unique(cell_ids):
+                    self._refcounts[value_id] += 1
+                entries.append((col, cell_ids[order], rows[order]))
+
+            # Released after the new entries took their references, so shared values are kept
+            previous = self._entries.get(key)
+            self._entries[key] = entries
+            if previous is not None:
+                self._release(previous)
+            self._values_series = None
+
+    def remove_frame(self, key):
+        """Drop the cells of a DataFrame from the index"""
+        with self._lock:
+            entries = self._entries.pop(key, None)
+            if entries is not None:
+                self._release(entries)
+                self._values_series = None
+
+    def begin_sync(self, changed_keys=None):
+        """
+        Mark the index as out of date ahead of a sync
+
+        Args:
+            changed_keys: Optional collection of keys whose data has changed; they
+                are kept until a sync runs, even if this one is superseded
+
+        Returns:
+            Generation id to pass to sync; only the sync of the latest
+            generation marks the index ready again
+        """
+        with self._lock:
+            self._generation += 1
+            self._pending_changes.update(changed_keys or ())
+            self.ready = False
+            return self._generation
+
+    def sync(self, frames, changed_keys=None, source=None, generation=None):
+        """
+        Bring the index up to date with a mapping of key -> DataFrame
+
+        Frames that are not indexed yet or whose key is in changed_keys are
+        (re-)indexed, and keys that are no longer in frames are dropped. When
+        source differs from the source of the last sync the same keys may name
+        different data, so the index is rebuilt from scratch.
+
+        Args:
+            frames: Mapping of key -> DataFrame (e.g. ExcelMerger.all_dataframes)
+            changed_keys: Optional collection of keys whose data has changed
+            source: Optional identity of what the keys refer to (e.g. the input folder)
+            generation: Optional id returned by begin_sync; a sync superseded by a
+                newer begin_sync is skipped and never marks the index ready
+        """
+        with self._sync_lock:
+            if generation is not None and generation != self._generation:
+                return
+            with self._lock:
+                changed_keys = set(changed_keys or ()) | self._pending_changes
+                self._pending_changes = set()
+            self.ready = False
+            try:
+                if source != self.source:
+                    self.clear()
+                    self.source = source
+                for key in [key for key in self._entries if key not in frames]:
+                    self.remove_frame(key)
+                for key in list(frames.keys()):
+                    if key not in self._entries or key in changed_keys:
+                        self.add_frame(key, frames[key])
+            finally:
+                # Frames of a newer merge may be waiting for their own sync
+                if generation is None or generation == self._generation:
+                    self.ready = True
+
+    def columns(self):
+        """All indexed column names in order of first appearance"""
+        with self._lock:
+            return list(dict.fromkeys(col for entries in self._entries.values() for col, _, _ in entries))
+
+    def matching_values(self, search_term, case_sensitive=False):
+        """
+        Find the distinct values that contain the search term
+
+        Terms with regular expression characters are matched as regular
+        expressions against the distinct values, like str.contains does.
+
+        Returns:
+            Sorted numpy array of value ids
+        """
+        with self._lock:
+            if REGEX_CHARACTERS.intersection(search_term) or len(search_term) < self.NGRAM_SIZE:
+                # No usable n-grams: scan the distinct values (still far fewer than the cells)
+                if self._values_series is None:
+                    self._values_series = pd.Series(self.values, dtype=object)
+                mask = self._values_series.str.contains(
+                    search_term, case=case_sensitive, regex=bool(REGEX_CHARACTERS.intersection(search_term)), na=False
+                )
+                return np.flatnonzero(mask.to_numpy())
+
+            needle = search_term.lower()
+            n = self.NGRAM_SIZE
+            grams = {needle[i:i + n] for i in range(len(needle) - n + 1)}
+            postings = sorted((self._ngrams.get(gram, []) for gram in grams), key=len)
+            if not postings[0]:
+                return np.empty(0, dtype=np.int64)
+
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    break
+
+            if case_sensitive:
+                matches = [value_id for value_id in candidates if search_term in self.values[value_id]]
+            else:
+                matches = [value_id for value_id in candidates if needle in self.values[value_id].lower()]
+            return np.array(sorted(matches), dtype=np.int64)
+
+    def search(self, search_term, column=None, case_sensitive=False):
+        """
+        Find the cells that contain the search term
+
+        Args:
+            search_term: Text to look for
+            column: Optional column name to restrict the search to
+            case_sensitive: Match case exactly
+
+        Returns:
+            List of (key, column, rows) tuples in frame and column order, where
+            rows is a sorted numpy array of row positions in the DataFrame
+        """
+        value_ids = self.matching_values(search_term, case_sensitive)
+        results = []
+        if len(value_ids) == 0:
+            return results
+
+        with self._lock:
+            for key, entries in self._entries.items():
+                for col, sorted_ids, rows in entries:
+                    if column is not None and col != column:
+                        continue
+                    starts = np.searchsorted(sorted_ids, value_ids, side='left')
+                    stops = np.searchsorted(sorted_ids, value_ids, side='right')
+                    hit = stops > starts
+                    if not hit.any():
+                        continue
+                    results.append((key, col, np.sort(_gather_ranges(rows, starts[hit], stops[hit]))))
+        return results
+
+
+class LookupCursor:
+    """
+    Lazy, random-access view over the matches of a lookup.
+
+    Only the row positions of the matches are held; the result rows (values
+    and context) are formatted when a range of them is requested, so a page
+    of results costs the same whatever the total number of matches. The total
+    and per-file counts are known up front.
+    """
+    def __init__(self, hits, frames, context_size=3):
+        """
+        Args:
+            hits: List of (key, column, rows) tuples as returned by LookupIndex.search
+            frames: Mapping of key -> DataFrame the hits refer to
+            context_size: Number of leading columns shown as context
+        """
+        self.hits = [hit for hit in hits if len(hit[2])]
+        self.frames = frames
+        self.context_size = context_size
+
+        # Position of the first match of each hit in the whole result
+        self._starts = []
+        total = 0
+        for _, _, rows in self.hits:
+            self._starts.append(total)
+            total += len(rows)
+        self.total = total
+
+    def __len__(self):
+        return self.total
+
+    def counts_by_file(self):
+        """Dictionary of frame key -> number of matches"""
+        counts = {}
+        for key, _, rows in self.hits:
+            counts[key] = counts.get(key, 0) + len(rows)
+        return counts
+
+    def rows(self, start=0, stop=None):
+        """
+        Yield formatted result rows in the range [start, stop)
+
+        Yields:
+            Tuples of (folder, file, sheet, excel_row, column, value, context)
+        """
+        stop = self.total if stop is None else min(stop, self.total)
+        if start >= stop:
+            return
+
+        hit_index = bisect_right(self._starts, start) - 1
+        position = start
+        frame_key = None
+
+        while position < stop:
+            key, col, rows = self.hits[hit_index]
+            if key != frame_key:
+                frame_key = key
+                df = self.frames[key]
+                folder, file_name, sheet_name = key.split('|')
+                context_cols = [c for c in df.columns if c not in SOURCE_COLUMNS][:self.context_size]
+                context_positions = [df.columns.get_loc(c) for c in context_cols]
+            col_position = df.columns.get_loc(col)
+
+            offset = position - self._starts[hit_index]
+            for row_position in rows[offset:offset + stop - position]:
+                context = " | ".join(f"{c}: {df.iat[row_position, p]}" for c, p in zip(context_cols, context_positions))
+                yield (
+                    folder,
+                    file_name,
+                    sheet_name,
+                    int(row_position) + 2,  # +2 for Excel row number (header + 1-based index)
+                    col,
+                    str(df.iat[row_position, col_position]),
+                    context
+                )
+                position += 1
+            hit_index += 1
+
+    def __iter__(self):
+        return self.rows()
+
+    def export(self, output_file):
+        """
+        Stream all results to a CSV or Excel file without building a list
+
+        Returns:
+            Number of rows written
+        """
+        if output_file.lower().endswith('.csv'):
+            with open(output_file, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(RESULT_HEADERS)
+                writer.writerows(self.rows())
+        else:
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet("Results")
+            ws.append(RESULT_HEADERS)
+            for row in self.rows():
+                ws.append(row)
+            wb.save(output_file)
+        return self.total
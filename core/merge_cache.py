@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+
+DEFAULT_CACHE_ROOT = os.path.join(os.path.expanduser("~"), ".excel_merger", "merge_cache")
+# Total size of the caches of all folders; the least recently used folders are evicted beyond it
+DEFAULT_CACHE_LIMIT = 2 * 1024 ** 3
+
+
+def file_content_hash(file_path, block_size=1024 * 1024):
+    """Hash the content of a file block by block"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MergeCache:
+    """
+    Manifest of the source files of a folder merge plus a cache of their parsed frames.
+
+    For every source file the manifest records its size, modification time and
+    content hash together with the cached pieces (one DataFrame per sheet).
+    A file is considered unchanged when its size and mtime match; when they
+    differ the content hash decides, so files that were only touched are not
+    parsed again.
+    """
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(self, input_folder, cache_root=DEFAULT_CACHE_ROOT, reader_options=None, max_bytes=DEFAULT_CACHE_LIMIT):
+        self.input_folder = os.path.abspath(input_folder)
+        folder_key = hashlib.blake2b(self.input_folder.encode('utf-8'), digest_size=8).hexdigest()
+        self.cache_root = cache_root
+        self.max_bytes = max_bytes
+        self.cache_dir = os.path.join(cache_root, folder_key)
+        self.manifest_path = os.path.join(self.cache_dir, self.MANIFEST_NAME)
+
+        # Pieces parsed with other reader options can't be reused
+        self.reader_options = reader_options or {}
+        self.entries = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if manifest.get('input_folder') != self.input_folder or manifest.get('reader_options') != self.reader_options:
+            return {}
+        return manifest.get('files', {})
+
+    def save(self):
+        """Write the manifest to disk"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        manifest = {
+            'input_folder': self.input_folder,
+            'reader_options': self.reader_options,
+            'files': self.entries
+        }
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, self.manifest_path)
+
+    def _piece_path(self, file_path, index):
+        file_key = hashlib.blake2b(os.path.abspath(file_path).encode('utf-8'), digest_size=12).hexdigest()
+        return os.path.join(self.cache_dir, f"{file_key}_{index}.pkl")
+
+    def is_current(self, file_path):
+        """Check whether the cached pieces of a file are up to date, without loading them"""
+        entry = self.entries.get(os.path.abspath(file_path))
+        if entry is None:
+            return False
+
+        try:
+            stat = os.stat(file_path)
+            if entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime:
+                if entry['size'] != stat.st_size or entry['hash'] != file_content_hash(file_path):
+                    return False
+                # Same content with a new timestamp
+                entry['mtime'] = stat.st_mtime
+            return True
+        except (OSError, KeyError):
+            return False
+
+    def load(self, file_path):
+        """
+        Return the cached pieces of a file if the file has not changed
+
+        Returns:
+            List of (lookup_key, DataFrame) tuples, or None when the file must be parsed
+        """
+        if not self.is_current(file_path):
+            return None
+
+        try:
+            entry = self.entries[os.path.abspath(file_path)]
+            return [(key, pd.read_pickle(piece_path)) for key, piece_path in entry['pieces']]
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+
+    def signature(self, file_path):
+        """
+        Size, modification time and content hash of a file
+
+        Take it before the file is parsed: an edit made while parsing then
+        shows up as a changed file on the next merge instead of being hidden.
+        """
+        stat = os.stat(file_path)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime, 'hash': file_content_hash(file_path)}
+
+    def store(self, file_path, pieces, signature=None):
+        """
+        Cache the parsed pieces of a file and record it in the manifest
+
+        Args:
+            file_path: Source file of the pieces
+            pieces: List of (lookup_key, DataFrame) tuples
+            signature: Result of signature() taken before the file was parsed;
+                taken now when not given
+        """
+        file_path = os.path.abspath(file_path)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if signature is None:
+            signature = self.signature(file_path)
+
+        self._remove_pieces(file_path)
+        stored = []
+        for index, (key, df) in enumerate(pieces):
+            piece_path = self._piece_path(file_path, index)
+            df.to_pickle(piece_path)
+            stored.append([key, piece_path])
+
+        self.entries[file_path] = dict(signature, pieces=stored)
+
+    def _remove_pieces(self, file_path):
+        entry = self.entries.pop(file_path, None)
+        if not entry:
+            return
+        for _, piece_path in entry['pieces']:
+            try:
+                os.remove(piece_path)
+            except OSError:
+                pass
+
+    def prune(self, current_paths):
+        """
+        Drop files that are no longer part of the merge
+
+        Returns:
+            List of removed file paths
+        """
+        current = {os.path.abspath(path) for path in current_paths}
+        removed = [path for path in self.entries if path not in current]
+        for path in removed:
+            self._remove_pieces(path)
+        return removed
+
+    def trim(self):
+        """
+        Evict the caches of other folders to keep the cache root within max_bytes
+
+        Caches of folders that no longer exist are always removed; the least
+        recently saved others go next until the total fits. The cache of this
+        folder is never evicted.
+
+        Returns:
+            Number of folder caches removed
+        """
+        try:
+            names = os.listdir(self.cache_root)
+        except OSError:
+            return 0
+
+        folders = []
+        total = 0
+        for name in names:
+            cache_dir = os.path.join(self.cache_root, name)
+            if not os.path.isdir(cache_dir):
+                continue
+            size = 0
+            for entry in os.scandir(cache_dir):
+                try:
+                    size += entry.stat().st_size
+                except OSError:
+                    pass
+            total += size
+            if os.path.abspath(cache_dir) == os.path.abspath(self.cache_dir):
+                continue
+
+            manifest_path = os.path.join(cache_dir, self.MANIFEST_NAME)
+            try:
+                last_used = os.path.getmtime(manifest_path)
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    input_folder = json.load(f).get('input_folder')
+            except (OSError, ValueError):
+                last_used, input_folder = 0, None
+            orphaned = not input_folder or not os.path.isdir(input_folder)
+            folders.append((not orphaned, last_used, size, cache_dir))
+
+        removed = 0
+        for in_use, _, size, cache_dir in sorted(folders):
+            if in_use and total <= self.max_bytes:
+                break
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,144 @@
+import os
+import pickle
+import shutil
+import tempfile
+import weakref
+from collections.abc import Mapping
+
+import pandas as pd
+from openpyxl import Workbook
+
+# Rows converted to Python values at a time when streaming to Excel
+WRITE_CHUNK_ROWS = 10000
+# Excel's sheet size limit, header row included
+MAX_EXCEL_ROWS = 1048576
+
+
+class SpilledMerge(Mapping):
+    """
+    Staging area for an out-of-core folder merge.
+
+    Every piece (one sheet of one file) is pickled to its own file as soon as
+    it is read, so only one piece is held in memory at a time. The union of
+    the columns is tracked as pieces are added, in the same order pd.concat
+    would produce, and the merged output is streamed piece by piece.
+
+    The staging area also behaves as a read-only mapping of lookup key ->
+    DataFrame that loads pieces on access, so it can stand in for the
+    all_dataframes dictionary of an in-memory merge.
+    """
+    def __init__(self, directory=None):
+        self.directory = tempfile.mkdtemp(prefix="excel_merger_", dir=directory)
+        self.columns = []
+        self.row_count = 0
+        self._pieces = {}  # lookup key -> (path, row count)
+        self._column_set = set()
+        self._counter = 0  # numbers the piece files, never reused
+
+        # Remove the staged files once the merge is no longer referenced
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+
+    def append(self, key, df):
+        """Stage one piece of the merge, replacing the piece already staged under the key"""
+        previous = self._pieces.get(key)
+        if previous is not None:
+            path = previous[0]
+        else:
+            self._counter += 1
+            path = os.path.join(self.directory, f"{self._counter}.pkl")
+        with open(path, 'wb') as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if previous is not None:
+            self.row_count -= previous[1]
+        self._pieces[key] = (path, len(df))
+        self.row_count += len(df)
+
+        for col in df.columns:
+            if col not in self._column_set:
+                self._column_set.add(col)
+                self.columns.append(col)
+
+    def __getitem__(self, key):
+        path, _ = self._pieces[key]
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def __iter__(self):
+        return iter(self._pieces)
+
+    def __len__(self):
+        return len(self._pieces)
+
+    def iter_frames(self):
+        """Yield the staged pieces one at a time, aligned to the union of the columns"""
+        for key in self._pieces:
+            yield self[key].reindex(columns=self.columns)
+
+    def write_csv(self, output_file):
+        """Stream the merged data to a CSV file"""
+        header = True
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            if not self._pieces:
+                pd.DataFrame(columns=self.columns).to_csv(f, index=False)
+            for df in self.iter_frames():
+                df.to_csv(f, index=False, header=header)
+                header = False
+
+    def write_excel(self, output_file, sheet_name='Merged_Data', extra_sheets=None):
+        """
+        Stream the merged data to an Excel file through a write-only workbook
+
+        When the data reaches Excel's row limit it continues on a new sheet
+        (sheet_name_2, sheet_name_3, ...) with the header repeated.
+
+        Args:
+            output_file: Path of the .xlsx file to create
+            sheet_name: Name of the sheet holding the merged data
+            extra_sheets: Optional dictionary of sheet name -> DataFrame written after the data
+
+        Returns:
+            Number of sheets holding the merged data
+        """
+        wb = Workbook(write_only=True)
+        header = [str(col) for col in self.columns]
+        ws = wb.create_sheet(sheet_name)
+        ws.append(header)
+        sheet_count = 1
+        sheet_rows = 0
+        for df in self.iter_frames():
+            start = 0
+            while start < len(df):
+                if sheet_rows >= MAX_EXCEL_ROWS - 1:
+                    # Start a new sheet when the current one is full
+                    sheet_count += 1
+                    ws = wb.create_sheet(f"{sheet_name}_{sheet_count}")
+                    ws.append(header)
+                    sheet_rows = 0
+
+                stop = min(len(df), start + MAX_EXCEL_ROWS - 1 - sheet_rows)
+                append_frame_rows(ws, df.iloc[start:stop])
+                sheet_rows += stop - start
+                start = stop
+
+        for name, df in (extra_sheets or {}).items():
+            extra = wb.create_sheet(name)
+            extra.append([str(col) for col in df.columns])
+            append_frame_rows(extra, df)
+
+        wb.save(output_file)
+        return sheet_count
+
+    def cleanup(self):
+        """Delete the staged files"""
+        self._finalizer()
+        self._pieces = {}
+
+
+def append_frame_rows(ws, df):
+    """Append the rows of a DataFrame to a write-only worksheet, chunk by chunk"""
+    for start in range(0, len(df), WRITE_CHUNK_ROWS):
+        chunk = df.iloc[start:start + WRITE_CHUNK_ROWS].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append(row)
@@ -1,6 +1,9 @@
+import numpy as np
 import pandas as pd
 from collections import defaultdict
 
+from core.xlsx_metadata import read_sheet_info
+
 class ExcelColumnMerger:
     """
     Core class for Excel column merging and analysis operations.
@@ -10,28 +13,110 @@ class ExcelColumnMerger:
         self.output_file = None
         self.current_sheets = {}  # Store current dataframes for each sheet
         self.modified_sheets = set()
+        self.sheet_columns = {}  # Full header of each sheet in the file
+        self.loaded_columns = {}  # Columns read from the file so far, per sheet
+        self.sheet_info = {}  # Sheet name -> declared size from the workbook metadata
+        
+    def set_input_file(self, file_path, columns=None, sheet_info=None):
+        """
+        Set the input file and read its contents
         
-    def set_input_file(self, file_path):
-        """Set the input file and read its contents"""
+        Args:
+            file_path: Path to the Excel file
+            columns: Optional column projection (see read_excel_file)
+            sheet_info: Optional result of read_sheet_info for the file, if the caller already has it
+        """
         self.input_file = file_path
-        self.read_excel_file()
+        self.read_excel_file(columns, sheet_info)
         
-    def read_excel_file(self):
-        """Read all sheets from the Excel file"""
+    def read_excel_file(self, columns=None, sheet_info=None):
+        """
+        Read all sheets from the Excel file
+        
+        Args:
+            columns: Optional projection: a list of columns read from every sheet,
+                or a dictionary of sheet name -> list of columns. Columns missing from
+                a sheet are ignored, and sheets left out of a dictionary are read in
+                full. Other columns are loaded later by ensure_columns.
+            sheet_info: Optional result of read_sheet_info for the file; read when not given
+        
+        Returns:
+            True when the file was read
+        """
         if not self.input_file:
             return False
             
         try:
-            # Read all sheets
-            xl = pd.ExcelFile(self.input_file)
-            self.current_sheets = {
-                sheet: pd.read_excel(self.input_file, sheet_name=sheet)
-                for sheet in xl.sheet_names
-            }
+            self.current_sheets = {}
+            self.sheet_columns = {}
+            self.loaded_columns = {}
+            self.modified_sheets = set()
+            
+            # Sheet names and sizes come from the workbook metadata; no sheet is parsed for them
+            if sheet_info is None:
+                sheet_info = read_sheet_info(self.input_file)
+            self.sheet_info = {info['name']: info for info in sheet_info}
+            
+            with pd.ExcelFile(self.input_file) as xl:
+                for sheet in self.sheet_info:
+                    wanted = columns.get(sheet) if isinstance(columns, dict) else columns
+                    if wanted is None:
+                        df = pd.read_excel(xl, sheet_name=sheet)
+                        self.sheet_columns[sheet] = list(df.columns)
+                    else:
+                        # The header row alone is cheap; only the requested columns are parsed
+                        self.sheet_columns[sheet] = list(pd.read_excel(xl, sheet_name=sheet, nrows=0).columns)
+                        wanted = set(wanted)
+                        df = pd.read_excel(xl, sheet_name=sheet, usecols=lambda col: col in wanted)
+                    self.current_sheets[sheet] = df
+                    self.loaded_columns[sheet] = set(df.columns)
             return True
         except Exception as e:
             raise Exception(f"Failed to read file: {str(e)}")
     
+    def ensure_columns(self, sheet_name, columns):
+        """
+        Load columns of a sheet that were left out by a column projection
+        
+        Columns are only filled in while the sheet still lines up row for row with
+        the file; columns already loaded (including ones since merged away) are not
+        read again.
+        
+        Args:
+            sheet_name: Name of the sheet
+            columns: Columns that are needed
+        
+        Returns:
+            List of the columns that were added
+        """
+        if sheet_name not in self.current_sheets:
+            return []
+            
+        loaded = self.loaded_columns.setdefault(sheet_name, set(self.current_sheets[sheet_name].columns))
+        header = self.sheet_columns.get(sheet_name, [])
+        missing = [col for col in columns if col in header and col not in loaded]
+        if not missing:
+            return []
+            
+        try:
+            wanted = set(missing)
+            extra = pd.read_excel(self.input_file, sheet_name=sheet_name, usecols=lambda col: col in wanted)
+            df = self.current_sheets[sheet_name]
+            if len(extra) != len(df):
+                # Rows were stacked or removed since the sheet was read
+                return []
+            
+            extra.index = df.index
+            df = pd.concat([df, extra], axis=1)
+            if all(col in header for col in df.columns):
+                # No merged columns yet, so keep the column order of the file
+                df = df[[col for col in header if col in df.columns]]
+            self.current_sheets[sheet_name] = df
+            loaded.update(extra.columns)
+            return list(extra.columns)
+        except Exception as e:
+            raise Exception(f"Failed to load columns: {str(e)}")
+    
     def analyze_file(self):
         """Analyze the Excel file for duplicate column names (case-insensitive)"""
         if not self.input_file or not self.current_sheets:
@@ -131,7 +216,99 @@ class ExcelColumnMerger:
             
         except Exception as e:
             raise Exception(f"Failed to merge columns: {str(e)}")
-    
+
+    def non_empty_mask(self, df, columns):
+        """
+        Build a boolean mask of cells that hold a value (not NaN and not blank)
+
+        Args:
+            df: DataFrame to inspect
+            columns: List of column names to include in the mask
+
+        Returns:
+            DataFrame of booleans with the same index and columns as df[columns]
+        """
+        frame = df[columns]
+        mask = frame.notna()
+        for col in columns:
+            mask[col] &= frame[col].astype(str).str.strip().ne("").fillna(False).astype(bool)
+        return mask
+
+    def merge_values(self, df, columns, strategy="first_non_empty", separator=" | "):
+        """
+        Compute the merged values of several columns without modifying the sheet.
+        Works column by column so the cost grows with the number of merged columns,
+        not with the number of rows.
+
+        Args:
+            df: DataFrame holding the columns
+            columns: List of column names to merge, in priority order
+            strategy: 'first_non_empty', 'sum' or 'concatenate'
+            separator: Separator used by the 'concatenate' strategy
+
+        Returns:
+            Series with the merged values, or None for an unknown strategy
+        """
+        mask = self.non_empty_mask(df, columns)
+
+        if strategy == "first_non_empty":
+            # Blank out empty cells and take the left-most remaining value
+            merged = pd.Series(None, index=df.index, dtype=object)
+            for col in reversed(columns):
+                merged = merged.mask(mask[col], df[col].astype(object))
+            return merged
+
+        if strategy == "sum":
+            # Non-numeric and empty cells count as 0
+            total = pd.Series(0.0, index=df.index)
+            for col in columns:
+                values = df[col]
+                if not pd.api.types.is_numeric_dtype(values):
+                    values = values.astype(str).str.strip()
+                numeric = pd.to_numeric(values, errors="coerce").astype(float)
+                total += numeric.where(mask[col], 0.0).fillna(0.0)
+            return total
+
+        if strategy == "concatenate":
+            joined = pd.Series("", index=df.index, dtype=object)
+            for col in columns:
+                text = df[col].astype(str).astype(object)
+                prefix = joined.where(joined == "", joined + separator)
+                joined = joined.mask(mask[col], prefix + text)
+            return joined
+
+        return None
+
+    def stack_values(self, df, columns, new_column_name):
+        """
+        Stack the values of several columns into one column, creating a new row
+        for every non-empty value. Rows with no value in any of the columns are
+        kept once with an empty merged value.
+
+        Args:
+            df: DataFrame holding the columns
+            columns: List of column names to stack, in order
+            new_column_name: Name for the stacked column
+
+        Returns:
+            New DataFrame with the other columns followed by the stacked column
+        """
+        other_columns = [c for c in df.columns if c not in columns]
+        mask = self.non_empty_mask(df, columns).to_numpy()
+        values = df[columns].to_numpy(dtype=object)
+
+        # np.nonzero walks the mask row by row, which matches the stacking order
+        row_pos, col_pos = np.nonzero(mask)
+        empty_rows = np.flatnonzero(~mask.any(axis=1))
+
+        rows = np.concatenate([row_pos, empty_rows])
+        stacked = np.concatenate([values[row_pos, col_pos], np.full(len(empty_rows), None, dtype=object)])
+        order = np.argsort(rows, kind="stable")
+
+        result = df[other_columns].iloc[rows[order]].reset_index(drop=True)
+        result[new_column_name] = stacked[order]
+        return result
+
     def manual_merge_columns(self, sheet_name, columns, new_column_name, strategy="first_non_empty", delete_source=True):
         """
         Merge selected columns in a sheet based on a specified strategy.
@@ -162,35 +339,11 @@ class ExcelColumnMerger:
                 return False
             
             # Apply the appropriate merge strategy
-            if strategy == "first_non_empty":
-                # Combine columns keeping the first non-empty value for each row
-                df[new_column_name] = df[columns].apply(
-                    lambda row: next((v for v in row if pd.notna(v) and str(v).strip() != ""), None), 
-                    axis=1
-                )
-            elif strategy == "sum":
-                # Helper function to convert to numeric safely
-                def safe_numeric(val):
-                    try:
-                        return float(val) if pd.notna(val) and str(val).strip() != "" else 0
-                    except (ValueError, TypeError):
-                        return 0
-                
-                # Sum numeric values, handling non-numeric values as 0
-                df[new_column_name] = df[columns].apply(
-                    lambda row: sum(safe_numeric(v) for v in row), 
-                    axis=1
-                )
-            elif strategy == "concatenate":
-                # Concatenate non-empty values with separator
-                separator = " | "  # Can be customized if needed
-                df[new_column_name] = df[columns].apply(
-                    lambda row: separator.join(str(v) for v in row if pd.notna(v) and str(v).strip() != ""), 
-                    axis=1
-                )
-            else:
+            new_values = self.merge_values(df, columns, strategy)
+            if new_values is None:
                 # Unknown strategy
                 return False
+            df[new_column_name] = new_values
             
             # Delete source columns if requested
             if delete_source:
@@ -355,8 +508,10 @@ class ExcelColumnMerger:
             return None
         
         try:
+            # Load the column if a projection left it out
+            self.ensure_columns(sheet_name, [column_name])
             df = self.current_sheets[sheet_name]
-            
+
             # Ensure column exists
             if column_name not in df.columns:
                 raise Exception(f"Column '{column_name}' not found in sheet '{sheet_name}'")
@@ -364,51 +519,46 @@ class ExcelColumnMerger:
             # Get the column data
             column_data = df[column_name]
             
-            # Basic statistics
+            # Non-empty values are extracted once and shared by all the stats below
+            values = column_data.dropna()
             total_rows = len(column_data)
-            non_empty_count = column_data.notna().sum()
+            non_empty_count = len(values)
             empty_count = total_rows - non_empty_count
             
             # Get unique values
-            unique_values = column_data.dropna().unique()
+            unique_values = values.unique()
             unique_count = len(unique_values)
             
             # Sample values (first 10)
-            sample_values = column_data.dropna().head(10).tolist()
+            sample_values = values.head(10).tolist()
             
             # Determine data type
             data_type = "Mixed"
             if pd.api.types.is_numeric_dtype(column_data):
                 data_type = "Numeric"
-                # Add numeric stats
+                # Add numeric stats (exact: the column is in memory)
                 numeric_stats = {
-                    "min": column_data.min() if non_empty_count > 0 else None,
-                    "max": column_data.max() if non_empty_count > 0 else None,
-                    "mean": column_data.mean() if non_empty_count > 0 else None,
-                    "median": column_data.median() if non_empty_count > 0 else None
+                    "min": values.min() if non_empty_count > 0 else None,
+                    "max": values.max() if non_empty_count > 0 else None,
+                    "mean": values.mean() if non_empty_count > 0 else None,
+                    "median": values.median() if non_empty_count > 0 else None
                 }
             elif pd.api.types.is_string_dtype(column_data):
                 data_type = "Text"
                 # Add text stats
-                text_lengths = column_data.dropna().astype(str).str.len()
+                text_lengths = values.astype(str).str.len()
                 text_stats = {
                     "min_length": text_lengths.min() if non_empty_count > 0 else None,
                     "max_length": text_lengths.max() if non_empty_count > 0 else None,
                     "avg_length": text_lengths.mean() if non_empty_count > 0 else None
                 }
-                numeric_stats = None
             elif pd.api.types.is_datetime64_dtype(column_data):
                 data_type = "Date/Time"
                 # Add date stats
-                numeric_stats = {
-                    "earliest": column_data.min() if non_empty_count > 0 else None,
-                    "latest": column_data.max() if non_empty_count > 0 else None
+                date_stats = {
+                    "earliest": values.min() if non_empty_count > 0 else None,
+                    "latest": values.max() if non_empty_count > 0 else None
                 }
-                text_stats = None
-            else:
-                # For mixed or other types
-                text_stats = None
-                numeric_stats = None
             
             # Return the analysis result
             result = {
@@ -427,7 +577,7 @@ class ExcelColumnMerger:
             elif data_type == "Text":
                 result["text_stats"] = text_stats
             elif data_type == "Date/Time":
-                result["date_stats"] = numeric_stats
+                result["date_stats"] = date_stats
             
             return result
             
@@ -486,38 +636,10 @@ class ExcelColumnMerger:
             if not all(col in df.columns for col in columns):
                 return False
             
-            # Create a new dataframe to hold the stacked values
-            new_rows = []
-            
-            # Track the original row indices for each value we stack
-            for idx, row in df.iterrows():
-                has_data = False
-                # Create a new row with all columns except the ones we're merging
-                base_row = {c: row[c] for c in df.columns if c not in columns}
-                
-                for col in columns:
-                    if pd.notna(row[col]) and str(row[col]).strip() != "":
-                        # Create a copy of the base row
-                        new_row = base_row.copy()
-                        # Add the value to the new column
-                        new_row[new_column_name] = row[col]
-                        new_rows.append(new_row)
-                        has_data = True
-                
-                # If there was no data in any of the merged columns, add a row with empty value
-                if not has_data:
-                    base_row[new_column_name] = None
-                    new_rows.append(base_row)
-            
-            # Create the new dataframe with stacked values
-            if new_rows:
-                stacked_df = pd.DataFrame(new_rows)
-                
-                # Add any missing columns from the original dataframe (should be rare)
-                for col in df.columns:
-                    if col not in stacked_df.columns and col not in columns:
-                        stacked_df[col] = None
-                
+            # Create a new dataframe with one row per stacked value
+            stacked_df = self.stack_values(df, columns, new_column_name)
+
+            if not stacked_df.empty:
                 # Apply the changes to the sheet
                 self.current_sheets[sheet_name] = stacked_df
                 
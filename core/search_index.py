@@ -0,0 +1,258 @@
+import os
+import sqlite3
+import threading
+from itertools import groupby, islice
+
+from core.file_search import iter_file_entries, iter_files
+from core.text_search import normalize_search_terms
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".excel_merger", "search_index.sqlite")
+
+# One lock per index file: overlapping updates (e.g. of a cancelled search still
+# winding down) would otherwise index the same new file twice
+_update_locks = {}
+_update_locks_guard = threading.Lock()
+
+
+def _update_lock(db_path):
+    with _update_locks_guard:
+        return _update_locks.setdefault(os.path.abspath(db_path), threading.Lock())
+
+
+def _folder_prefix(folder_path):
+    """Prefix of the paths inside a folder; 'data' must not match 'data2'"""
+    return os.path.abspath(folder_path).rstrip(os.sep) + os.sep
+
+
+class SearchIndex:
+    """
+    Incremental full-text index of the lines and cells of a folder's files.
+
+    Entries are stored in an SQLite FTS5 table with the trigram tokenizer, so
+    case-insensitive substring searches are answered from the index. A file
+    is only re-read when its size or modification time changes.
+    """
+    # Trigram queries need at least this many characters; shorter terms are scanned
+    MIN_MATCH_LENGTH = 3
+    # Bumped whenever the indexed text of a file changes, so old entries are rebuilt
+    FORMAT_VERSION = 2
+    # Entries inserted (and committed) at a time, so a large file is never held in memory
+    INSERT_BATCH_SIZE = 10000
+    # Seconds a connection waits for another update's write lock
+    BUSY_TIMEOUT = 60
+
+    def __init__(self, db_path=DEFAULT_INDEX_PATH):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            # Searches keep reading while an update writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS files ("
+                    "id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, "
+                    "size INTEGER NOT NULL, mtime REAL NOT NULL, error TEXT)"
+                )
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5("
+                    "content, file_id UNINDEXED, location UNINDEXED, tokenize='trigram')"
+                )
+                if conn.execute("PRAGMA user_version").fetchone()[0] < self.FORMAT_VERSION:
+                    # Written by an older version (e.g. dates stored as serial numbers)
+                    conn.execute("DELETE FROM entries")
+                    conn.execute("DELETE FROM files")
+                    conn.execute(f"PRAGMA user_version = {self.FORMAT_VERSION}")
+        except sqlite3.OperationalError as e:
+            raise Exception(f"SQLite build does not support FTS5 trigram indexes: {str(e)}")
+        finally:
+            conn.close()
+
+    def _connect(self):
+        # A cancelled search may still be updating the index; wait for its lock
+        return sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT)
+
+    def update(self, folder_path, file_extensions=None, progress_callback=None, should_stop=None):
+        """
+        Bring the index up to date with a folder
+
+        Args:
+            folder_path: Folder to index recursively
+            file_extensions: List of extensions to include
+            progress_callback: Optional function called with (file_path, status)
+                where status is 'indexed', 'unchanged' or 'error'
+            should_stop: Optional function returning True to abort the update
+
+        Returns:
+            Dictionary with 'indexed', 'unchanged', 'removed' and 'errors' counts
+        """
+        with _update_lock(self.db_path):
+            return self._update(folder_path, file_extensions, progress_callback, should_stop)
+
+    def _update(self, folder_path, file_extensions, progress_callback, should_stop):
+        folder_path = os.path.abspath(folder_path)
+        prefix = _folder_prefix(folder_path)
+        stats = {"indexed": 0, "unchanged": 0, "removed": 0, "errors": 0}
+
+        conn = self._connect()
+        try:
+            known = {
+                path: (file_id, size, mtime)
+                for file_id, path, size, mtime in conn.execute(
+                    "SELECT id, path, size, mtime FROM files WHERE substr(path, 1, ?) = ?",
+                    (len(prefix), prefix)
+                )
+            }
+            seen = set()
+
+            for file_path in iter_files(folder_path, file_extensions):
+                if should_stop and should_stop():
+                    return stats
+
+                seen.add(file_path)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+
+                previous = known.get(file_path)
+                if previous and previous[1] == stat.st_size and previous[2] == stat.st_mtime:
+                    stats["unchanged"] += 1
+                    if progress_callback:
+                        progress_callback(file_path, "unchanged")
+                    continue
+
+                status = self._index_file(conn, file_path, stat, previous[0] if previous else None)
+                stats["errors" if status == "error" else "indexed"] += 1
+                if progress_callback:
+                    progress_callback(file_path, status)
+
+            # Drop files that were deleted since the last update
+            for path, (file_id, _, _) in known.items():
+                if path not in seen and not os.path.exists(path):
+                    conn.execute("DELETE FROM entries WHERE file_id = ?", (file_id,))
+                    conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                    stats["removed"] += 1
+            conn.commit()
+        finally:
+            conn.close()
+
+        return stats
+
+    def _index_file(self, conn, file_path, stat, file_id=None):
+        """
+        Replace the entries of one file
+
+        Entries are streamed into the index in batches, each committed on its
+        own so other updates are not locked out for the whole file. The size
+        and mtime are recorded only once every entry is in, so a file whose
+        update was interrupted is indexed again next time.
+        """
+        if file_id is not None:
+            conn.execute("DELETE FROM entries WHERE file_id = ?", (file_id,))
+            conn.execute("UPDATE files SET size = -1, mtime = -1, error = NULL WHERE id = ?", (file_id,))
+        else:
+            file_id = conn.execute(
+                "INSERT INTO files (path, size, mtime, error) VALUES (?, -1, -1, NULL)",
+                (file_path,)
+            ).lastrowid
+        conn.commit()
+
+        error = None
+        try:
+            entries = iter_file_entries(file_path)
+            while True:
+                batch = list(islice(entries, self.INSERT_BATCH_SIZE))
+                if not batch:
+                    break
+                conn.executemany(
+                    "INSERT INTO entries (content, file_id, location) VALUES (?, ?, ?)",
+                    ((text, file_id, location) for location, text in batch)
+                )
+                conn.commit()
+        except Exception as e:
+            error = str(e)
+            conn.execute("DELETE FROM entries WHERE file_id = ?", (file_id,))
+
+        conn.execute(
+            "UPDATE files SET size = ?, mtime = ?, error = ? WHERE id = ?",
+            (stat.st_size, stat.st_mtime, error, file_id)
+        )
+        conn.commit()
+        return "error" if error else "indexed"
+
+    def iter_results(self, search_string, folder_path=None, file_extensions=None):
+        """
+        Search the index
+
+        Args:
+            search_string: Text to search for (case-insensitive substring), or a
+                list of texts of which an entry must contain any
+            folder_path: Optional folder to restrict the results to
+            file_extensions: Optional list of extensions to restrict the results to
+
+        Yields:
+            Tuples of (file_path, matches) in the same format as FolderSearch,
+            where matches is a list of (location, content) tuples
+        """
+        terms = normalize_search_terms(search_string)
+        if all(len(term) >= self.MIN_MATCH_LENGTH for term in terms):
+            condition = "entries MATCH ?"
+            params = [" OR ".join('"' + term.replace('"', '""') + '"' for term in terms)]
+        else:
+            # MATCH cannot be combined with other conditions by OR, so every term is scanned
+            condition = " OR ".join(["entries.content LIKE ? ESCAPE '\\'"] * len(terms))
+            params = [
+                "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                for term in terms
+            ]
+
+        query = (
+            "SELECT files.path, entries.location, entries.content "
+            "FROM entries JOIN files ON files.id = entries.file_id "
+            f"WHERE ({condition})"
+        )
+        prefix = _folder_prefix(folder_path) if folder_path else None
+        if prefix:
+            query += " AND substr(files.path, 1, ?) = ?"
+            params += [len(prefix), prefix]
+        query += " ORDER BY files.path, entries.rowid"
+
+        if file_extensions is not None:
+            file_extensions = {ext.lower() for ext in file_extensions}
+
+        def wanted(file_path):
+            return file_extensions is None or os.path.splitext(file_path)[1].lower() in file_extensions
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params)
+            for file_path, group in groupby(rows, key=lambda row: row[0]):
+                if wanted(file_path):
+                    yield file_path, [(location, content) for _, location, content in group]
+
+            # Files that could not be read are reported like the live search does
+            if prefix:
+                errors = conn.execute(
+                    "SELECT path, error FROM files WHERE error IS NOT NULL AND substr(path, 1, ?) = ?",
+                    (len(prefix), prefix)
+                )
+            else:
+                errors = conn.execute("SELECT path, error FROM files WHERE error IS NOT NULL")
+            for file_path, error in errors:
+                if wanted(file_path):
+                    yield file_path, [f"Error reading file: {error}"]
+        finally:
+            conn.close()
+
+    def search(self, search_string, folder_path=None, file_extensions=None):
+        """
+        Search the index and collect all results
+
+        Returns:
+            Dictionary with file paths as keys and matches as values
+        """
+        return dict(self.iter_results(search_string, folder_path, file_extensions))
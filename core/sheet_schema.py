@@ -0,0 +1,127 @@
+import os
+
+import pandas as pd
+
+from core.header_similarity import HeaderSimilarityAnalyzer
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xls', '.xlsm')
+
+
+def read_headers(file_path):
+    """
+    Read only the header row of every sheet of a file
+
+    Excel sheets are read with nrows=0 (openpyxl streams just the first row in
+    read-only mode); CSV files contribute a single 'CSV' sheet.
+
+    Returns:
+        List of (sheet_name, columns) tuples
+    """
+    if file_path.lower().endswith('.csv'):
+        return [('CSV', list(pd.read_csv(file_path, nrows=0).columns))]
+
+    headers = []
+    with pd.ExcelFile(file_path) as xls:
+        for sheet_name in xls.sheet_names:
+            headers.append((sheet_name, list(pd.read_excel(xls, sheet_name=sheet_name, nrows=0).columns)))
+    return headers
+
+
+class SheetSchema:
+    """
+    Column layout of every sheet in a set of files, built from header rows only.
+
+    The schema gives the union of all columns, an inventory of which sheets
+    hold each column and a similarity report, without loading any data.
+    Sheets are then read on demand, restricted to the columns that are needed.
+    """
+    def __init__(self, key_format="{file_name}_{sheet_name}"):
+        self.key_format = key_format
+        self.sheets = {}  # sheet key -> {'file_path', 'sheet_name', 'columns'}
+        self.errors = {}  # file path -> error message
+
+    def scan(self, file_paths):
+        """
+        Read the headers of all files
+
+        Returns:
+            Number of sheets found
+        """
+        for file_path in file_paths:
+            self.add_file(file_path)
+        return len(self.sheets)
+
+    def add_file(self, file_path):
+        """Add the sheets of one file; unreadable files are recorded in self.errors"""
+        try:
+            headers = read_headers(file_path)
+        except Exception as e:
+            self.errors[file_path] = str(e)
+            return []
+
+        keys = []
+        file_name = os.path.basename(file_path)
+        for sheet_name, columns in headers:
+            key = self.key_format.format(file_name=file_name, sheet_name=sheet_name)
+            self.sheets[key] = {'file_path': file_path, 'sheet_name': sheet_name, 'columns': columns}
+            keys.append(key)
+        return keys
+
+    def sheet_columns(self):
+        """Dictionary of sheet key -> list of columns"""
+        return {key: list(info['columns']) for key, info in self.sheets.items()}
+
+    def union_columns(self):
+        """All distinct columns in order of first appearance"""
+        return list(dict.fromkeys(col for info in self.sheets.values() for col in info['columns']))
+
+    def column_inventory(self):
+        """Dictionary of column -> list of the sheet keys that contain it"""
+        inventory = {}
+        for key, info in self.sheets.items():
+            for col in info['columns']:
+                inventory.setdefault(col, []).append(key)
+        return inventory
+
+    def similarity_report(self, analyzer=None, threshold=0.7):
+        """
+        Analyze the headers of all sheets for similar or duplicate names
+
+        Returns:
+            Tuple of (results, suggestion_text) from HeaderSimilarityAnalyzer.analyze_and_suggest_merges
+        """
+        if analyzer is None:
+            analyzer = HeaderSimilarityAnalyzer()
+        analyzer.set_similarity_threshold(threshold)
+
+        flat_columns = [col for info in self.sheets.values() for col in info['columns']]
+        return analyzer.analyze_and_suggest_merges(flat_columns)
+
+    def sheets_with_columns(self, columns):
+        """Sheet keys that contain at least one of the given columns"""
+        wanted = set(columns)
+        return [key for key, info in self.sheets.items() if wanted.intersection(info['columns'])]
+
+    def read_sheet(self, sheet_key, usecols=None, dtype=None):
+        """
+        Load the data of one sheet
+
+        Args:
+            sheet_key: Key of the sheet in the schema
+            usecols: Optional list of columns to read; columns missing from the sheet are ignored
+            dtype: Optional dictionary of column -> dtype; only columns of the sheet are applied
+
+        Returns:
+            DataFrame with the sheet data
+        """
+        info = self.sheets[sheet_key]
+        options = {}
+        if usecols is not None:
+            wanted = set(usecols)
+            options['usecols'] = lambda col: col in wanted
+        if dtype:
+            options['dtype'] = {col: value for col, value in dtype.items() if col in info['columns']}
+
+        if info['file_path'].lower().endswith('.csv'):
+            return pd.read_csv(info['file_path'], **options)
+        return pd.read_excel(info['file_path'], sheet_name=info['sheet_name'], **options)
@@ -0,0 +1,153 @@
+import mmap
+import os
+import re
+
+# Files are scanned in windows of this size so no large copy is ever made
+WINDOW_SIZE = 16 * 1024 * 1024
+
+
+def normalize_search_terms(search_strings):
+    """Turn a search term or a list of terms into a list of distinct, non-empty terms"""
+    if isinstance(search_strings, str):
+        search_strings = [search_strings]
+    terms = list(dict.fromkeys(t for t in search_strings if t))
+    if not terms:
+        raise ValueError("At least one non-empty search term is required")
+    return terms
+
+
+def contains_any(text, needles):
+    """Check whether a text contains any of the lower-case needles, ignoring case"""
+    text = text.lower()
+    return any(needle in text for needle in needles)
+
+
+def compile_search_pattern(search_strings):
+    """
+    Compile one or more search terms into a single case-insensitive bytes pattern
+
+    ASCII letters are case-folded by the regular expression engine; other
+    characters are expanded to the UTF-8 encodings of their lower and upper
+    case forms.
+
+    Args:
+        search_strings: A search term or a list of search terms
+
+    Returns:
+        Compiled bytes regular expression
+    """
+    alternatives = []
+    # Longer terms first so overlapping terms report the most specific match
+    for term in sorted(normalize_search_terms(search_strings), key=len, reverse=True):
+        parts = []
+        for char in term:
+            if char.isascii():
+                parts.append(re.escape(char.encode("utf-8")))
+            else:
+                variants = sorted({re.escape(v.encode("utf-8")) for v in (char, char.lower(), char.upper())})
+                parts.append(variants[0] if len(variants) == 1 else b"(?:" + b"|".join(variants) + b")")
+        alternatives.append(b"".join(parts))
+    return re.compile(b"|".join(alternatives), re.IGNORECASE)
+
+
+def iter_match_positions(buffer, search_strings):
+    """
+    Yield the start offsets of all matches of any term, in increasing order
+
+    ASCII-only terms use the fast path: each window is lower-cased in one C
+    call and every term is located with bytes.find. Terms with other
+    characters go through a single compiled pattern instead.
+
+    Args:
+        buffer: bytes-like object or mmap to search
+        search_strings: A search term or a list of search terms
+    """
+    terms = normalize_search_terms(search_strings)
+
+    if not all(term.isascii() for term in terms):
+        for match in compile_search_pattern(terms).finditer(buffer):
+            yield match.start()
+        return
+
+    needles = [term.lower().encode("ascii") for term in terms]
+    # Windows overlap so a match crossing a window boundary is still seen
+    overlap = max(len(needle) for needle in needles) - 1
+    size = len(buffer)
+    start = 0
+
+    while start < size:
+        end = min(start + WINDOW_SIZE, size)
+        window = buffer[start:min(end + overlap, size)].lower()
+        limit = end - start
+
+        hits = set()
+        for needle in needles:
+            index = window.find(needle)
+            while index != -1 and index < limit:
+                hits.add(start + index)
+                index = window.find(needle, index + 1)
+
+        yield from sorted(hits)
+        start = end
+
+
+def _count_newlines(buffer, start, end):
+    """Count the newlines in buffer[start:end] window by window"""
+    count = 0
+    while start < end:
+        stop = min(start + WINDOW_SIZE, end)
+        count += buffer[start:stop].count(b"\n")
+        start = stop
+    return count
+
+
+def search_text_file_mmap(file_path, search_strings, max_hits=None, encoding="utf-8"):
+    """
+    Search a text file through a memory map
+
+    The file is never decoded as a whole: matches are found on the raw bytes
+    and only the lines that contain a match are decoded.
+
+    Args:
+        file_path: Path of the file to search
+        search_strings: A search term or a list of search terms
+        max_hits: Stop after this many matching lines (None for no limit)
+        encoding: Encoding used to decode the matching lines
+
+    Returns:
+        List of (location, line) tuples such as ('Line 12', 'text of line 12')
+    """
+    matches = []
+
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return matches
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            size = len(buffer)
+            line_number = 1
+            counted_to = 0
+            position = 0  # Start of the first line not yet reported
+
+            for match_start in iter_match_positions(buffer, search_strings):
+                # One hit per line: skip further matches on a reported line
+                if match_start < position:
+                    continue
+
+                previous_newline = buffer.rfind(b"\n", position, match_start)
+                line_start = previous_newline + 1 if previous_newline != -1 else position
+                line_end = buffer.find(b"\n", match_start)
+                if line_end == -1:
+                    line_end = size
+
+                line_number += _count_newlines(buffer, counted_to, line_start)
+                counted_to = line_start
+
+                line = buffer[line_start:line_end].decode(encoding, errors="ignore")
+                matches.append((f"Line {line_number}", line.strip()))
+                if max_hits is not None and len(matches) >= max_hits:
+                    break
+
+                position = line_end + 1
+
+    return matches
@@ -0,0 +1,145 @@
+# The data processor app (sysy/excel-data-processor) ships its own copy of
+# these helpers in src/data/sniffer.py: the two apps are packaged and run
+# separately and neither can import the other. check_copies.py at the
+# repository root fails when the shared functions drift apart, so change
+# both copies together.
+import codecs
+import csv
+
+# Bytes read from the start of a file; nothing beyond this is ever looked at
+SAMPLE_SIZE = 64 * 1024
+# Lines of the sample used to judge delimiters and the header
+SAMPLE_LINES = 50
+CANDIDATE_DELIMITERS = [',', ';', '\t', '|']
+
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def detect_encoding(raw):
+    """Encoding of a byte sample: from its BOM, else UTF-8 if it decodes, else Latin-1"""
+    for bom, encoding in BOMS:
+        if raw.startswith(bom):
+            return encoding
+    try:
+        raw.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the end of the sample is fine
+        if e.start >= len(raw) - 3 and e.reason == 'unexpected end of data':
+            return 'utf-8'
+        return 'latin-1'
+
+
+def _is_number(value):
+    try:
+        float(value.replace(',', ''))
+        return True
+    except ValueError:
+        return False
+
+
+def _detect_delimiter(lines, candidates):
+    """
+    Pick the delimiter that splits the sample lines most consistently
+
+    Returns:
+        Tuple of (delimiter, quotechar); delimiter is None if no candidate fits
+    """
+    sample = '\n'.join(lines)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=''.join(candidates))
+        return dialect.delimiter, dialect.quotechar or '"'
+    except csv.Error:
+        pass
+
+    # Fall back to the candidate whose field count is the same on most lines
+    best, best_score = None, 0
+    for delimiter in candidates:
+        counts = [len(row) for row in csv.reader(lines, delimiter=delimiter)]
+        if not counts or max(counts) < 2:
+            continue
+        mode = max(set(counts), key=counts.count)
+        score = counts.count(mode) / len(counts)
+        if mode > 1 and score > best_score:
+            best, best_score = delimiter, score
+    return best, '"'
+
+
+def _has_header(rows):
+    """
+    Guess whether the first row is a header, in the manner of csv.Sniffer.has_header
+
+    Each column of the body rows is typed: numeric when all its values are
+    numbers, otherwise by the length of its values when they share one. A
+    column votes for a header when the first row's field does not fit its type
+    and for data when it does. The first row is taken as data only when every
+    column votes for data: a column that can't tell (text of varying length,
+    e.g. a 'Region' column over year columns) keeps the header, as pandas
+    assumes by default.
+    """
+    if len(rows) < 2:
+        return True
+    first, body = rows[0], rows[1:]
+
+    data_votes = 0
+    for col, field in enumerate(first):
+        field = field.strip()
+        values = [row[col].strip() for row in body if col < len(row) and row[col].strip()]
+        if not field or not values:
+            continue
+        if all(_is_number(value) for value in values):
+            fits = _is_number(field)
+        else:
+            lengths = {len(value) for value in values}
+            # Text of varying length can't tell a header from data
+            fits = len(lengths) == 1 and len(field) in lengths
+        if not fits:
+            return True
+        data_votes += 1
+    return data_votes == 0
+
+
+def sniff_text_file(file_path, sample_size=SAMPLE_SIZE, delimiters=None):
+    """
+    Detect the encoding, delimiter, quoting and header row of a text file
+    from its first bytes only
+
+    Args:
+        file_path: File to sniff
+        sample_size: Number of bytes to sample
+        delimiters: Candidate delimiters (defaults to CANDIDATE_DELIMITERS)
+
+    Returns:
+        Dictionary with 'encoding', 'sep' (None when no delimiter fits),
+        'quotechar' and 'header' (0 or None) for pd.read_csv
+    """
+    delimiters = delimiters or CANDIDATE_DELIMITERS
+
+    with open(file_path, 'rb') as f:
+        raw = f.read(sample_size)
+        truncated = bool(f.read(1))
+
+    encoding = detect_encoding(raw)
+    lines = raw.decode(encoding, errors='ignore').splitlines()
+    if truncated and lines:
+        # The last line of a cut sample is probably incomplete
+        lines = lines[:-1]
+    lines = [line for line in lines if line.strip()][:SAMPLE_LINES]
+
+    result = {'encoding': encoding, 'sep': None, 'quotechar': '"', 'header': 0}
+    if not lines:
+        return result
+
+    sep, quotechar = _detect_delimiter(lines, delimiters)
+    if sep is None:
+        return result
+
+    rows = list(csv.reader(lines, delimiter=sep, quotechar=quotechar))
+    result.update({'sep': sep, 'quotechar': quotechar, 'header': 0 if _has_header(rows) else None})
+    return result
@@ -0,0 +1,171 @@
+# The data processor app (sysy/excel-data-processor) ships its own copy of
+# these helpers in src/data/xlsx_metadata.py: the two apps are packaged and run
+# separately and neither can import the other. check_copies.py at the
+# repository root fails when the shared functions drift apart, so change both
+# copies together.
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+
+XLSX_EXTENSIONS = ('.xlsx', '.xlsm')
+
+CELL_REF = re.compile(r'^\$?([A-Z]+)\$?(\d+)$')
+
+
+def column_number(letters):
+    """1-based column number of column letters such as 'A' or 'AB'"""
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - ord('A') + 1
+    return number
+
+
+def parse_dimension(ref):
+    """
+    Row and column counts spanned by a dimension reference
+
+    Args:
+        ref: Range such as 'A1:D100' or a single cell such as 'A1'
+
+    Returns:
+        Tuple of (rows, columns), or (None, None) if the reference can't be parsed
+    """
+    corners = [CELL_REF.match(part) for part in ref.upper().split(':')]
+    if not corners or not all(corners):
+        return None, None
+    first, last = corners[0], corners[-1]
+    rows = int(last.group(2)) - int(first.group(2)) + 1
+    columns = column_number(last.group(1)) - column_number(first.group(1)) + 1
+    return rows, columns
+
+
+def local_name(tag):
+    """
+    Strip the XML namespace from a tag or attribute name ('{ns}row' -> 'row')
+
+    Elements are matched by local name so Strict OOXML workbooks, which use
+    different namespaces from the usual Transitional ones, are read as well.
+    """
+    return tag.rsplit('}', 1)[-1]
+
+
+def read_workbook(zf):
+    """
+    Parse workbook.xml and its relationships
+
+    Args:
+        zf: Open ZipFile of the workbook
+
+    Returns:
+        Tuple of (sheets, date1904): sheets is a list of dictionaries with 'name',
+        'state' and 'part' (path of the worksheet in the archive, None when its
+        relationship is missing) in workbook order; date1904 is True when the
+        workbook counts dates from 1904
+    """
+    targets = {}
+    try:
+        rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+        for rel in rels.iter():
+            if local_name(rel.tag) != 'Relationship':
+                continue
+            target = rel.get('Target', '')
+            # Targets are relative to xl/ unless they start with a slash
+            if target.startswith('/'):
+                target = target.lstrip('/')
+            else:
+                target = posixpath.normpath(posixpath.join('xl', target))
+            targets[rel.get('Id')] = target
+    except KeyError:
+        pass
+
+    sheets = []
+    date1904 = False
+    for element in ET.fromstring(zf.read('xl/workbook.xml')).iter():
+        tag = local_name(element.tag)
+        if tag == 'workbookPr':
+            date1904 = element.get('date1904', '').lower() in ('1', 'true')
+        elif tag == 'sheet':
+            rel_id = next((value for key, value in element.attrib.items() if local_name(key) == 'id'), None)
+            sheets.append({
+                'name': element.get('name'),
+                'state': element.get('state', 'visible'),
+                'part': targets.get(rel_id)
+            })
+    return sheets, date1904
+
+
+def _sheet_dimension(zf, path):
+    """Dimension reference of a worksheet, read from the start of its XML only"""
+    try:
+        with zf.open(path) as f:
+            for _, elem in ET.iterparse(f, events=('start',)):
+                tag = local_name(elem.tag)
+                if tag == 'dimension':
+                    return elem.get('ref')
+                if tag == 'sheetData':
+                    # The dimension record always comes before the cell data
+                    return None
+    except KeyError:
+        pass
+    return None
+
+
+def read_xlsx_metadata(file_path):
+    """
+    Read the sheets of an .xlsx/.xlsm workbook without loading it
+
+    Only workbook.xml, its relationships and the dimension record at the top
+    of each worksheet are parsed, so this takes milliseconds even for very
+    large files. The counts come from the dimension the writer declared and
+    include the header row; they are None when no dimension was written.
+
+    Returns:
+        List of dictionaries with 'name', 'state', 'dimension', 'rows' and 'columns',
+        in workbook order
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        sheets = []
+        for sheet in read_workbook(zf)[0]:
+            dimension = _sheet_dimension(zf, sheet['part']) if sheet['part'] else None
+            rows, columns = parse_dimension(dimension) if dimension else (None, None)
+            sheets.append({
+                'name': sheet['name'],
+                'state': sheet['state'],
+                'dimension': dimension,
+                'rows': rows,
+                'columns': columns
+            })
+        return sheets
+
+
+def read_sheet_info(file_path):
+    """
+    Sheet names and approximate sizes of any Excel file
+
+    .xlsx/.xlsm files go through read_xlsx_metadata; other formats (.xls) fall
+    back to pd.ExcelFile and report no sizes.
+
+    Returns:
+        List of dictionaries as returned by read_xlsx_metadata
+    """
+    if file_path.lower().endswith(XLSX_EXTENSIONS):
+        try:
+            return read_xlsx_metadata(file_path)
+        except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+            print(f"Could not read workbook metadata of {file_path}: {str(e)}")
+
+    with pd.ExcelFile(file_path) as xls:
+        return [
+            {'name': name, 'state': 'visible', 'dimension': None, 'rows': None, 'columns': None}
+            for name in xls.sheet_names
+        ]
+
+
+def describe_sheet_size(info):
+    """Short size text for a sheet, e.g. '~1,204 rows x 12 columns'"""
+    if info.get('rows') is None:
+        return "size unknown"
+    return f"~{info['rows']:,} rows x {info['columns']:,} columns"
@@ -5,6 +5,121 @@ import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
 from datetime import datetime
 import threading
+import heapq
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from openpyxl import Workbook, load_workbook
+
+# Excel's sheet size limit, header row included
+MAX_EXCEL_ROWS = 1048576
+# Rows per chunk when spilling sorted runs and reading them back
+RUN_CHUNK_ROWS = 10000
+
+
+def read_top_rows(file_path, max_rows=1):
+    """
+    Read only the first rows of the first sheet of a workbook
+    
+    .xlsx files are streamed with openpyxl in read-only mode, so nothing
+    beyond the requested rows is parsed; legacy .xls files go through pandas.
+    
+    Returns:
+        List of rows, each a list of cell values
+    """
+    if file_path.lower().endswith('.xls'):
+        df = pd.read_excel(file_path, header=None, nrows=max_rows)
+        return df.values.tolist()
+    
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        return [list(row) for row in ws.iter_rows(max_row=max_rows, values_only=True)]
+    finally:
+        wb.close()
+
+
+def check_file_header(file_path, check_columns, header_scan_rows=1):
+    """
+    Find which of the check columns a workbook has, from its top rows only
+    
+    The header is taken to be the row (among the first header_scan_rows)
+    holding the most check columns, so offset headers are found as well.
+    Runs in worker processes, so it must stay a module-level function.
+    
+    Returns:
+        Tuple of (header_row, present_columns, missing_columns, error) where
+        header_row is the 0-based row of the header and error is None or the
+        error message
+    """
+    try:
+        rows = read_top_rows(file_path, header_scan_rows)
+    except Exception as e:
+        return 0, [], [], str(e)
+    
+    best_row, present = 0, []
+    for row_index, row in enumerate(rows):
+        row_values = set(value for value in row if value is not None)
+        row_present = [col for col in check_columns if col in row_values]
+        if len(row_present) > len(present):
+            best_row, present = row_index, row_present
+    
+    missing = [col for col in check_columns if col not in present]
+    return best_row, present, missing, None
+
+
+def sort_file_to_run(file_path, header_row, sort_columns, run_path, chunk_rows=RUN_CHUNK_ROWS):
+    """
+    Load one workbook, sort it and spill it to disk as a sorted run
+    
+    The run is a sequence of pickled chunks so it can be read back a chunk at
+    a time. Runs in worker processes, so it must stay a module-level function.
+    
+    Returns:
+        Tuple of (columns, row_count)
+    """
+    df = pd.read_excel(file_path, header=header_row)
+    by = [col for col in sort_columns if col in df.columns]
+    if by:
+        df = df.sort_values(by=by, kind='stable')
+    
+    with open(run_path, 'wb') as f:
+        for start in range(0, len(df), chunk_rows):
+            pickle.dump(df.iloc[start:start + chunk_rows], f, protocol=pickle.HIGHEST_PROTOCOL)
+    return list(df.columns), len(df)
+
+
+def _sort_key_value(value):
+    """Comparable form of a cell value: missing values last, numbers before text"""
+    if value is None:
+        return (1, 0, 0)
+    if isinstance(value, (int, float)):
+        return (0, 0, value)
+    if isinstance(value, str):
+        return (0, 1, value)
+    return (0, 2, value)
+
+
+def iter_run_rows(run_path, columns, sort_columns):
+    """
+    Stream the rows of a sorted run, aligned to the output columns
+    
+    Yields:
+        Tuples of (sort_key, row)
+    """
+    key_positions = [columns.index(col) for col in sort_columns]
+    with open(run_path, 'rb') as f:
+        while True:
+            try:
+                chunk = pickle.load(f)
+            except EOFError:
+                return
+            chunk = chunk.reindex(columns=columns).astype(object)
+            chunk = chunk.where(chunk.notna(), None)
+            for row in chunk.itertuples(index=False, name=None):
+                yield tuple(_sort_key_value(row[p]) for p in key_positions), row
+
 
 class ExcelCheckerApp:
     def __init__(self, root):
@@ -27,9 +142,17 @@ class ExcelCheckerApp:
         # Minimum number of columns required
         self.min_columns_required = 2
         
+        # Rows searched for the header row (1 = header must be the first row)
+        self.header_scan_rows = 1
+        # Worker processes for checking files (None = one per CPU)
+        self.max_workers = None
+        
         self.valid_files = []
         self.invalid_files = []
-        self.all_data = []
+        self.valid_sources = []  # (file_path, header_row) of valid files, loaded on export
+        
+        # Export sort order
+        self.sort_columns = ['FreezerName', 'Box', 'Position']
         
         # Create UI elements
         self.create_widgets()
@@ -158,24 +281,38 @@ class ExcelCheckerApp:
         self.log(f"Checking for columns: {', '.join(self.check_columns)}")
         self.log(f"Files must have at least {self.min_columns_required} of these columns to be considered valid.")
         
-        # Process each Excel file
-        for file_path in excel_files:
-            file_name = os.path.basename(file_path)
-            try:
-                # Read Excel file
-                df = pd.read_excel(file_path)
+        # Check the headers of all files in parallel; data is only loaded on export
+        workers = min(self.max_workers or os.cpu_count() or 1, len(excel_files))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                check_file_header,
+                excel_files,
+                [self.check_columns] * len(excel_files),
+                [self.header_scan_rows] * len(excel_files),
+                chunksize=max(1, len(excel_files) // (workers * 4))
+            )
+            
+            for file_path, (header_row, present_columns, missing_columns, error) in zip(excel_files, results):
+                file_name = os.path.basename(file_path)
                 
-                # Check which of the required columns are present
-                present_columns = [col for col in self.check_columns if col in df.columns]
-                missing_columns = [col for col in self.check_columns if col not in df.columns]
+                if error is not None:
+                    error_msg = f"Error processing {file_name}: {error}"
+                    self.log(error_msg)
+                    self.invalid_files.append((file_name, ["Error: " + error]))
+                    
+                    # Update UI in the main thread
+                    self.root.after(0, lambda msg=error_msg: self.invalid_files_list.insert(tk.END, msg))
+                    continue
                 
                 # Consider valid if at least min_columns_required are present
                 if len(present_columns) >= self.min_columns_required:
                     message = f"✓ {file_name} - Valid ({len(present_columns)} columns found: {', '.join(present_columns)})"
+                    if header_row:
+                        message += f" [header on row {header_row + 1}]"
                     self.log(message)
                     
                     self.valid_files.append(file_name)
-                    self.all_data.append(df)
+                    self.valid_sources.append((file_path, header_row))
                     
                     # Update UI in the main thread
                     display_msg = f"{file_name} - {len(present_columns)} columns found"
@@ -188,13 +325,6 @@ class ExcelCheckerApp:
                     # Update UI in the main thread
                     display_msg = f"{file_name} - Only {len(present_columns)} columns found"
                     self.root.after(0, lambda msg=display_msg: self.invalid_files_list.insert(tk.END, msg))
-            except Exception as e:
-                error_msg = f"Error processing {file_name}: {str(e)}"
-                self.log(error_msg)
-                self.invalid_files.append((file_name, ["Error: " + str(e)]))
-                
-                # Update UI in the main thread
-                self.root.after(0, lambda msg=error_msg: self.invalid_files_list.insert(tk.END, msg))
         
         # Print summary
         self.log("\n--- Summary ---")
@@ -207,7 +337,7 @@ class ExcelCheckerApp:
         self.root.after(0, lambda: self.status_var.set(summary))
     
     def export_data(self):
-        if not self.all_data:
+        if not self.valid_sources:
             messagebox.showinfo("Info", "No valid data to export")
             return
         
@@ -218,30 +348,78 @@ class ExcelCheckerApp:
             output_path = f"combined_data_{timestamp}.xlsx"
             self.output_path.set(output_path)
         
+        # Export to the specified output file
+        if not output_path.lower().endswith(('.xlsx', '.xls')):
+            output_path += '.xlsx'
+        
         try:
-            # Combine all valid dataframes
-            combined_df = pd.concat(self.all_data, ignore_index=True)
+            rows = self.export_sorted(output_path)
+            self.log(f"\nExported {rows} sorted rows to {output_path}")
+            messagebox.showinfo("Success", f"Exported sorted data to {output_path}")
+        except Exception as e:
+            self.log(f"Error exporting data: {str(e)}")
+            messagebox.showerror("Error", f"Failed to export data: {str(e)}")
+    
+    def export_sorted(self, output_path):
+        """
+        Sort all valid files into one workbook with an external merge sort
+        
+        Each file is loaded, sorted and spilled to disk as a run in a worker
+        process; the runs are then k-way merged and streamed into a write-only
+        workbook, so only one chunk per run is in memory at a time. Sheets are
+        continued on Sheet2, Sheet3, ... past Excel's row limit.
+        
+        Returns:
+            Number of data rows written
+        """
+        with tempfile.TemporaryDirectory(prefix="excel_checker_") as run_dir:
+            self.log(f"Sorting {len(self.valid_sources)} valid file(s)...")
+            run_paths = [os.path.join(run_dir, f"run_{i}.pkl") for i in range(len(self.valid_sources))]
             
-            # Sort by specified columns if they exist
-            sort_columns = ['FreezerName', 'Box', 'Position']
-            available_sort_columns = [col for col in sort_columns if col in combined_df.columns]
+            workers = min(self.max_workers or os.cpu_count() or 1, len(self.valid_sources))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                runs = list(executor.map(
+                    sort_file_to_run,
+                    [file_path for file_path, _ in self.valid_sources],
+                    [header_row for _, header_row in self.valid_sources],
+                    [self.sort_columns] * len(run_paths),
+                    run_paths
+                ))
+            
+            # Output columns in order of first appearance, like pd.concat
+            columns = list(dict.fromkeys(col for run_columns, _ in runs for col in run_columns))
+            available_sort_columns = [col for col in self.sort_columns if col in columns]
             
             if available_sort_columns:
                 self.log(f"Sorting data by: {', '.join(available_sort_columns)}")
-                combined_df = combined_df.sort_values(by=available_sort_columns)
             else:
                 self.log("No sort columns available in the data")
             
-            # Export to the specified output file
-            if not output_path.lower().endswith(('.xlsx', '.xls')):
-                output_path += '.xlsx'
+            streams = [iter_run_rows(run_path, columns, available_sort_columns) for run_path in run_paths]
+            # heapq.merge is stable, so equal keys keep file order
+            merged = heapq.merge(*streams, key=lambda item: item[0])
             
-            combined_df.to_excel(output_path, index=False)
-            self.log(f"\nExported sorted data to {output_path}")
-            messagebox.showinfo("Success", f"Exported sorted data to {output_path}")
-        except Exception as e:
-            self.log(f"Error exporting data: {str(e)}")
-            messagebox.showerror("Error", f"Failed to export data: {str(e)}")
+            wb = Workbook(write_only=True)
+            header = [str(col) for col in columns]
+            ws = None
+            sheet_rows = 0
+            total_rows = 0
+            
+            for _, row in merged:
+                if ws is None or sheet_rows >= MAX_EXCEL_ROWS - 1:
+                    ws = wb.create_sheet(f"Sheet{len(wb.worksheets) + 1}")
+                    ws.append(header)
+                    sheet_rows = 0
+                ws.append(row)
+                sheet_rows += 1
+                total_rows += 1
+            
+            if ws is None:
+                ws = wb.create_sheet("Sheet1")
+                ws.append(header)
+            
+            wb.save(output_path)
+            return total_rows
     
     def clear_results(self):
         self.log_text.delete(1.0, tk.END)
@@ -249,7 +427,7 @@ class ExcelCheckerApp:
         self.invalid_files_list.delete(0, tk.END)
         self.valid_files = []
         self.invalid_files = []
-        self.all_data = []
+        self.valid_sources = []
         self.status_var.set("Ready to check Excel files")
     
     def log(self, message):
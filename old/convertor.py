@@ -2,8 +2,80 @@ import pandas as pd
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
 import os
+import sys
 import threading
 import queue
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from openpyxl import Workbook
+
+# Run as a script from old/, the repository root is not on the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.csv_reader import iter_delimited_chunks
+from core.merge_staging import append_frame_rows
+
+# Excel's sheet size limit, header row included
+MAX_EXCEL_ROWS = 1048576
+# Rows read and written per chunk
+CHUNK_ROWS = 50000
+
+
+def convert_text_file(input_file, output_file, delimiter, progress_queue=None, chunk_rows=CHUNK_ROWS):
+    """
+    Stream a delimited text file into an Excel workbook chunk by chunk
+    
+    Rows go through a write-only workbook, so memory stays bounded by the chunk
+    size. When a sheet reaches Excel's row limit the remaining rows continue on
+    a new sheet (Sheet1, Sheet2, ...) with the header repeated. Runs in worker
+    processes, so it must stay a module-level function.
+    
+    Args:
+        input_file: Text file to convert
+        output_file: Excel file to create
+        delimiter: Field delimiter
+        progress_queue: Optional queue receiving (input_file, rows_written, fraction_read)
+            after every chunk
+        chunk_rows: Rows per chunk
+        
+    Returns:
+        Tuple of (rows_written, sheet_count)
+    """
+    wb = Workbook(write_only=True)
+    ws = None
+    sheet_count = 0
+    sheet_rows = 0
+    rows_written = 0
+    
+    for chunk, fraction in iter_delimited_chunks(input_file, sep=delimiter, chunk_size=chunk_rows):
+        header = [str(col) for col in chunk.columns]
+        start = 0
+        while start < len(chunk) or ws is None:
+            if ws is None or sheet_rows >= MAX_EXCEL_ROWS - 1:
+                # Start a new sheet when the current one is full
+                sheet_count += 1
+                ws = wb.create_sheet(f"Sheet{sheet_count}")
+                ws.append(header)
+                sheet_rows = 0
+            
+            stop = min(len(chunk), start + MAX_EXCEL_ROWS - 1 - sheet_rows)
+            append_frame_rows(ws, chunk.iloc[start:stop])
+            sheet_rows += stop - start
+            rows_written += stop - start
+            start = stop
+        
+        if progress_queue is not None:
+            progress_queue.put((input_file, rows_written, fraction))
+    
+    if ws is None:
+        # Empty input: still produce a valid workbook
+        wb.create_sheet("Sheet1")
+        sheet_count = 1
+    
+    wb.save(output_file)
+    return rows_written, sheet_count
+
 
 class TextToExcelConverter:
     def __init__(self, root):
@@ -18,6 +90,7 @@ class TextToExcelConverter:
         self.output_dir = tk.StringVar()
         self.source_folder = tk.StringVar()
         self.recursive_var = tk.BooleanVar(value=True)
+        self.max_workers = None  # Worker processes for conversion (None = one per CPU)
         
         self.setup_ui()
     
@@ -251,83 +324,123 @@ class TextToExcelConverter:
         conversion_thread.start()
     
     def process_queue(self):
+        """Convert the queued files on a process pool, reporting progress per file and per chunk"""
         total_files = len(self.selected_files)
         processed_files = 0
         failed_files = 0
         
+        files = []
         while not self.files_queue.empty():
             try:
-                file = self.files_queue.get_nowait()
-                self.status_var.set(f"Converting: {os.path.basename(file)}")
-                
-                success = self.convert_file(file)
-                if not success:
-                    failed_files += 1
-                
-                processed_files += 1
-                progress_percentage = (processed_files / total_files) * 100
-                self.progress_var.set(progress_percentage)
-                
+                files.append(self.files_queue.get_nowait())
                 self.files_queue.task_done()
-                
             except queue.Empty:
                 break
-            except Exception as e:
-                self.status_var.set(f"Error: {str(e)}")
-                failed_files += 1
-                processed_files += 1
+        
+        delimiter = self.get_delimiter()
+        workers = min(self.max_workers or os.cpu_count() or 1, len(files)) or 1
+        
+        # Share of each file read so far, for the overall progress bar
+        file_progress = {file: 0.0 for file in files}
+        
+        def report(message):
+            self.root.after(0, lambda: self.status_var.set(message))
+            self.root.after(0, lambda: self.progress_var.set(sum(file_progress.values()) / max(total_files, 1) * 100))
+        
+        with multiprocessing.Manager() as manager:
+            progress_queue = manager.Queue()
+            
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = {}
+                for file in files:
+                    try:
+                        output_file = self.get_output_file(file)
+                    except Exception as e:
+                        self.show_conversion_error(file, e)
+                        failed_files += 1
+                        processed_files += 1
+                        file_progress[file] = 1.0
+                        continue
+                    pending[executor.submit(convert_text_file, file, output_file, delimiter, progress_queue)] = file
+                
+                while pending:
+                    done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                    
+                    # Chunk progress from the workers
+                    while True:
+                        try:
+                            file, rows_written, fraction = progress_queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        file_progress[file] = fraction
+                        report(f"Converting: {os.path.basename(file)} ({rows_written} rows written)")
+                    
+                    for future in done:
+                        file = pending.pop(future)
+                        processed_files += 1
+                        file_progress[file] = 1.0
+                        try:
+                            rows_written, sheet_count = future.result()
+                            sheets_note = f" across {sheet_count} sheets" if sheet_count > 1 else ""
+                            report(f"Converted {os.path.basename(file)}: {rows_written} rows{sheets_note} ({processed_files}/{total_files} files)")
+                        except Exception as e:
+                            failed_files += 1
+                            self.show_conversion_error(file, e)
         
         # Conversion completed
-        self.btn_convert_main.config(state=tk.NORMAL)
+        self.root.after(0, lambda: self.btn_convert_main.config(state=tk.NORMAL))
         
         if failed_files > 0:
-            self.status_var.set(f"Conversion completed with issues. {processed_files - failed_files}/{total_files} files converted successfully. {failed_files} files failed.")
+            message = f"Conversion completed with issues. {processed_files - failed_files}/{total_files} files converted successfully. {failed_files} files failed."
         else:
-            self.status_var.set(f"Conversion completed successfully. {processed_files}/{total_files} files converted.")
+            message = f"Conversion completed successfully. {processed_files}/{total_files} files converted."
+        self.root.after(0, lambda: self.status_var.set(message))
+        self.root.after(0, lambda: self.progress_var.set(100))
+    
+    def get_delimiter(self):
+        delimiter = self.delimiter.get()
+        
+        # Handle special case for tab delimiter
+        if delimiter == "\\t":
+            delimiter = "\t"
+        return delimiter
+    
+    def get_output_file(self, input_file):
+        """Determine the output file path for an input file"""
+        output_dir = self.output_dir.get()
+        if output_dir:
+            # If specific output directory is provided
+            # Preserve folder structure relative to source folder
+            if self.source_folder.get() and input_file.startswith(self.source_folder.get()):
+                rel_path = os.path.relpath(os.path.dirname(input_file), self.source_folder.get())
+                output_subdir = os.path.join(output_dir, rel_path)
+                
+                # Create subdirectory if it doesn't exist
+                os.makedirs(output_subdir, exist_ok=True)
+                
+                # Create output file path
+                name_without_ext = os.path.splitext(os.path.basename(input_file))[0]
+                return os.path.join(output_subdir, f"{name_without_ext}.xlsx")
+            
+            # If not from source folder scanning, just use the base name
+            name_without_ext = os.path.splitext(os.path.basename(input_file))[0]
+            return os.path.join(output_dir, f"{name_without_ext}.xlsx")
+        
+        # Use same directory as input file
+        return os.path.splitext(input_file)[0] + '.xlsx'
+    
+    def show_conversion_error(self, input_file, error):
+        error_msg = f"Error converting {os.path.basename(input_file)}:\n{str(error)}"
+        # Use after to avoid multiple dialog boxes freezing the UI
+        self.root.after(0, lambda: messagebox.showerror("Conversion Error", error_msg))
     
     def convert_file(self, input_file):
+        """Convert a single file in the current thread"""
         try:
-            # Determine output file path
-            output_dir = self.output_dir.get()
-            if output_dir:
-                # If specific output directory is provided
-                # Preserve folder structure relative to source folder
-                if self.source_folder.get() and input_file.startswith(self.source_folder.get()):
-                    rel_path = os.path.relpath(os.path.dirname(input_file), self.source_folder.get())
-                    output_subdir = os.path.join(output_dir, rel_path)
-                    
-                    # Create subdirectory if it doesn't exist
-                    os.makedirs(output_subdir, exist_ok=True)
-                    
-                    # Create output file path
-                    name_without_ext = os.path.splitext(os.path.basename(input_file))[0]
-                    output_file = os.path.join(output_subdir, f"{name_without_ext}.xlsx")
-                else:
-                    # If not from source folder scanning, just use the base name
-                    name_without_ext = os.path.splitext(os.path.basename(input_file))[0]
-                    output_file = os.path.join(output_dir, f"{name_without_ext}.xlsx")
-            else:
-                # Use same directory as input file
-                output_file = os.path.splitext(input_file)[0] + '.xlsx'
-            
-            # Read the text file
-            delimiter = self.delimiter.get()
-            
-            # Handle special case for tab delimiter
-            if delimiter == "\\t":
-                delimiter = "\t"
-            
-            # Read file with pandas
-            df = pd.read_csv(input_file, delimiter=delimiter)
-            
-            # Write to Excel
-            df.to_excel(output_file, index=False)
-            
+            convert_text_file(input_file, self.get_output_file(input_file), self.get_delimiter())
             return True
         except Exception as e:
-            error_msg = f"Error converting {os.path.basename(input_file)}:\n{str(e)}"
-            # Use after to avoid multiple dialog boxes freezing the UI
-            self.root.after(0, lambda: messagebox.showerror("Conversion Error", error_msg))
+            self.show_conversion_error(input_file, e)
             return False
 
 if __name__ == "__main__":
@@ -1,11 +1,17 @@
 import os
+import sys
 import pandas as pd
 from pathlib import Path
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog, ttk
 import datetime
 import re
+# Run as a script from old/, the repository root is not on the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from core.header_similarity import HeaderSimilarityAnalyzer
+from core.sheet_schema import SheetSchema
+from core.text_sniffer import sniff_text_file
 
 class ExcelMerger:
     def __init__(self):
@@ -15,7 +21,8 @@ class ExcelMerger:
         self.all_dataframes = {}  # Store individual dataframes for lookup
         self.skipped_files = []  # Store files that couldn't be processed
         self.processed_folders = {}  # Track which folders were processed
-        self.current_sheets = {}  # Store sheets for column merging
+        self.current_sheets = {}  # Store sheets for column merging (loaded on demand)
+        self.sheet_schema = None  # Header-only layout of the sheets for column merging
         self.header_analyzer = HeaderSimilarityAnalyzer()  # For analyzing similar headers
         
     def select_folder(self):
@@ -85,25 +92,22 @@ class ExcelMerger:
                     self.all_dataframes[f"{rel_folder}|{file_name}|CSV"] = df
                 elif file_path.lower().endswith('.txt'):
                     # Read text file with various delimiters
-                    # Try to detect delimiter by reading first few lines
-                    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                        sample = ''.join([f.readline() for _ in range(5)])
-                    
-                    # Try to guess the delimiter
-                    delimiter = None
-                    for potential_delim in [',', '\t', '|', ';', ' ']:
-                        if potential_delim in sample:
-                            counts = sample.count(potential_delim)
-                            if counts > 2:  # At least need a few occurrences
-                                delimiter = potential_delim
-                                break
+                    # Sniff delimiter, quoting, header and encoding from a bounded sample
+                    sniffed = sniff_text_file(file_path)
                     
-                    if delimiter:
-                        # Try pandas read_csv with the detected delimiter
-                        df = pd.read_csv(file_path, delimiter=delimiter, engine='python', error_bad_lines=False)
+                    if sniffed['sep']:
+                        # Parse with the C engine using the detected layout
+                        df = pd.read_csv(
+                            file_path,
+                            sep=sniffed['sep'],
+                            quotechar=sniffed['quotechar'],
+                            header=sniffed['header'],
+                            encoding=sniffed['encoding'],
+                            on_bad_lines='skip'
+                        )
                     else:
                         # If delimiter detection fails, try to read it as a fixed-width or space-delimited file
-                        df = pd.read_fwf(file_path)
+                        df = pd.read_fwf(file_path, encoding=sniffed['encoding'])
                     
                     # If we have only one column, it might be unstructured text - convert to dataframe
                     if len(df.columns) == 1:
@@ -601,69 +605,81 @@ class ExcelMerger:
             messagebox.showinfo("No Files Found", "No Excel files found in the selected folder.")
             return False
             
-        # Load each Excel file
-        for file_path in excel_files:
+        # Read only the header rows; sheet data is loaded when a merge needs it
+        self.sheet_schema = SheetSchema()
+        self.sheet_schema.scan(excel_files)
+        
+        for file_path, error in self.sheet_schema.errors.items():
             file_name = os.path.basename(file_path)
-            try:
-                # Read all sheets from the Excel file
-                xls = pd.ExcelFile(file_path)
-                
-                # Process each sheet
-                for sheet_name in xls.sheet_names:
-                    sheet_key = f"{file_name}_{sheet_name}"
-                    self.current_sheets[sheet_key] = pd.read_excel(file_path, sheet_name=sheet_name)
-                    print(f"Loaded sheet: {sheet_key}")
-            except Exception as e:
-                print(f"Error loading {file_path}: {str(e)}")
-                messagebox.showwarning("Warning", f"Could not load {file_name}: {str(e)}")
+            print(f"Error loading {file_path}: {error}")
+            messagebox.showwarning("Warning", f"Could not load {file_name}: {error}")
         
-        if not self.current_sheets:
+        if not self.sheet_schema.sheets:
             messagebox.showinfo("No Data", "No valid Excel sheets were found or could be loaded.")
             return False
             
         return True
     
+    def get_sheet(self, sheet_key, usecols=None, dtype=None):
+        """
+        Load the data of a sheet found by load_excel_files_for_merging
+        
+        Args:
+            sheet_key: Sheet key ("<file name>_<sheet name>")
+            usecols: Optional list of columns to read
+            dtype: Optional dictionary of column -> dtype
+            
+        Returns:
+            DataFrame with the sheet data
+        """
+        # Only complete sheets are kept for reuse
+        if usecols is None and not dtype and sheet_key in self.current_sheets:
+            return self.current_sheets[sheet_key]
+            
+        df = self.sheet_schema.read_sheet(sheet_key, usecols=usecols, dtype=dtype)
+        print(f"Loaded sheet: {sheet_key}")
+        if usecols is None and not dtype:
+            self.current_sheets[sheet_key] = df
+        return df
+    
     # Method to analyze similar columns across loaded sheets
     def analyze_similar_columns(self):
         """Analyze columns across all loaded sheets to find similar field names"""
-        if not self.current_sheets:
+        if not self.sheet_schema or not self.sheet_schema.sheets:
             messagebox.showinfo("No Data", "No Excel sheets are currently loaded.")
             return None
             
-        # Collect all column names from all sheets
-        all_columns = {}
-        
-        for sheet_name, df in self.current_sheets.items():
-            all_columns[sheet_name] = list(df.columns)
-        
-        # Flatten the list of all columns for similarity analysis
-        flat_columns = []
-        for cols in all_columns.values():
-            flat_columns.extend(cols)
+        # Collect all column names from the sheet headers
+        all_columns = self.sheet_schema.sheet_columns()
             
         # Use HeaderSimilarityAnalyzer to find similar columns
-        self.header_analyzer.set_similarity_threshold(0.7)  # Default threshold
-        results, suggestion_text = self.header_analyzer.analyze_and_suggest_merges(flat_columns)
+        results, suggestion_text = self.sheet_schema.similarity_report(self.header_analyzer, 0.7)
         
         return {
             'sheet_columns': all_columns,
+            'union_columns': self.sheet_schema.union_columns(),
+            'column_inventory': self.sheet_schema.column_inventory(),
             'similarity_results': results,
             'suggestion_text': suggestion_text
         }
     
     # Method to merge columns across sheets
-    def merge_columns_across_sheets(self, column_mapping, output_column_name=None):
+    def merge_columns_across_sheets(self, column_mapping, output_column_name=None, mapped_columns_only=False, dtypes=None):
         """
         Merge similar columns from different sheets into a single dataset
         
+        Only the sheets whose headers contain one of the source columns are loaded.
+        
         Args:
             column_mapping: Dictionary mapping target column name to list of source columns
             output_column_name: Name for the merged output column (defaults to first key in mapping)
+            mapped_columns_only: Read only the source columns instead of whole sheets
+            dtypes: Optional dictionary of source column -> dtype to read with
         
         Returns:
             DataFrame with merged data
         """
-        if not self.current_sheets or not column_mapping:
+        if not self.sheet_schema or not self.sheet_schema.sheets or not column_mapping:
             return None
             
         if not output_column_name:
@@ -673,7 +689,12 @@ class ExcelMerger:
         # Create list to store dataframes with standardized column names
         standardized_dfs = []
         
-        for sheet_name, df in self.current_sheets.items():
+        source_columns = [col for cols in column_mapping.values() for col in cols]
+        usecols = source_columns if mapped_columns_only else None
+        
+        for sheet_name in self.sheet_schema.sheets_with_columns(source_columns):
+            df = self.get_sheet(sheet_name, usecols=usecols, dtype=dtypes)
+            
             # Create a copy to avoid modifying the original
             new_df = df.copy()
             
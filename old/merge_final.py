@@ -1,12 +1,125 @@
 import os
+import sys
 import pandas as pd
 from pathlib import Path
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog, ttk
 import datetime
 import re
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# Run as a script from old/, the repository root is not on the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.merge_cache import MergeCache
+from core.merge_staging import SpilledMerge
+from core.lookup_index import LookupCursor, LookupIndex
+from core.text_sniffer import sniff_text_file
+from core.csv_reader import read_delimited
+
+# Bump when read_source_file parses files differently, so cached pieces are re-read
+READER_VERSION = 2
+
+def source_folder_name(file_path, input_folder):
+    """Folder of a file relative to the input folder, as shown in Source_Folder"""
+    rel_folder = os.path.relpath(os.path.dirname(file_path), input_folder)
+    return 'Root' if rel_folder == '.' else rel_folder
+
+
+def read_source_file(file_path, input_folder, columns=None):
+    """
+    Read one Excel, CSV or text file and tag its rows with their source.
+    Runs in worker processes, so it must stay a module-level function.
+    
+    Args:
+        file_path: File to read
+        input_folder: Root folder of the merge, used for Source_Folder
+        columns: Optional list of the columns to load; other columns are not
+            parsed (Excel, CSV) or dropped right after parsing (text files)
+        
+    Returns:
+        List of (lookup_key, DataFrame) tuples, one per sheet
+    """
+    file_name = os.path.basename(file_path)
+    rel_folder = source_folder_name(file_path, input_folder)
+    pieces = []
+    wanted = set(columns) if columns is not None else None
+    
+    if file_path.lower().endswith('.csv'):
+        # Read CSV file with the delimiter, quoting and encoding sniffed from its first bytes
+        # (large files go through the Arrow reader when pyarrow is installed)
+        sniffed = sniff_text_file(file_path)
+        df = read_delimited(
+            file_path,
+            sep=sniffed['sep'] or ',',
+            quotechar=sniffed['quotechar'],
+            header=sniffed['header'],
+            encoding=sniffed['encoding'],
+            usecols=columns
+        )
+        df['Source_File'] = file_name
+        df['Source_Folder'] = rel_folder
+        df['Sheet_Name'] = 'CSV'  # CSV files don't have sheets
+        pieces.append((f"{rel_folder}|{file_name}|CSV", df))
+    elif file_path.lower().endswith('.txt'):
+        # Read text file with various delimiters
+        # Sniff delimiter, quoting, header and encoding from a bounded sample
+        sniffed = sniff_text_file(file_path)
+        
+        if sniffed['sep']:
+            # Parse with Arrow or the C engine using the detected layout
+            df = read_delimited(
+                file_path,
+                sep=sniffed['sep'],
+                quotechar=sniffed['quotechar'],
+                header=sniffed['header'],
+                encoding=sniffed['encoding'],
+                skip_bad_lines=True
+            )
+        else:
+            # If delimiter detection fails, try to read it as a fixed-width or space-delimited file
+            df = pd.read_fwf(file_path, encoding=sniffed['encoding'])
+        
+        # If we have only one column, it might be unstructured text - convert to dataframe
+        if len(df.columns) == 1:
+            # Read raw text and create a proper dataframe
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                lines = f.readlines()
+            
+            # Create dataframe with lines as rows
+            df = pd.DataFrame({'Text_Content': lines})
+        
+        if wanted is not None:
+            df = df[[col for col in df.columns if col in wanted]]
+        
+        df['Source_File'] = file_name
+        df['Source_Folder'] = rel_folder
+        df['Sheet_Name'] = 'TXT'  # Text files don't have sheets
+        pieces.append((f"{rel_folder}|{file_name}|TXT", df))
+    else:
+        # Read Excel file with multiple sheets, opening the workbook only once
+        with pd.ExcelFile(file_path) as xls:
+            for sheet_name in xls.sheet_names:
+                if wanted is not None:
+                    df = pd.read_excel(xls, sheet_name=sheet_name, usecols=lambda col: col in wanted)
+                else:
+                    df = pd.read_excel(xls, sheet_name=sheet_name)
+                
+                # Add file and sheet info as columns
+                df['Source_File'] = file_name
+                df['Source_Folder'] = rel_folder
+                df['Sheet_Name'] = sheet_name
+                pieces.append((f"{rel_folder}|{file_name}|{sheet_name}", df))
+    
+    return pieces
+
 
 class ExcelMerger:
+    LOOKUP_PAGE_SIZE = 500  # Lookup results shown per page
+    
     def __init__(self):
         self.input_folder = None
         self.output_file = None
@@ -14,6 +127,14 @@ class ExcelMerger:
         self.all_dataframes = {}  # Store individual dataframes for lookup
         self.skipped_files = []  # Store files that couldn't be processed
         self.processed_folders = {}  # Track which folders were processed
+        self.max_workers = None  # Worker processes for reading files (None = one per CPU)
+        self.use_cache = True  # Reuse parsed frames of unchanged files between runs
+        self.last_merge_stats = {}  # Parsed/cached/removed file counts of the last merge
+        self.spill_to_disk = False  # Stage pieces on disk instead of holding the merge in memory
+        self.staged_data = None  # SpilledMerge of the last merge in spill mode
+        self.lookup_index = LookupIndex()  # Inverted index over all_dataframes for lookups
+        self.index_thread = None
+        self.columns = None  # Columns to load from every file (None = all columns)
         
     def select_folder(self):
         """Let user select the folder containing Excel files"""
@@ -53,97 +174,125 @@ class ExcelMerger:
             'full_paths': files
         }
     
-    def merge_files(self, analysis):
-        """Merge all Excel, CSV, and text files in the folder"""
+    def merge_files(self, analysis, max_workers=None):
+        """
+        Merge all Excel, CSV, and text files in the folder
+        
+        Files are read in parallel worker processes; the merged output keeps the
+        order of analysis['full_paths'] whatever order the workers finish in.
+        When self.use_cache is set, only new or changed files are parsed and the
+        others are taken from the merge cache of the folder. When
+        self.spill_to_disk is set, every piece is staged on disk as soon as it
+        is read and self.merged_data stays None; the output is then streamed
+        from self.staged_data. When self.columns is set, only those columns are
+        loaded from each file; the source columns are always added.
+        
+        Args:
+            analysis: Result of analyze_folder_recursive()
+            max_workers: Number of worker processes (defaults to self.max_workers)
+        """
         if not analysis or analysis['file_count'] == 0:
             return False
             
         # Create an empty list to hold all dataframes
         all_data = []
+        self.all_dataframes = {}
         self.skipped_files = []  # Reset skipped files
+        self.merged_data = None
+        if self.staged_data is not None:
+            self.staged_data.cleanup()
+            self.staged_data = None
+        if self.spill_to_disk:
+            self.staged_data = SpilledMerge()
+            self.all_dataframes = self.staged_data
+        
+        file_paths = analysis['full_paths']
+        cache = self.open_cache()
+        
+        # Split the files into cached ones and ones that must be parsed; cached
+        # pieces are only loaded when their turn comes, one file at a time
+        cached_paths = set()
+        if cache is not None:
+            cached_paths = {file_path for file_path in file_paths if cache.is_current(file_path)}
+        to_read = [file_path for file_path in file_paths if file_path not in cached_paths]
         
-        # Process each file
-        for file_path in analysis['full_paths']:
+        # Signatures are taken just before each file is read, so edits made while
+        # it is parsed are caught on the next merge
+        signatures = {}
+        def take_signature(file_path):
             try:
-                file_name = os.path.basename(file_path)
-                rel_folder = os.path.relpath(os.path.dirname(file_path), self.input_folder)
-                if rel_folder == '.':
-                    rel_folder = 'Root'
-                
-                if file_path.lower().endswith('.csv'):
-                    # Read CSV file
-                    df = pd.read_csv(file_path)
-                    df['Source_File'] = file_name
-                    df['Source_Folder'] = rel_folder
-                    df['Sheet_Name'] = 'CSV'  # CSV files don't have sheets
-                    all_data.append(df)
-                    
-                    # Store for lookup
-                    self.all_dataframes[f"{rel_folder}|{file_name}|CSV"] = df
-                elif file_path.lower().endswith('.txt'):
-                    # Read text file with various delimiters
-                    # Try to detect delimiter by reading first few lines
-                    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                        sample = ''.join([f.readline() for _ in range(5)])
-                    
-                    # Try to guess the delimiter
-                    delimiter = None
-                    for potential_delim in [',', '\t', '|', ';', ' ']:
-                        if potential_delim in sample:
-                            counts = sample.count(potential_delim)
-                            if counts > 2:  # At least need a few occurrences
-                                delimiter = potential_delim
-                                break
-                    
-                    if delimiter:
-                        # Try pandas read_csv with the detected delimiter
-                        df = pd.read_csv(file_path, delimiter=delimiter, engine='python', error_bad_lines=False)
-                    else:
-                        # If delimiter detection fails, try to read it as a fixed-width or space-delimited file
-                        df = pd.read_fwf(file_path)
-                    
-                    # If we have only one column, it might be unstructured text - convert to dataframe
-                    if len(df.columns) == 1:
-                        # Read raw text and create a proper dataframe
-                        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                            lines = f.readlines()
-                        
-                        # Create dataframe with lines as rows
-                        df = pd.DataFrame({'Text_Content': lines})
-                    
-                    df['Source_File'] = file_name
-                    df['Source_Folder'] = rel_folder
-                    df['Sheet_Name'] = 'TXT'  # Text files don't have sheets
-                    all_data.append(df)
-                    
-                    # Store for lookup
-                    self.all_dataframes[f"{rel_folder}|{file_name}|TXT"] = df
+                signatures[file_path] = cache.signature(file_path)
+            except OSError:
+                pass
+        before_read = take_signature if cache is not None else None
+        read_results = self.read_files(to_read, max_workers, before_read)
+        changed_keys = []
+        cached_count = 0
+        
+        for file_path in file_paths:
+            parsed = file_path not in cached_paths
+            if parsed:
+                _, pieces, error = next(read_results)
+            else:
+                pieces, error = cache.load(file_path), None
+                if pieces is None:
+                    # The cached pieces could not be read back: parse the file here
+                    parsed = True
+                    _, pieces, error = next(self.read_files([file_path], 1, before_read))
                 else:
-                    # Read Excel file with multiple sheets
-                    xls = pd.ExcelFile(file_path)
-                    
-                    # Process each sheet in the Excel file
-                    for sheet_name in xls.sheet_names:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name)
-                        
-                        # Add file and sheet info as columns
-                        df['Source_File'] = file_name
-                        df['Source_Folder'] = rel_folder
-                        df['Sheet_Name'] = sheet_name
-                        
-                        # Add to our list
-                        all_data.append(df)
-                        
-                        # Store for lookup
-                        self.all_dataframes[f"{rel_folder}|{file_name}|{sheet_name}"] = df
-            except Exception as e:
-                print(f"Error processing {file_path}: {str(e)}")
+                    cached_count += 1
+                
+            if error is not None:
+                print(f"Error processing {file_path}: {error}")
                 # Record the skipped file with error details
                 self.skipped_files.append({
                     'file': os.path.basename(file_path),
                     'folder': os.path.relpath(os.path.dirname(file_path), self.input_folder),
-                    'error': str(e)
+                    'error': error
                 })
+                continue
+            
+            if parsed:
+                changed_keys.extend(key for key, _ in pieces)
+                if cache is not None:
+                    try:
+                        cache.store(file_path, pieces, signatures.pop(file_path, None))
+                    except Exception as e:
+                        print(f"Could not cache {file_path}: {str(e)}")
+            
+            for key, df in pieces:
+                if self.staged_data is not None:
+                    # Stage the piece right away; it is dropped from memory with `pieces`
+                    self.staged_data.append(key, df)
+                else:
+                    # Add to our list and store for lookup
+                    all_data.append(df)
+                    self.all_dataframes[key] = df
+        
+        if self.staged_data is None:
+            # Only the pieces that were parsed again need to be re-indexed
+            self.start_lookup_index(changed_keys)
+        else:
+            # An index would hold every staged cell in memory: lookups scan the pieces instead
+            self.lookup_index = LookupIndex()
+        
+        self.last_merge_stats = {
+            'parsed': len(file_paths) - cached_count,
+            'cached': cached_count,
+            'removed': 0
+        }
+        if cache is not None:
+            # Deleted files drop out of the cache as well
+            self.last_merge_stats['removed'] = len(cache.prune(file_paths))
+            try:
+                cache.save()
+                # The caches of other folders would otherwise grow without bound
+                cache.trim()
+            except Exception as e:
+                print(f"Could not save merge cache: {str(e)}")
+                
+        if self.staged_data is not None:
+            return len(self.staged_data) > 0
                 
         # Merge all dataframes
         if all_data:
@@ -151,9 +300,94 @@ class ExcelMerger:
             return True
         return False
     
+    def start_lookup_index(self, changed_keys=None):
+        """Update the lookup index from all_dataframes in a background thread"""
+        frames = self.all_dataframes
+        index = self.lookup_index
+        # Keys are relative to the input folder, so another folder means a new index
+        source = os.path.abspath(self.input_folder)
+        
+        # An older build still running won't mark the index ready for these frames
+        generation = index.begin_sync(changed_keys)
+        
+        def build():
+            try:
+                index.sync(frames, source=source, generation=generation)
+            except Exception as e:
+                print(f"Error building lookup index: {str(e)}")
+        
+        self.index_thread = threading.Thread(target=build, daemon=True)
+        self.index_thread.start()
+    
+    def open_cache(self):
+        """Open the merge cache of the input folder, or return None when caching is off"""
+        if not self.use_cache:
+            return None
+        try:
+            # A different projection gives different pieces, so it is part of the cache options
+            columns = sorted(str(col) for col in self.columns) if self.columns is not None else None
+            return MergeCache(
+                self.input_folder,
+                reader_options={'reader_version': READER_VERSION, 'columns': columns}
+            )
+        except Exception as e:
+            print(f"Merge cache unavailable: {str(e)}")
+            return None
+    
+    def read_files(self, file_paths, max_workers=None, before_read=None):
+        """
+        Read source files on a process pool
+        
+        Args:
+            file_paths: List of files to read
+            max_workers: Number of worker processes (defaults to self.max_workers)
+            before_read: Optional function called with each file path just before
+                the file is handed to a reader
+            
+        Yields:
+            Tuples of (file_path, pieces, error) in the order of file_paths, where
+            pieces is the list returned by read_source_file and error is None or
+            the error message
+        """
+        workers = max_workers or self.max_workers or os.cpu_count() or 1
+        workers = min(workers, len(file_paths)) or 1
+        
+        if workers == 1:
+            # Not worth starting a pool
+            for file_path in file_paths:
+                if before_read is not None:
+                    before_read(file_path)
+                try:
+                    yield file_path, read_source_file(file_path, self.input_folder, self.columns), None
+                except Exception as e:
+                    yield file_path, [], str(e)
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            def submit(file_path):
+                if before_read is not None:
+                    before_read(file_path)
+                return file_path, executor.submit(read_source_file, file_path, self.input_folder, self.columns)
+            
+            # Only a few files are in flight at a time, so finished results
+            # don't pile up in memory while the caller is still staging earlier ones
+            remaining = iter(file_paths)
+            pending = deque(submit(file_path) for file_path in islice(remaining, workers * 2))
+            
+            # Collect in submission order so the output is deterministic
+            while pending:
+                file_path, future = pending.popleft()
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.append(submit(next_path))
+                try:
+                    yield file_path, future.result(), None
+                except Exception as e:
+                    yield file_path, [], str(e)
+    
     def save_merged_file(self):
         """Save the merged data to a new Excel file"""
-        if self.merged_data is None:
+        if self.merged_data is None and self.staged_data is None:
             return None
             
         # Generate default filename with timestamp
@@ -173,17 +407,16 @@ class ExcelMerger:
             
         # Save the merged data
         if self.output_file.lower().endswith('.csv'):
-            self.merged_data.to_csv(self.output_file, index=False)
+            if self.staged_data is not None:
+                self.staged_data.write_csv(self.output_file)
+            else:
+                self.merged_data.to_csv(self.output_file, index=False)
         else:
-            writer = pd.ExcelWriter(self.output_file, engine='openpyxl')
-            
-            # Save main data
-            self.merged_data.to_excel(writer, sheet_name='Merged_Data', index=False)
+            report_sheets = {}
             
             # Save skipped files report if any
             if self.skipped_files:
-                skipped_df = pd.DataFrame(self.skipped_files)
-                skipped_df.to_excel(writer, sheet_name='Skipped_Files', index=False)
+                report_sheets['Skipped_Files'] = pd.DataFrame(self.skipped_files)
                 
             # Save folder summary
             folders_data = []
@@ -194,10 +427,20 @@ class ExcelMerger:
                     'Files': ', '.join(files)
                 })
             
-            folders_df = pd.DataFrame(folders_data)
-            folders_df.to_excel(writer, sheet_name='Folders_Summary', index=False)
+            report_sheets['Folders_Summary'] = pd.DataFrame(folders_data)
+            
+            if self.staged_data is not None:
+                # Stream the staged pieces straight into the workbook
+                self.staged_data.write_excel(self.output_file, 'Merged_Data', report_sheets)
+            else:
+                writer = pd.ExcelWriter(self.output_file, engine='openpyxl')
                 
-            writer.close()
+                # Save main data
+                self.merged_data.to_excel(writer, sheet_name='Merged_Data', index=False)
+                for sheet_name, report_df in report_sheets.items():
+                    report_df.to_excel(writer, sheet_name=sheet_name, index=False)
+                    
+                writer.close()
             
         return self.output_file
     
@@ -330,6 +573,33 @@ class ExcelMerger:
             
         ttk.Button(folder_window, text="Export Summary", command=export_folders).pack(pady=10)
     
+    def scan_frames(self, search_term, search_column="All Columns", case_sensitive=False):
+        """
+        Search all_dataframes without the lookup index
+        
+        Returns:
+            List of (key, column, rows) tuples in the same format as LookupIndex.search
+        """
+        hits = []
+        for key, df in self.all_dataframes.items():
+            # Select columns to search
+            if search_column == "All Columns":
+                columns_to_search = df.columns
+            elif search_column in df.columns:
+                columns_to_search = [search_column]
+            else:
+                continue
+
+            for col in columns_to_search:
+                try:
+                    mask = df[col].astype(str).str.contains(search_term, case=case_sensitive, na=False) & df[col].notna()
+                    rows = mask.to_numpy().nonzero()[0]
+                    if len(rows):
+                        hits.append((key, col, rows))
+                except Exception as e:
+                    print(f"Error searching column {col}: {str(e)}")
+        return hits
+    
     def perform_lookup(self):
         """Open a window to perform lookups across all loaded files"""
         if not self.all_dataframes:
@@ -359,9 +629,14 @@ class ExcelMerger:
         search_option_var = tk.StringVar(value="All Columns")
         
         # Collect all possible columns from all dataframes
-        all_columns = set()
-        for df in self.all_dataframes.values():
-            all_columns.update(df.columns)
+        if self.lookup_index.ready:
+            all_columns = set(self.lookup_index.columns())
+        elif self.staged_data is not None:
+            all_columns = set(self.staged_data.columns)
+        else:
+            all_columns = set()
+            for df in self.all_dataframes.values():
+                all_columns.update(df.columns)
         
         column_options = ["All Columns"] + sorted(list(all_columns))
         column_dropdown = ttk.Combobox(search_frame, textvariable=search_option_var, values=column_options, width=20)
@@ -402,87 +677,103 @@ class ExcelMerger:
         results_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
+        # Paging controls; only one page of results is in the treeview at a time
+        page_frame = ttk.Frame(lookup_window, padding=(10, 0))
+        page_frame.pack(fill="x")
+        
+        prev_button = ttk.Button(page_frame, text="< Previous", state="disabled")
+        prev_button.pack(side="left")
+        next_button = ttk.Button(page_frame, text="Next >", state="disabled")
+        next_button.pack(side="right")
+        page_var = tk.StringVar(value="")
+        ttk.Label(page_frame, textvariable=page_var, anchor="center").pack(side="left", fill="x", expand=True)
+        
         # Export results button
         export_button = ttk.Button(lookup_window, text="Export Results", state="disabled")
         export_button.pack(pady=10)
         
+        # Cursor over the matches of the last search and the page shown
+        lookup_state = {'cursor': None, 'page': 0}
+        page_size = self.LOOKUP_PAGE_SIZE
+        
         # Status bar
         status_var = tk.StringVar(value="Ready")
         status_bar = ttk.Label(lookup_window, textvariable=status_var, relief="sunken", anchor="w")
         status_bar.pack(side="bottom", fill="x")
         
+        def show_page(page):
+            cursor = lookup_state['cursor']
+            results_tree.delete(*results_tree.get_children())
+            if cursor is None or len(cursor) == 0:
+                page_var.set("")
+                prev_button.configure(state="disabled")
+                next_button.configure(state="disabled")
+                return
+            
+            last_page = (len(cursor) - 1) // page_size
+            page = max(0, min(page, last_page))
+            lookup_state['page'] = page
+            start = page * page_size
+            
+            # Format only the rows of this page
+            for folder, file_name, sheet_name, row_number, col, match_value, context in cursor.rows(start, start + page_size):
+                results_tree.insert("", "end", values=(
+                    folder,
+                    file_name, 
+                    sheet_name, 
+                    row_number, 
+                    col, 
+                    match_value[:50] + ('...' if len(match_value) > 50 else ''),
+                    context
+                ))
+            
+            page_var.set(f"Matches {start + 1}-{min(start + page_size, len(cursor))} of {len(cursor)} (page {page + 1} of {last_page + 1})")
+            prev_button.configure(state="normal" if page > 0 else "disabled")
+            next_button.configure(state="normal" if page < last_page else "disabled")
+        
+        prev_button.configure(command=lambda: show_page(lookup_state['page'] - 1))
+        next_button.configure(command=lambda: show_page(lookup_state['page'] + 1))
+        
         # Search function
         def search():
-            # Clear previous results
-            for item in results_tree.get_children():
-                results_tree.delete(item)
-            
             search_term = search_var.get()
             if not search_term:
+                lookup_state['cursor'] = None
+                show_page(0)
                 status_var.set("Please enter a search term")
                 return
             
             search_column = search_option_var.get()
             case_sensitive = case_sensitive_var.get()
             
-            results_count = 0
+            if self.lookup_index.ready:
+                hits = self.lookup_index.search(
+                    search_term,
+                    column=None if search_column == "All Columns" else search_column,
+                    case_sensitive=case_sensitive
+                )
+            else:
+                # Index still being built (or not kept in low-memory mode): scan the frames directly
+                hits = self.scan_frames(search_term, search_column, case_sensitive)
             
-            for key, df in self.all_dataframes.items():
-                folder, file_name, sheet_name = key.split('|')
-                
-                # Select columns to search
-                columns_to_search = [search_column] if search_column != "All Columns" and search_column in df.columns else df.columns
-                
-                # Convert df to string to allow string searching
-                for col in columns_to_search:
-                    # Skip non-string columns if they can't be converted to string
-                    try:
-                        # Case sensitivity handling
-                        if case_sensitive:
-                            mask = df[col].astype(str).str.contains(search_term, na=False)
-                        else:
-                            mask = df[col].astype(str).str.contains(search_term, case=False, na=False)
-                            
-                        # Get matching rows
-                        matching_rows = df[mask]
-                        
-                        for idx, row in matching_rows.iterrows():
-                            # Get original row index
-                            original_idx = df.index.get_loc(idx) + 2  # +2 for Excel row number (header + 1-based index)
-                            
-                            # Get matching value
-                            match_value = str(row[col])
-                            
-                            # Create context (show a few values from the row)
-                            context_cols = [c for c in df.columns if c not in ['Source_File', 'Sheet_Name', 'Source_Folder']][:3]
-                            context = " | ".join(f"{c}: {row[c]}" for c in context_cols if c in row)
-                            
-                            # Add to treeview
-                            results_tree.insert("", "end", values=(
-                                folder,
-                                file_name, 
-                                sheet_name, 
-                                original_idx, 
-                                col, 
-                                match_value[:50] + ('...' if len(match_value) > 50 else ''),
-                                context
-                            ))
-                            results_count += 1
-                    except Exception as e:
-                        print(f"Error searching column {col}: {str(e)}")
+            # Matches are only counted here; rows are formatted page by page
+            cursor = LookupCursor(hits, self.all_dataframes)
+            lookup_state['cursor'] = cursor
+            show_page(0)
             
             # Update status
-            status_var.set(f"Found {results_count} matches")
+            status_var.set(f"Found {len(cursor)} matches in {len(cursor.counts_by_file())} files/sheets")
             
             # Enable export if we have results
-            if results_count > 0:
+            if len(cursor) > 0:
                 export_button.configure(state="normal")
             else:
                 export_button.configure(state="disabled")
         
         # Export function
         def export_results():
-            if not results_tree.get_children():
+            cursor = lookup_state['cursor']
+            if cursor is None or len(cursor) == 0:
                 return
                 
             # Ask for save location
@@ -494,28 +785,13 @@ class ExcelMerger:
             
             if not export_file:
                 return
-                
-            # Create dataframe from results
-            results_data = []
-            for item in results_tree.get_children():
-                values = results_tree.item(item, "values")
-                results_data.append({
-                    'Folder': values[0],
-                    'File': values[1],
-                    'Sheet': values[2],
-                    'Row': values[3],
-                    'Column': values[4],
-                    'Matching Value': values[5],
-                    'Context': values[6]
-                })
-                
-            results_df = pd.DataFrame(results_data)
             
-            # Save based on extension
-            if export_file.lower().endswith('.csv'):
-                results_df.to_csv(export_file, index=False)
-            else:
-                results_df.to_excel(export_file, index=False)
+            # Stream every match from the cursor, not just the page on screen
+            try:
+                cursor.export(export_file)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to export results: {str(e)}")
+                return
                 
             messagebox.showinfo("Export Complete", f"Results exported to {export_file}")
         
@@ -589,12 +865,12 @@ def main():
     # Create a simple menu
     menu_window = tk.Toplevel(root)
     menu_window.title("Excel, CSV & Text File Merger")
-    menu_window.geometry("320x350")
+    menu_window.geometry("320x390")
     menu_window.resizable(False, False)
     
     # Center the window
     window_width = 320
-    window_height = 350
+    window_height = 390
     screen_width = menu_window.winfo_screenwidth()
     screen_height = menu_window.winfo_screenheight()
     x = (screen_width / 2) - (window_width / 2)
@@ -621,6 +897,15 @@ def main():
         width=25
     ).pack(pady=10)
     
+    # Low memory mode stages the merge on disk
+    spill_var = tk.BooleanVar(value=merger.spill_to_disk)
+    ttk.Checkbutton(
+        button_frame,
+        text="Low memory merge (stage on disk)",
+        variable=spill_var,
+        command=lambda: setattr(merger, 'spill_to_disk', spill_var.get())
+    ).pack()
+    
     ttk.Button(
         button_frame, 
         text="Lookup Data", 
@@ -686,11 +971,21 @@ def main():
             f"Found {analysis['file_count']} Excel/CSV/text files in {len(merger.processed_folders)} folders/subfolders"
         )
         
+        # Optionally load only some columns from every file
+        columns = simpledialog.askstring(
+            "Columns to Load",
+            "Columns to load, separated by commas\n(leave empty to load all columns):",
+            parent=window
+        )
+        columns = [col.strip() for col in (columns or "").split(",") if col.strip()]
+        merger.columns = columns or None
+
         status.set(f"Processing {analysis['file_count']} files...")
-        
+
         # Merge files
         if merger.merge_files(analysis):
-            status.set("Files merged, saving...")
+            stats = merger.last_merge_stats
+            status.set(f"Files merged ({stats.get('parsed', 0)} parsed, {stats.get('cached', 0)} from cache), saving...")
             
             # Report skipped files if any
             if merger.skipped_files:
@@ -1,12 +1,17 @@
 import os
 import sys
-import pandas as pd
-from openpyxl import load_workbook
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext
 import threading
 import queue
 
+# Run as a script from old/, the repository root is not on the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.file_search import FolderSearch, search_excel_file, search_text_file
+from core.search_index import SearchIndex
+from ui.common import BatchedTextSink
+
 class FileSearchApp:
     def __init__(self, root):
         self.root = root
@@ -16,13 +21,25 @@ class FileSearchApp:
         
         self.folder_path = tk.StringVar()
         self.search_string = tk.StringVar()
+        self.multiple_terms = tk.BooleanVar(value=False)
         self.status_var = tk.StringVar()
         self.status_var.set("Ready")
         self.file_extensions = tk.StringVar(value=".txt,.xlsx,.xls,.csv")
+        self.use_index = tk.BooleanVar(value=False)
+        self.max_hits = tk.StringVar(value="")
         
         self.result_queue = queue.Queue()
         self.create_widgets()
         
+        # Files are searched in parallel; results stream back as they are found
+        self.folder_search = FolderSearch()
+        
+        # Persistent index, opened on first use
+        self.search_index = None
+        
+        # Results are written to the text widget in batches, one insert per frame
+        self.result_sink = BatchedTextSink(self.result_text, self.result_queue, on_done=self.search_finished)
+        
     def create_widgets(self):
         main_frame = ttk.Frame(self.root, padding="10")
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -45,6 +62,11 @@ class FileSearchApp:
         
         ttk.Label(search_frame, text="Search Text:").pack(side=tk.LEFT, padx=5)
         ttk.Entry(search_frame, textvariable=self.search_string, width=50).pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        ttk.Checkbutton(
+            search_frame,
+            text="Any of several terms (comma-separated)",
+            variable=self.multiple_terms
+        ).pack(side=tk.LEFT, padx=5)
         
         # File extensions
         ext_frame = ttk.Frame(input_frame)
@@ -54,10 +76,25 @@ class FileSearchApp:
         ttk.Entry(ext_frame, textvariable=self.file_extensions, width=50).pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         ttk.Label(ext_frame, text="(comma-separated)").pack(side=tk.LEFT, padx=5)
         
+        # Index option
+        index_frame = ttk.Frame(input_frame)
+        index_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Checkbutton(
+            index_frame,
+            text="Use search index (only changed files are re-read)",
+            variable=self.use_index
+        ).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(index_frame, text="Max hits per file:").pack(side=tk.LEFT, padx=5)
+        ttk.Entry(index_frame, textvariable=self.max_hits, width=8).pack(side=tk.LEFT, padx=5)
+        ttk.Label(index_frame, text="(empty = no limit)").pack(side=tk.LEFT, padx=5)
+        
         # Button frame
         button_frame = ttk.Frame(input_frame)
         button_frame.pack(fill=tk.X, pady=10)
         
+        ttk.Button(button_frame, text="Cancel", command=self.cancel_search).pack(side=tk.RIGHT, padx=5)
         ttk.Button(button_frame, text="Search", command=self.start_search).pack(side=tk.RIGHT, padx=5)
         
         # Results Area
@@ -89,6 +126,10 @@ class FileSearchApp:
         search_text = self.search_string.get()
         extensions = self.file_extensions.get()
         
+        if self.multiple_terms.get():
+            # A line or cell matches when it contains any of the terms
+            search_text = [term.strip() for term in search_text.split(',') if term.strip()]
+        
         if not folder or not search_text:
             self.status_var.set("Error: Please provide both folder and search text")
             return
@@ -97,7 +138,17 @@ class FileSearchApp:
             self.status_var.set(f"Error: '{folder}' is not a valid directory")
             return
         
-        # Clear previous results
+        max_hits = self.max_hits.get().strip()
+        if max_hits and (not max_hits.isdigit() or int(max_hits) == 0):
+            self.status_var.set("Error: Max hits per file must be a positive number")
+            return
+        max_hits = int(max_hits) if max_hits else None
+        
+        # Clear previous results; the previous search keeps writing to its own
+        # queue, so none of its lines (or its done marker) reach the new sink
+        self.result_sink.stop()
+        self.result_queue = queue.Queue()
+        self.result_sink = BatchedTextSink(self.result_text, self.result_queue, on_done=self.search_finished)
         self.result_text.config(state=tk.NORMAL)
         self.result_text.delete(1.0, tk.END)
         self.result_text.config(state=tk.DISABLED)
@@ -110,154 +161,107 @@ class FileSearchApp:
         file_exts = [ext.strip() if ext.strip().startswith('.') else f'.{ext.strip()}' 
                   for ext in extensions.split(',')]
         
-        # Start search in a separate thread
+        # Start search in a separate thread; a search still running is cancelled
+        # first, and the thread only ever checks its own search object
+        self.folder_search.cancel()
+        self.folder_search = FolderSearch(max_hits_per_file=max_hits)
         search_thread = threading.Thread(
             target=self.search_files_thread,
-            args=(folder, search_text, file_exts),
+            args=(folder, search_text, file_exts, self.use_index.get(), self.result_queue, self.folder_search),
             daemon=True
         )
         search_thread.start()
         
-        # Start checking for results
-        self.root.after(100, self.check_queue)
+        # Start streaming results into the text widget
+        self.result_sink.start()
     
-    def search_files_thread(self, folder_path, search_string, file_extensions):
+    def search_files_thread(self, folder_path, search_string, file_extensions, use_index=False,
+                            result_queue=None, folder_search=None):
+        result_queue = self.result_queue if result_queue is None else result_queue
+        folder_search = self.folder_search if folder_search is None else folder_search
         try:
             # Initial info message
-            self.result_queue.put(("info", f"Searching for '{search_string}' in {folder_path}...\n"))
-            self.result_queue.put(("info", f"File extensions: {', '.join(file_extensions)}\n"))
-            self.result_queue.put(("info", "-" * 80 + "\n"))
+            label = search_string if isinstance(search_string, str) else "' or '".join(search_string)
+            result_queue.put(("info", f"Searching for '{label}' in {folder_path}...\n"))
+            result_queue.put(("info", f"File extensions: {', '.join(file_extensions)}\n"))
+            result_queue.put(("info", "-" * 80 + "\n"))
             
-            results = self.search_files_in_folder(folder_path, search_string, file_extensions)
-            
-            if not results:
-                self.result_queue.put(("info", f"No matches found for '{search_string}'.\n"))
+            if use_index:
+                results = self.search_indexed(folder_path, search_string, file_extensions, result_queue, folder_search)
             else:
-                self.result_queue.put(("info", f"Found matches in {len(results)} files:\n"))
+                results = folder_search.iter_results(folder_path, search_string, file_extensions)
+            
+            # Each file's matches are queued as soon as that file has been searched
+            files_with_matches = 0
+            for file_path, matches in results:
+                files_with_matches += 1
+                rel_path = os.path.relpath(file_path, folder_path)
+                result_queue.put(("file", f"\n📄 {rel_path}\n"))
                 
-                for file_path, matches in results.items():
-                    rel_path = os.path.relpath(file_path, folder_path)
-                    self.result_queue.put(("file", f"\n📄 {rel_path}\n"))
-                    
-                    for i, match in enumerate(matches, 1):
-                        if isinstance(match, tuple) and len(match) == 2:
-                            location, content = match
-                            self.result_queue.put(("location", f"  {i}. Location: {location}\n"))
-                            self.result_queue.put(("content", f"     Content: {content[:100]}{'...' if len(content) > 100 else ''}\n"))
-                        else:
-                            self.result_queue.put(("error", f"  {i}. {match}\n"))  # This is likely an error message
-                    
-                    self.result_queue.put(("info", "-" * 80 + "\n"))
+                for i, match in enumerate(matches, 1):
+                    if isinstance(match, tuple) and len(match) == 2:
+                        location, content = match
+                        result_queue.put(("location", f"  {i}. Location: {location}\n"))
+                        result_queue.put(("content", f"     Content: {content[:100]}{'...' if len(content) > 100 else ''}\n"))
+                    else:
+                        result_queue.put(("error", f"  {i}. {match}\n"))  # This is likely an error message
                 
-                self.result_queue.put(("summary", f"Total files with matches: {len(results)}\n"))
+                result_queue.put(("info", "-" * 80 + "\n"))
+            
+            if folder_search.cancelled:
+                result_queue.put(("error", "Search cancelled.\n"))
+            
+            if not files_with_matches:
+                result_queue.put(("info", f"No matches found for '{label}'.\n"))
+            else:
+                result_queue.put(("summary", f"Total files with matches: {files_with_matches}\n"))
         except Exception as e:
-            self.result_queue.put(("error", f"Error occurred: {str(e)}\n"))
+            result_queue.put(("error", f"Error occurred: {str(e)}\n"))
         finally:
-            self.result_queue.put(("done", None))
+            result_queue.put(("done", None))
     
-    def check_queue(self):
-        try:
-            while True:
-                msg_type, message = self.result_queue.get_nowait()
-                
-                self.result_text.config(state=tk.NORMAL)
-                
-                if msg_type == "file":
-                    self.result_text.insert(tk.END, message, "file")
-                elif msg_type == "location":
-                    self.result_text.insert(tk.END, message, "location")
-                elif msg_type == "content":
-                    self.result_text.insert(tk.END, message, "content")
-                elif msg_type == "error":
-                    self.result_text.insert(tk.END, message, "error")
-                elif msg_type == "summary":
-                    self.result_text.insert(tk.END, message, "summary")
-                else:  # info or other
-                    self.result_text.insert(tk.END, message)
-                
-                self.result_text.config(state=tk.DISABLED)
-                self.result_text.see(tk.END)
-                
-                if msg_type == "done":
-                    self.progress_bar.stop()
-                    self.status_var.set("Search complete")
-                    return
-                
-                self.result_queue.task_done()
-        except queue.Empty:
-            # No more messages for now, check again in 100ms
-            self.root.after(100, self.check_queue)
+    def search_indexed(self, folder_path, search_string, file_extensions, result_queue=None, folder_search=None):
+        """Refresh the folder's index (changed files only) and answer the search from it"""
+        result_queue = self.result_queue if result_queue is None else result_queue
+        folder_search = self.folder_search if folder_search is None else folder_search
+        if self.search_index is None:
+            self.search_index = SearchIndex()
+        
+        result_queue.put(("info", "Updating search index...\n"))
+        stats = self.search_index.update(folder_path, file_extensions, should_stop=lambda: folder_search.cancelled)
+        result_queue.put((
+            "info",
+            f"Index updated: {stats['indexed']} files indexed, {stats['unchanged']} unchanged, "
+            f"{stats['removed']} removed, {stats['errors']} unreadable\n"
+        ))
+        result_queue.put(("info", "-" * 80 + "\n"))
+        
+        if folder_search.cancelled:
+            return
+        yield from self.search_index.iter_results(search_string, folder_path, file_extensions)
+    
+    def cancel_search(self):
+        self.folder_search.cancel()
+        self.status_var.set("Cancelling...")
+    
+    def search_finished(self):
+        self.progress_bar.stop()
+        self.status_var.set("Search complete")
     
     def search_text_file(self, file_path, search_string):
         """Search for a string in a text file and return matches with line numbers."""
-        matches = []
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                for line_num, line in enumerate(file, 1):
-                    if search_string.lower() in line.lower():
-                        matches.append((f"Line {line_num}", line.strip()))
-            return matches
-        except Exception as e:
-            return [f"Error reading file: {str(e)}"]
+        return search_text_file(file_path, search_string)
 
     def search_excel_file(self, file_path, search_string):
         """Search for a string in an Excel file and return matches with cell references."""
-        matches = []
-        try:
-            # Try using pandas for faster processing of regular Excel data
-            try:
-                excel_file = pd.ExcelFile(file_path)
-                for sheet_name in excel_file.sheet_names:
-                    df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                    
-                    # Convert all values to strings for searching
-                    for col in df.columns:
-                        for row_idx, value in enumerate(df[col]):
-                            if value is not None and search_string.lower() in str(value).lower():
-                                cell_ref = f"{sheet_name}!{col}{row_idx+2}"  # +2 because of 0-indexing and header
-                                matches.append((cell_ref, str(value)))
-            
-            # If pandas fails, try using openpyxl for more complex Excel files
-            except Exception:
-                wb = load_workbook(file_path, data_only=True)
-                for sheet_name in wb.sheetnames:
-                    sheet = wb[sheet_name]
-                    for row in sheet.rows:
-                        for cell in row:
-                            if cell.value is not None and search_string.lower() in str(cell.value).lower():
-                                matches.append((f"{sheet_name}!{cell.coordinate}", str(cell.value)))
-                                
-            return matches
-        except Exception as e:
-            return [f"Error reading Excel file: {str(e)}"]
+        return search_excel_file(file_path, search_string)
 
     def search_files_in_folder(self, folder_path, search_string, file_extensions=None):
         """
         Search for a string in all files with specified extensions in a folder.
         Returns a dictionary with file paths as keys and matches as values.
         """
-        if file_extensions is None:
-            file_extensions = ['.txt', '.xlsx', '.xls', '.csv']
-        
-        results = {}
-        
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                _, extension = os.path.splitext(file)
-                
-                if extension.lower() in file_extensions:
-                    matches = []
-                    
-                    if extension.lower() in ['.xlsx', '.xls']:
-                        matches = self.search_excel_file(file_path, search_string)
-                    elif extension.lower() in ['.txt', '.csv']:
-                        matches = self.search_text_file(file_path, search_string)
-                    
-                    if matches:
-                        results[file_path] = matches
-        
-        return results
+        return FolderSearch().search(folder_path, search_string, file_extensions)
 
 def main():
     root = tk.Tk()
@@ -54,4 +54,6 @@ ENABLE_DATA_VISUALIZATION = True
 ENABLE_AUTO_RECOMMENDATIONS = True
 
 # Performance settings
-CHUNK_SIZE = 10000  # For processing large files in chunks
\ No newline at end of file
+CHUNK_SIZE = 10000  # For processing large files in chunks
+LOADER_CACHE_MB = 512  # Memory budget of the DataLoader cache of parsed sheets
+SESSION_MEMORY_MB = 1024  # Memory budget of the loaded DataFrames; colder frames spill to disk
\ No newline at end of file
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Descriptive Statistics
+
+This module computes descriptive statistics of columns in a single streaming
+pass. Count, mean and variance are accumulated with Chan's parallel update of
+the moments, min/max are tracked directly and quantiles are approximated with
+a KLL sketch; sheets that are in memory get exact quantiles instead. All
+accumulators can be merged, so chunks can be described independently (e.g.
+in worker processes) and combined afterwards.
+"""
+
+import copy
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.quality import column_kind, iter_row_slices
+from config.settings import CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Size parameter of the KLL sketch; the rank error is roughly 1.7 / KLL_K
+KLL_K = 200
+
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin, Lang and Liberty).
+
+    Items are kept in levels of compactors; an item at level h stands for
+    2**h original values. A full level is sorted and every other item moves
+    up a level, so memory grows only logarithmically with the input size.
+    """
+
+    def __init__(self, k=KLL_K, seed=None):
+        """Initialize an empty sketch.
+
+        Args:
+            k (int): Size of the top level; larger is more accurate.
+            seed (int): Optional seed of the compaction coin flips.
+        """
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def update(self, values):
+        """Add values to the sketch.
+
+        Args:
+            values (array-like): Numbers; NaN values are ignored.
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """Add the values summarized by another sketch.
+
+        Args:
+            other (KLLSketch): Sketch to merge into this one.
+        """
+        self.n += other.n
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays at this level
+                self.levels[level] = items[len(items) - len(items) % 2:]
+                items = items[:len(items) - len(items) % 2]
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def quantiles(self, qs):
+        """Estimate quantiles of the values added so far.
+
+        Args:
+            qs (iterable): Quantiles between 0 and 1.
+
+        Returns:
+            list: One estimate per quantile, or None values if the sketch is empty.
+        """
+        qs = list(qs)
+        if self.n == 0:
+            return [None] * len(qs)
+
+        items = np.concatenate(self.levels)
+        if len(items) == self.n:
+            # Nothing compacted yet: the quantiles are exact
+            return [float(value) for value in np.quantile(items, qs)]
+        weights = np.concatenate([np.full(len(items_), 2.0 ** level) for level, items_ in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        total = cumulative[-1]
+        positions = np.searchsorted(cumulative, [q * total for q in qs], side='left')
+        return [float(items[min(pos, len(items) - 1)]) for pos in positions]
+
+
+class ColumnStats:
+    """Streaming descriptive statistics of one column.
+
+    The kind of the column (see quality.column_kind) is fixed by the first
+    chunk. Numeric columns get moments and quantiles of their values, text
+    columns moments of their value lengths, and datetime columns their range.
+    """
+
+    def __init__(self, k=KLL_K):
+        """Initialize empty statistics.
+
+        Args:
+            k (int): Size parameter of the quantile sketch.
+        """
+        self.kind = None
+        self.rows = 0
+        self.count = 0  # non-null values
+        self.min = None
+        self.max = None
+        self.sum_count = 0  # values in mean/variance (numbers, or text lengths)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sketch = KLLSketch(k)
+        self.exact_quantiles = None  # quantile -> value, when computed from the whole column
+
+    def update(self, series):
+        """Add one chunk of the column.
+
+        Args:
+            series (pandas.Series): Values of the chunk.
+        """
+        if self.kind is None:
+            self.kind = column_kind(series)
+        self.rows += len(series)
+        values = series.dropna()
+        if not len(values):
+            return
+        self.count += len(values)
+
+        if self.kind == 'numeric':
+            numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+            numbers = numbers[~np.isnan(numbers)]
+            if len(numbers):
+                self._update_extremes(numbers.min(), numbers.max())
+                self._add_moments(numbers)
+                self.sketch.update(numbers)
+        elif self.kind == 'datetime':
+            self._update_extremes(values.min(), values.max())
+        elif self.kind == 'text':
+            lengths = values.astype(str).str.len().to_numpy(dtype=float)
+            self._update_extremes(lengths.min(), lengths.max())
+            self._add_moments(lengths)
+
+    def _update_extremes(self, low, high):
+        self.min = low if self.min is None or low < self.min else self.min
+        self.max = high if self.max is None or high > self.max else self.max
+
+    def _add_moments(self, values):
+        """Combine the moments of a batch of values (Chan et al.)."""
+        n_b = len(values)
+        mean_b = float(values.mean())
+        m2_b = float(((values - mean_b) ** 2).sum())
+        self._combine_moments(n_b, mean_b, m2_b)
+
+    def _combine_moments(self, n_b, mean_b, m2_b):
+        n_a = self.sum_count
+        n = n_a + n_b
+        if n == 0:
+            return
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta ** 2 * n_a * n_b / n
+        self.sum_count = n
+
+    def merge(self, other):
+        """Add the statistics of other chunks of the same column.
+
+        Args:
+            other (ColumnStats): Statistics to merge into these.
+        """
+        if self.kind is None:
+            self.kind = other.kind
+        # Quantiles of part of the column no longer hold for the merged column
+        self.exact_quantiles = None
+        self.rows += other.rows
+        self.count += other.count
+        if other.min is not None:
+            self._update_extremes(other.min, other.max)
+        self._combine_moments(other.sum_count, other.mean, other.m2)
+        self.sketch.merge(other.sketch)
+
+    def results(self, quantiles=DEFAULT_QUANTILES):
+        """Summarize the statistics.
+
+        For text columns min, max, mean and std describe the value lengths.
+
+        Args:
+            quantiles (iterable): Quantiles to estimate for numeric columns.
+
+        Returns:
+            dict: 'kind', 'rows', 'count', 'missing', 'min', 'max', 'mean',
+                  'variance', 'std' and 'quantiles' (quantile -> estimate).
+        """
+        if self.kind != 'numeric':
+            quantile_values = {}
+        elif self.exact_quantiles is not None and all(q in self.exact_quantiles for q in quantiles):
+            quantile_values = {q: self.exact_quantiles[q] for q in quantiles}
+        else:
+            quantile_values = dict(zip(quantiles, self.sketch.quantiles(quantiles)))
+
+        variance = self.m2 / (self.sum_count - 1) if self.sum_count > 1 else None
+        has_moments = self.sum_count > 0
+        return {
+            'kind': self.kind,
+            'rows': self.rows,
+            'count': self.count,
+            'missing': self.rows - self.count,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.mean if has_moments else None,
+            'variance': variance if has_moments else None,
+            'std': variance ** 0.5 if has_moments and variance is not None else None,
+            'quantiles': quantile_values
+        }
+
+
+def describe_chunks(chunks, columns=None, progress_callback=None):
+    """Describe the columns of a sheet in one pass over its chunks.
+
+    Args:
+        chunks (iterable): DataFrame chunks of one sheet.
+        columns (list): Columns to describe (default: all columns of the first chunk).
+        progress_callback (callable): Optional; called with the rows read so far.
+
+    Returns:
+        dict: Column name -> ColumnStats.
+    """
+    stats = None
+    rows = 0
+    for chunk in chunks:
+        if stats is None:
+            stats = {col: ColumnStats() for col in (columns if columns is not None else chunk.columns)}
+        for col, column_stats in stats.items():
+            if col in chunk.columns:
+                column_stats.update(chunk[col])
+        rows += len(chunk)
+        if progress_callback is not None:
+            progress_callback(rows)
+    return stats or {}
+
+
+def describe_frame(df, columns=None, chunk_size=CHUNK_SIZE, progress_callback=None,
+                   quantiles=DEFAULT_QUANTILES):
+    """Describe the columns of an in-memory sheet, slice by slice.
+
+    The whole sheet is at hand, so the quantiles of numeric columns are
+    computed exactly rather than taken from the sketch.
+
+    Args:
+        df (pandas.DataFrame): The sheet.
+        columns (list): Columns to describe (default: all).
+        chunk_size (int): Rows per slice.
+        progress_callback (callable): Optional; called with the rows read so far.
+        quantiles (iterable): Quantiles to compute exactly.
+
+    Returns:
+        dict: Column name -> ColumnStats.
+    """
+    logger.info(f"Describing {len(df)} rows x {len(df.columns)} columns")
+    stats = describe_chunks(iter_row_slices(df, chunk_size), columns, progress_callback)
+
+    quantiles = list(quantiles)
+    for col, column_stats in stats.items():
+        if column_stats.kind == 'numeric' and column_stats.sum_count:
+            numbers = pd.to_numeric(df[col], errors='coerce').astype(float).dropna()
+            column_stats.exact_quantiles = dict(zip(quantiles, (float(v) for v in numbers.quantile(quantiles))))
+    return stats
+
+
+def merge_column_stats(partials):
+    """Merge per-chunk results, e.g. returned by worker processes.
+
+    The partials are left unchanged.
+
+    Args:
+        partials (iterable): Dicts of column name -> ColumnStats.
+
+    Returns:
+        dict: Column name -> merged ColumnStats.
+    """
+    merged = {}
+    for partial in partials:
+        for col, column_stats in partial.items():
+            if col in merged:
+                merged[col].merge(column_stats)
+            else:
+                merged[col] = copy.deepcopy(column_stats)
+    return merged
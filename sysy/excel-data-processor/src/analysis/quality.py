@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Data Quality Engine
+
+This module contains the QualityProfiler class which measures per-column
+completeness, type conformity and distinct counts, and the duplicate-row rate
+of a sheet. Every chunk is processed with vectorized operations in a single
+pass: each column is hashed once, and the column hashes serve both the
+distinct counts and the row hashes used to find duplicate rows. Chunks are
+processed independently, so a sheet of any size can be profiled from an
+iterator of chunks or from row slices of a frame without copying it.
+"""
+
+import logging
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from config.settings import CHUNK_SIZE, COMPLETENESS_THRESHOLD, DUPLICATES_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# Distinct values are counted exactly up to this many; above it they are
+# estimated from the smallest hashes (K minimum values, ~1.5% error)
+DISTINCT_SKETCH_SIZE = 4096
+
+# Odd 64-bit constant used to combine column hashes into row hashes
+_ROW_HASH_MULTIPLIER = np.uint64(0x100000001B3)
+
+# Share of the values of a text column that must parse as numbers for the
+# column to be treated as numeric
+NUMERIC_MAJORITY = 0.5
+
+
+def column_kind(series):
+    """Decide which type the values of a column are expected to have.
+
+    Args:
+        series (pandas.Series): Values of the column (usually the first chunk).
+
+    Returns:
+        str: 'numeric', 'boolean', 'datetime' or 'text'.
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return 'boolean'
+    if pd.api.types.is_numeric_dtype(series):
+        return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'datetime'
+
+    values = series.dropna()
+    if len(values) and pd.to_numeric(values, errors='coerce').notna().mean() >= NUMERIC_MAJORITY:
+        return 'numeric'
+    return 'text'
+
+
+def _conforming_count(series, kind):
+    """Count the non-null values of a chunk that match the expected kind."""
+    values = series.dropna()
+    if kind == 'numeric':
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            return len(values)
+        return int(pd.to_numeric(values, errors='coerce').notna().sum())
+    if kind == 'boolean':
+        if pd.api.types.is_bool_dtype(values):
+            return len(values)
+        return int(values.isin([True, False]).sum())
+    if kind == 'datetime':
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return len(values)
+        with warnings.catch_warnings():
+            # Unparseable values are what is being counted here
+            warnings.simplefilter('ignore')
+            return int(pd.to_datetime(values, errors='coerce', format='mixed').notna().sum())
+    # Text: anything that is not a number
+    if pd.api.types.is_numeric_dtype(values):
+        return 0
+    return len(values) - int(pd.to_numeric(values, errors='coerce').notna().sum())
+
+
+class QualityProfiler:
+    """Accumulates data quality measures over the chunks of one sheet.
+
+    Profilers of different chunks of the same sheet can be combined with
+    merge(), e.g. when the chunks are profiled by worker processes.
+    """
+
+    def __init__(self, sketch_size=DISTINCT_SKETCH_SIZE):
+        """Initialize an empty profiler.
+
+        Args:
+            sketch_size (int): Distinct values counted exactly per column.
+        """
+        self.sketch_size = sketch_size
+        self.rows = 0
+        self.columns = []
+        self.kinds = {}
+        self.non_null = {}
+        self.conforming = {}
+        self.distinct_hashes = {}  # column -> sorted smallest unique hashes
+        self._row_hashes = []  # one uint64 array per chunk
+
+    def update(self, chunk):
+        """Add one chunk of the sheet.
+
+        Args:
+            chunk (pandas.DataFrame): Rows of the sheet; the first chunk fixes
+                                      the columns and their expected types.
+        """
+        if not self.columns:
+            self.columns = list(chunk.columns)
+            for col in self.columns:
+                self.kinds[col] = column_kind(chunk[col])
+                self.non_null[col] = 0
+                self.conforming[col] = 0
+                self.distinct_hashes[col] = np.empty(0, dtype=np.uint64)
+
+        self.rows += len(chunk)
+        non_null = chunk.notna()
+        row_hash = np.zeros(len(chunk), dtype=np.uint64)
+
+        for col in self.columns:
+            if col not in chunk.columns:
+                continue
+            series = chunk[col]
+            present = non_null[col].to_numpy()
+            self.non_null[col] += int(present.sum())
+            self.conforming[col] += _conforming_count(series, self.kinds[col])
+
+            hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+            with np.errstate(over='ignore'):
+                row_hash = row_hash * _ROW_HASH_MULTIPLIER ^ hashes
+            self.distinct_hashes[col] = self._merge_sketch(self.distinct_hashes[col], hashes[present])
+
+        self._row_hashes.append(row_hash)
+
+    def merge(self, other):
+        """Combine the measures of another profiler of the same sheet.
+
+        Args:
+            other (QualityProfiler): Profiler of other chunks of the sheet.
+        """
+        if not self.columns:
+            self.columns = list(other.columns)
+            self.kinds = dict(other.kinds)
+            for col in self.columns:
+                self.non_null[col] = 0
+                self.conforming[col] = 0
+                self.distinct_hashes[col] = np.empty(0, dtype=np.uint64)
+
+        self.rows += other.rows
+        for col in self.columns:
+            if col not in other.non_null:
+                continue
+            self.non_null[col] += other.non_null[col]
+            self.conforming[col] += other.conforming[col]
+            self.distinct_hashes[col] = self._merge_sketch(self.distinct_hashes[col], other.distinct_hashes[col])
+        self._row_hashes.extend(other._row_hashes)
+
+    def _merge_sketch(self, kept, hashes):
+        """Keep the sketch_size smallest unique hashes of both arrays."""
+        return np.unique(np.concatenate([kept, hashes]))[:self.sketch_size]
+
+    def distinct_count(self, col):
+        """Get the number of distinct non-null values of a column.
+
+        Returns:
+            int: Exact count up to sketch_size distinct values, an estimate above it.
+        """
+        kept = self.distinct_hashes[col]
+        if len(kept) < self.sketch_size:
+            return len(kept)
+        # K minimum values: the k-th smallest of n uniform hashes is about k / n of the range
+        kth = float(kept[-1]) / float(np.iinfo(np.uint64).max)
+        return int(round((self.sketch_size - 1) / kth)) if kth > 0 else len(kept)
+
+    def duplicate_rows(self):
+        """Get the number of rows that repeat an earlier row.
+
+        Returns:
+            int: Rows minus distinct row hashes.
+        """
+        if not self._row_hashes:
+            return 0
+        return self.rows - len(np.unique(np.concatenate(self._row_hashes)))
+
+    def results(self, completeness_threshold=COMPLETENESS_THRESHOLD,
+                duplicates_threshold=DUPLICATES_THRESHOLD):
+        """Summarize the measures.
+
+        Args:
+            completeness_threshold (float): Minimum share of non-null values of a column.
+            duplicates_threshold (float): Maximum share of duplicate rows.
+
+        Returns:
+            dict: 'rows', 'duplicate_rows', 'duplicate_rate', 'duplicates_ok' and
+                  'columns', a dict of column -> {'kind', 'non_null', 'completeness',
+                  'conformity', 'distinct', 'complete_ok'}.
+        """
+        duplicate_rows = self.duplicate_rows()
+        duplicate_rate = duplicate_rows / self.rows if self.rows else 0.0
+
+        columns = {}
+        for col in self.columns:
+            non_null = self.non_null[col]
+            completeness = non_null / self.rows if self.rows else 0.0
+            columns[col] = {
+                'kind': self.kinds[col],
+                'non_null': non_null,
+                'completeness': completeness,
+                'conformity': self.conforming[col] / non_null if non_null else 1.0,
+                'distinct': self.distinct_count(col),
+                'complete_ok': completeness >= completeness_threshold
+            }
+
+        return {
+            'rows': self.rows,
+            'duplicate_rows': duplicate_rows,
+            'duplicate_rate': duplicate_rate,
+            'duplicates_ok': duplicate_rate <= duplicates_threshold,
+            'columns': columns
+        }
+
+
+def profile_chunks(chunks, progress_callback=None):
+    """Profile a sheet from an iterator of chunks.
+
+    Args:
+        chunks (iterable): DataFrame chunks of one sheet.
+        progress_callback (callable): Optional; called with the rows profiled so far.
+
+    Returns:
+        QualityProfiler: The filled profiler.
+    """
+    profiler = QualityProfiler()
+    for chunk in chunks:
+        profiler.update(chunk)
+        if progress_callback is not None:
+            progress_callback(profiler.rows)
+    return profiler
+
+
+def iter_row_slices(df, chunk_size=CHUNK_SIZE):
+    """Iterate over a frame in row slices, without copying it.
+
+    Args:
+        df (pandas.DataFrame): Frame to slice.
+        chunk_size (int): Rows per slice.
+
+    Yields:
+        pandas.DataFrame: Consecutive row slices of the frame.
+    """
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def profile_frame(df, chunk_size=CHUNK_SIZE, progress_callback=None):
+    """Profile an in-memory sheet chunk by chunk.
+
+    Args:
+        df (pandas.DataFrame): The sheet.
+        chunk_size (int): Rows per chunk.
+        progress_callback (callable): Optional; called with the rows profiled so far.
+
+    Returns:
+        QualityProfiler: The filled profiler.
+    """
+    logger.info(f"Profiling data quality of {len(df)} rows x {len(df.columns)} columns")
+    return profile_chunks(iter_row_slices(df, chunk_size), progress_callback)
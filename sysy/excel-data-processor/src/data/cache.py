@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Frame Cache
+
+This module contains the FrameCache class, a least-recently-used cache of
+parsed DataFrames bounded by their memory use. Entries are keyed by file
+identity (path, modification time and size) so an edited file is never
+served from the cache.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def frame_memory(df):
+    """Get the memory used by a DataFrame, including Python objects.
+
+    Args:
+        df (pandas.DataFrame): The DataFrame.
+
+    Returns:
+        int: Size in bytes.
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def file_identity(file_path):
+    """Identify the current version of a file.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        tuple: (absolute path, modification time in ns, size in bytes).
+    """
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
+
+
+class FrameCache:
+    """LRU cache of DataFrames with a memory budget.
+
+    The cache is shared by the UI and background loaders, so every operation
+    holds a lock.
+    """
+
+    def __init__(self, budget_bytes):
+        """Initialize the cache.
+
+        Args:
+            budget_bytes (int): Maximum total memory of the cached frames;
+                                0 disables the cache.
+        """
+        self.budget_bytes = budget_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.used_bytes = 0
+        self._entries = OrderedDict()  # key -> (DataFrame, size)
+        self._lock = threading.Lock()
+
+    def make_key(self, file_path, *parts):
+        """Build a cache key for a file and the options used to parse it.
+
+        Args:
+            file_path (str): Path to the file.
+            *parts: Sheet name, options and anything else the result depends on.
+
+        Returns:
+            tuple: Hashable cache key.
+        """
+        return file_identity(file_path) + tuple(repr(part) for part in parts)
+
+    def get(self, key):
+        """Get a cached frame and mark it as recently used.
+
+        Args:
+            key (tuple): Cache key.
+
+        Returns:
+            pandas.DataFrame or None: The cached frame, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key, df):
+        """Cache a frame, evicting the least recently used ones to stay in budget.
+
+        Frames larger than the whole budget are not cached.
+
+        Args:
+            key (tuple): Cache key.
+            df (pandas.DataFrame): Frame to cache.
+
+        Returns:
+            bool: True if the frame was cached.
+        """
+        size = frame_memory(df)
+        with self._lock:
+            self._discard(key)
+            if size > self.budget_bytes:
+                logger.debug(f"Not caching a frame of {size} bytes (budget {self.budget_bytes})")
+                return False
+
+            while self._entries and self.used_bytes + size > self.budget_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.used_bytes -= evicted_size
+                self.evictions += 1
+
+            self._entries[key] = (df, size)
+            self.used_bytes += size
+            return True
+
+    def discard(self, key):
+        """Remove an entry if present.
+
+        Args:
+            key (tuple): Cache key.
+        """
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.used_bytes -= entry[1]
+
+    def clear(self):
+        """Remove all entries; the counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.used_bytes = 0
+
+    def stats(self):
+        """Get the cache counters.
+
+        Returns:
+            dict: Entries, used and budget bytes, hits, misses and evictions.
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'used_bytes': self.used_bytes,
+                'budget_bytes': self.budget_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
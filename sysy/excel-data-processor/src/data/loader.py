@@ -8,21 +8,235 @@ This module contains the DataLoader class which handles loading data from variou
 """
 
 import os
+import numpy as np
 import pandas as pd
 import logging
+from openpyxl import load_workbook
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+
+from src.data.sniffer import sniff_text_file, read_csv_options
+from src.data.xlsx_metadata import read_xlsx_metadata
+from src.data.cache import FrameCache, frame_memory
+from config.settings import CHUNK_SIZE, LOADER_CACHE_MB
+
+try:
+    import pyarrow as pa
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
 
 logger = logging.getLogger(__name__)
 
+# Files at least this large are read with the Arrow CSV engine when pyarrow is installed
+ARROW_MIN_SIZE = 32 * 1024 * 1024
+
+
+# Rows of a chunked read used to infer its column types
+SCHEMA_SAMPLE_ROWS = 100000
+
+
+class ChunkSchema:
+    """Column layout shared by all chunks of a chunked read.
+    
+    The columns come from the first chunk and the dtypes from a sample of the
+    first chunks, so a column whose first rows happen to hold only integers
+    is still typed right when missing values or decimals follow. Integer and
+    boolean columns use the nullable pandas dtypes. The schema never changes
+    after the sample: a later chunk that does not fit it raises ValueError.
+    """
+    
+    def __init__(self, sample):
+        """Initialize the schema from the first chunks.
+        
+        Args:
+            sample (list): First chunks read from the file.
+        """
+        self.columns = list(sample[0].columns)
+        self.sample_rows = sum(len(chunk) for chunk in sample)
+        self.dtypes = {}
+        for col in self.columns:
+            dtype = pd.concat([chunk[col] for chunk in sample if col in chunk.columns]).dtype
+            if pd.api.types.is_bool_dtype(dtype):
+                self.dtypes[col] = pd.BooleanDtype()
+            elif pd.api.types.is_integer_dtype(dtype):
+                self.dtypes[col] = pd.Int64Dtype()
+            else:
+                self.dtypes[col] = dtype
+    
+    def conform(self, chunk):
+        """Align a chunk to the schema.
+        
+        Args:
+            chunk (pandas.DataFrame): Chunk to align.
+            
+        Returns:
+            pandas.DataFrame: The chunk with the schema's columns and dtypes.
+            
+        Raises:
+            ValueError: If a column of the chunk cannot be cast to the schema.
+        """
+        extra = [col for col in chunk.columns if col not in self.dtypes]
+        if extra:
+            logger.warning(f"Dropping columns missing from the first chunk: {extra}")
+        chunk = chunk.reindex(columns=self.columns)
+        
+        for col, dtype in self.dtypes.items():
+            if chunk[col].dtype == dtype:
+                continue
+            if self._fits(chunk[col], dtype):
+                try:
+                    chunk[col] = chunk[col].astype(dtype)
+                    continue
+                except (ValueError, TypeError):
+                    pass
+            raise ValueError(
+                f"Column '{col}' has values that do not fit its type {dtype}, "
+                f"inferred from the first {self.sample_rows:,} rows"
+            )
+        return chunk
+    
+    @staticmethod
+    def _fits(series, dtype):
+        """Whether a column can be cast to dtype without changing its values."""
+        if pd.api.types.is_string_dtype(dtype) and dtype != object:
+            # Casting numbers to a string dtype would silently turn them into text
+            return pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty')
+        return True
+
+
+def _conform_chunks(chunks, sample_rows=SCHEMA_SAMPLE_ROWS):
+    """Yield chunks aligned to a schema inferred from their first sample_rows rows."""
+    chunks = iter(chunks)
+    sample = []
+    rows = 0
+    for chunk in chunks:
+        sample.append(chunk)
+        rows += len(chunk)
+        if rows >= sample_rows:
+            break
+    if not sample:
+        return
+    
+    schema = ChunkSchema(sample)
+    while sample:
+        yield schema.conform(sample.pop(0))
+    for chunk in chunks:
+        yield schema.conform(chunk)
+
+
+def concat_chunks(chunks):
+    """Concatenate the chunks of a sheet, releasing them as they are copied.
+    
+    The result is built column by column and each column is dropped from the
+    chunks once copied, so memory peaks at one column above the data rather
+    than at twice the data. The chunks are left empty.
+    
+    Args:
+        chunks (list): DataFrames sharing the same columns.
+        
+    Returns:
+        pandas.DataFrame: The concatenated frame.
+    """
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0].reset_index(drop=True)
+    
+    columns = list(chunks[0].columns)
+    data = {}
+    for col in columns:
+        data[col] = pd.concat([chunk[col] for chunk in chunks], ignore_index=True)
+        for chunk in chunks:
+            del chunk[col]
+    return pd.DataFrame(data, columns=columns, copy=False)
+
+
+def _header_value(value):
+    """Convert a header cell to a column name the way read_excel does.
+    
+    read_excel turns whole-number floats into ints and names columns with
+    plain Python scalars, while a header row taken from a parsed grid holds
+    numpy scalars (e.g. 2020.0 in a float column).
+    """
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return int(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _header_names(row):
+    """Column names for a header row, named and de-duplicated as pandas.read_excel does."""
+    names = []
+    seen = {}
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None else _header_value(value)
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(name if count == 0 else f"{name}.{count}")
+    return names
+
+
+def _grid_cell(value):
+    """Convert a cell of a raw grid back to the value read_excel parses.
+    
+    read_excel turns whole-number floats into ints and reads empty cells as
+    empty strings; a grid that went through a DataFrame holds numpy scalars
+    and NaN instead.
+    """
+    if value is None or (isinstance(value, (float, np.floating)) and np.isnan(value)):
+        return ''
+    return _header_value(value)
+
+
+def _derive_sheet(raw, header=0, skiprows=0, nrows=None, columns=None, names=None):
+    """Build the frame read_excel would return from a sheet's raw grid.
+    
+    The rows go through the TextParser read_excel itself uses, so header
+    names and column dtypes (e.g. numbers stored as text) come out exactly as
+    if the sheet had been read with these options.
+    
+    Args:
+        raw (pandas.DataFrame): All rows of the sheet, read with header=None.
+        header (int or None): 0 to take the first row after skipped rows as header.
+        skiprows (int): Number of rows to skip at the top of the sheet.
+        nrows (int): Optional number of data rows to keep.
+        columns (list): Optional column projection.
+        names (list): Column names of a grid holding only some columns of the
+                      sheet; the header row is then skipped instead of parsed.
+        
+    Returns:
+        pandas.DataFrame: The sheet with the requested layout.
+    """
+    data = [[_grid_cell(value) for value in row] for row in raw.iloc[skiprows:].itertuples(index=False)]
+    usecols = None
+    if columns is not None and names is None:
+        wanted = set(columns)
+        usecols = lambda col: col in wanted
+    try:
+        parser = TextParser(data, header=header, names=names, nrows=nrows, usecols=usecols, skip_blank_lines=False)
+        return parser.read(nrows=nrows)
+    except EmptyDataError:
+        return pd.DataFrame()
+
 class DataLoader:
     """Handles loading data from various file formats."""
     
-    def __init__(self):
-        """Initialize the DataLoader."""
+    def __init__(self, cache_budget_mb=LOADER_CACHE_MB):
+        """Initialize the DataLoader.
+        
+        Args:
+            cache_budget_mb (int): Memory budget of the cache of parsed data, in MB;
+                                   0 disables caching.
+        """
         self.supported_extensions = {
             'excel': ['.xlsx', '.xls', '.xlsm'],
             'csv': ['.csv'],
             'text': ['.txt']
         }
+        self.use_arrow = HAS_ARROW
+        self.cache = FrameCache(cache_budget_mb * 1024 * 1024)
     
     def load_file(self, file_path, **kwargs):
         """Load data from a file based on its extension.
@@ -62,9 +276,34 @@ class DataLoader:
         Returns:
             list: List of sheet names.
         """
+        return [info['name'] for info in self.get_excel_sheet_info(file_path)]
+    
+    def get_excel_sheet_info(self, file_path):
+        """Get the sheet names and declared sizes of an Excel file.
+        
+        .xlsx/.xlsm workbooks are read through their metadata only, which takes
+        milliseconds whatever their size; other formats fall back to
+        pandas.ExcelFile and report no sizes.
+        
+        Args:
+            file_path (str): Path to the Excel file.
+            
+        Returns:
+            list: One dict per sheet with keys 'name', 'state', 'dimension',
+                  'rows' and 'columns' (counts are None when unknown).
+        """
+        if file_path.lower().endswith(('.xlsx', '.xlsm')):
+            try:
+                return read_xlsx_metadata(file_path)
+            except Exception as e:
+                logger.warning(f"Could not read workbook metadata, opening the file instead: {str(e)}")
+        
         try:
-            xls = pd.ExcelFile(file_path)
-            return xls.sheet_names
+            with pd.ExcelFile(file_path) as xls:
+                return [
+                    {'name': name, 'state': 'visible', 'dimension': None, 'rows': None, 'columns': None}
+                    for name in xls.sheet_names
+                ]
         except Exception as e:
             logger.error(f"Error getting Excel sheet names: {str(e)}")
             raise
@@ -92,12 +331,19 @@ class DataLoader:
             logger.error(f"Error loading Excel file: {str(e)}")
             raise
     
-    def load_excel_sheet(self, file_path, sheet_name, **kwargs):
+    def load_excel_sheet(self, file_path, sheet_name, columns=None, **kwargs):
         """Load a specific sheet from an Excel file.
         
+        The raw grid of each sheet is cached, so switching sheets or changing
+        the header and skip rows options does not parse the workbook again.
+        A projected load parses and caches only the columns it needs. Options
+        other than header, skiprows and nrows bypass the cache.
+        
         Args:
             file_path (str): Path to the Excel file.
             sheet_name (str or int): Name or index of the sheet to load.
+            columns (list): Optional column projection; only these columns are
+                            parsed and names missing from the sheet are ignored.
             **kwargs: Additional arguments to pass to pandas.read_excel().
             
         Returns:
@@ -105,11 +351,75 @@ class DataLoader:
         """
         try:
             logger.info(f"Loading sheet '{sheet_name}' from Excel file: {file_path}")
+            header = kwargs.get('header', 0)
+            skiprows = kwargs.get('skiprows') or 0
+            nrows = kwargs.get('nrows')
+            derivable = (
+                set(kwargs) <= {'header', 'skiprows', 'nrows'}
+                and header in (0, None)
+                and isinstance(skiprows, int)
+            )
+            
+            if derivable:
+                raw, names = self._sheet_grid(file_path, sheet_name, header, skiprows, columns, read=nrows is None)
+                if raw is not None:
+                    return _derive_sheet(raw, header, skiprows, nrows, columns, names)
+            
+            # Options the cache cannot derive, or a preview of a sheet not parsed yet
+            if columns is not None and 'usecols' not in kwargs:
+                wanted = set(columns)
+                kwargs['usecols'] = lambda col: col in wanted
             return pd.read_excel(file_path, sheet_name=sheet_name, **kwargs)
         except Exception as e:
             logger.error(f"Error loading Excel sheet: {str(e)}")
             raise
     
+    def _sheet_grid(self, file_path, sheet_name, header, skiprows, columns=None, read=True):
+        """Get the raw cell grid of a sheet from the cache, parsing it on a miss.
+        
+        A cached grid of the whole sheet serves any projection. Otherwise a
+        projected load finds the positions of its columns from the header row
+        and parses only those, caching them under a key of their own.
+        
+        Args:
+            file_path (str): Path to the Excel file.
+            sheet_name (str or int): Name or index of the sheet.
+            header (int or None): 0 if the sheet has a header row after skipped rows.
+            skiprows (int): Number of rows skipped at the top of the sheet.
+            columns (list): Optional column projection.
+            read (bool): Whether to parse the sheet on a cache miss.
+            
+        Returns:
+            tuple: (grid, names). grid is None on a miss when read is False;
+                   names are the column names of a projected grid, else None.
+        """
+        key = self.cache.make_key(file_path, sheet_name, 'raw')
+        if columns is None or header is None or key in self.cache:
+            raw = self.cache.get(key)
+            if raw is None and read:
+                raw = pd.read_excel(file_path, sheet_name=sheet_name, header=None, dtype=object)
+                self.cache.put(key, raw)
+            return raw, None
+        
+        # Only the header row is parsed to locate the projected columns
+        head_key = self.cache.make_key(file_path, sheet_name, 'head', skiprows)
+        head = self.cache.get(head_key)
+        if head is None:
+            head = pd.read_excel(file_path, sheet_name=sheet_name, header=None, nrows=skiprows + 1, dtype=object)
+            self.cache.put(head_key, head)
+        if len(head) <= skiprows:
+            return self._sheet_grid(file_path, sheet_name, None, skiprows, read=read)
+        sheet_names = _header_names([None if pd.isna(value) else value for value in head.iloc[skiprows]])
+        wanted = set(columns)
+        positions = [i for i, name in enumerate(sheet_names) if name in wanted]
+        
+        key = self.cache.make_key(file_path, sheet_name, 'raw', positions)
+        raw = self.cache.get(key)
+        if raw is None and read:
+            raw = pd.read_excel(file_path, sheet_name=sheet_name, header=None, usecols=positions, dtype=object)
+            self.cache.put(key, raw)
+        return raw, [sheet_names[i] for i in positions]
+    
     def load_csv(self, file_path, **kwargs):
         """Load data from a CSV file.
         
@@ -122,22 +432,42 @@ class DataLoader:
         """
         try:
             logger.info(f"Loading CSV file: {file_path}")
-            # Attempt to auto-detect delimiter if not specified
-            if 'sep' not in kwargs and 'delimiter' not in kwargs:
-                with open(file_path, 'r', encoding=kwargs.get('encoding', 'utf-8')) as f:
-                    sample = f.readline() + f.readline()
-                
-                # Check common delimiters
-                for delimiter in [',', ';', '\t', '|']:
-                    if delimiter in sample:
-                        kwargs['sep'] = delimiter
-                        break
-            
-            return pd.read_csv(file_path, **kwargs)
+            # Sniff delimiter, quoting, header and encoding from a bounded sample;
+            # explicit arguments always win over the sniffed values
+            return self._cached(file_path, ('csv', sorted(kwargs.items())), lambda: self._read_csv(
+                file_path,
+                read_csv_options(sniff_text_file(file_path, encoding=kwargs.get('encoding')), **kwargs)
+            ))
         except Exception as e:
             logger.error(f"Error loading CSV file: {str(e)}")
             raise
     
+    def _read_csv(self, file_path, options):
+        """Read a delimited file, through Arrow for large files when available.
+        
+        The Arrow engine parses on several threads and string columns are kept
+        Arrow-backed, which takes far less memory than Python string objects.
+        Options the Arrow engine does not support fall back to the C engine.
+        
+        Args:
+            file_path (str): Path to the file.
+            options (dict): Arguments for pandas.read_csv().
+            
+        Returns:
+            pandas.DataFrame: The loaded DataFrame.
+        """
+        if self.use_arrow and os.path.getsize(file_path) >= ARROW_MIN_SIZE:
+            try:
+                df = pd.read_csv(file_path, **dict(options, engine='pyarrow'))
+                string_columns = df.select_dtypes(include=['object', 'string']).columns
+                if len(string_columns):
+                    df[string_columns] = df[string_columns].astype(pd.ArrowDtype(pa.string()))
+                return df
+            except (ValueError, pa.ArrowException) as e:
+                logger.warning(f"Arrow CSV engine failed, using the C engine: {str(e)}")
+        
+        return pd.read_csv(file_path, **options)
+    
     def load_text(self, file_path, **kwargs):
         """Load data from a text file.
         
@@ -150,21 +480,247 @@ class DataLoader:
         """
         try:
             logger.info(f"Loading text file: {file_path}")
+            return self._cached(file_path, ('text', sorted(kwargs.items())), lambda: self._read_text(file_path, kwargs))
+        except Exception as e:
+            logger.error(f"Error loading text file: {str(e)}")
+            raise
+    
+    def _read_text(self, file_path, kwargs):
+        """Parse a text file as delimited, or as fixed-width when no delimiter fits."""
+        # Determine from the first bytes whether it's a fixed-width or delimited file
+        sniffed = sniff_text_file(file_path, encoding=kwargs.get('encoding'))
+        if sniffed['sep'] is not None or 'sep' in kwargs or 'delimiter' in kwargs:
+            # If delimiter found, treat as delimited file
+            return self._read_csv(file_path, read_csv_options(sniffed, **kwargs))
+        
+        # If no common delimiter found, try fixed-width
+        return pd.read_fwf(file_path, **dict(kwargs, encoding=kwargs.get('encoding', sniffed['encoding'])))
+    
+    def _cached(self, file_path, options, parse):
+        """Return a cached parse of a file, parsing and caching it on a miss.
+        
+        Args:
+            file_path (str): Path to the file.
+            options: Everything the result depends on besides the file itself.
+            parse (callable): Parses the file into a DataFrame.
+            
+        Returns:
+            pandas.DataFrame: A copy of the cached frame.
+        """
+        key = self.cache.make_key(file_path, options)
+        df = self.cache.get(key)
+        if df is None:
+            df = parse()
+            self.cache.put(key, df)
+        return df.copy()
+    
+    def cache_stats(self):
+        """Get the hit, miss and memory counters of the cache.
+        
+        Returns:
+            dict: Counters as returned by FrameCache.stats().
+        """
+        return self.cache.stats()
+    
+    def iter_file(self, file_path, chunk_size=CHUNK_SIZE, **kwargs):
+        """Read a file chunk by chunk, based on its extension.
+        
+        Args:
+            file_path (str): Path to the file to read.
+            chunk_size (int): Number of rows per chunk.
+            **kwargs: Additional arguments for the format's iterator.
+            
+        Returns:
+            iterator: DataFrames of at most chunk_size rows sharing one schema.
+        """
+        if not os.path.exists(file_path):
+            logger.error(f"File does not exist: {file_path}")
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        _, ext = os.path.splitext(file_path)
+        ext = ext.lower()
+        
+        if ext in self.supported_extensions['excel']:
+            return self.iter_excel_sheet(file_path, chunk_size=chunk_size, **kwargs)
+        elif ext in self.supported_extensions['csv']:
+            return self.iter_csv(file_path, chunk_size=chunk_size, **kwargs)
+        elif ext in self.supported_extensions['text']:
+            return self.iter_text(file_path, chunk_size=chunk_size, **kwargs)
+        else:
+            logger.error(f"Unsupported file extension: {ext}")
+            raise ValueError(f"Unsupported file extension: {ext}")
+    
+    def iter_csv(self, file_path, chunk_size=CHUNK_SIZE, **kwargs):
+        """Read a CSV file chunk by chunk.
+        
+        Args:
+            file_path (str): Path to the CSV file.
+            chunk_size (int): Number of rows per chunk.
+            **kwargs: Additional arguments to pass to pandas.read_csv().
             
-            # Try to determine if it's a fixed-width or delimited file
-            with open(file_path, 'r', encoding=kwargs.get('encoding', 'utf-8')) as f:
-                sample_lines = [f.readline() for _ in range(min(5, sum(1 for _ in open(file_path))))]
-                sample = ''.join(sample_lines)
+        Yields:
+            pandas.DataFrame: Chunks sharing one set of columns and dtypes.
+        """
+        logger.info(f"Reading CSV file in chunks of {chunk_size} rows: {file_path}")
+        sniffed = sniff_text_file(file_path, encoding=kwargs.get('encoding'))
+        options = read_csv_options(sniffed, **kwargs)
+        with pd.read_csv(file_path, chunksize=chunk_size, **options) as reader:
+            yield from _conform_chunks(reader)
+    
+    def iter_text(self, file_path, chunk_size=CHUNK_SIZE, **kwargs):
+        """Read a delimited or fixed-width text file chunk by chunk.
+        
+        Args:
+            file_path (str): Path to the text file.
+            chunk_size (int): Number of rows per chunk.
+            **kwargs: Additional arguments to pass to pandas.read_csv() or pandas.read_fwf().
             
-            # Check for common delimiters
-            delimiters = [',', ';', '\t', '|']
-            for delimiter in delimiters:
-                if delimiter in sample:
-                    # If delimiter found, treat as delimited file
-                    return pd.read_csv(file_path, sep=delimiter, **kwargs)
+        Yields:
+            pandas.DataFrame: Chunks sharing one set of columns and dtypes.
+        """
+        logger.info(f"Reading text file in chunks of {chunk_size} rows: {file_path}")
+        sniffed = sniff_text_file(file_path, encoding=kwargs.get('encoding'))
+        if sniffed['sep'] is not None or 'sep' in kwargs or 'delimiter' in kwargs:
+            reader = pd.read_csv(file_path, chunksize=chunk_size, **read_csv_options(sniffed, **kwargs))
+        else:
+            kwargs.setdefault('encoding', sniffed['encoding'])
+            reader = pd.read_fwf(file_path, chunksize=chunk_size, **kwargs)
+        
+        with reader:
+            yield from _conform_chunks(reader)
+    
+    def iter_excel_sheet(self, file_path, sheet_name=0, chunk_size=CHUNK_SIZE, header=0, skiprows=0, columns=None):
+        """Read one sheet of an Excel file chunk by chunk.
+        
+        .xlsx/.xlsm sheets are streamed row by row through openpyxl in read-only
+        mode, so only one chunk is held in memory. Legacy .xls files cannot be
+        streamed; they are read whole and then sliced. While streaming, the raw
+        grid of the sheet is kept for the cache as long as it fits the budget,
+        so a sheet that was read once is served from memory afterwards.
+        
+        Args:
+            file_path (str): Path to the Excel file.
+            sheet_name (str or int): Name or index of the sheet to read.
+            chunk_size (int): Number of rows per chunk.
+            header (int or None): Row of the header after skipped rows (0 or None).
+            skiprows (int): Number of rows to skip at the top of the sheet.
+            columns (list): Optional column projection.
             
-            # If no common delimiter found, try fixed-width
-            return pd.read_fwf(file_path, **kwargs)
-        except Exception as e:
-            logger.error(f"Error loading text file: {str(e)}")
-            raise
\ No newline at end of file
+        Yields:
+            pandas.DataFrame: Chunks sharing one set of columns and dtypes.
+        """
+        logger.info(f"Reading sheet '{sheet_name}' in chunks of {chunk_size} rows: {file_path}")
+        key = self.cache.make_key(file_path, sheet_name, 'raw')
+        raw, names = self._sheet_grid(
+            file_path, sheet_name, header, skiprows, columns, read=file_path.lower().endswith('.xls')
+        )
+        if raw is not None:
+            df = _derive_sheet(raw, header, skiprows, columns=columns, names=names)
+            # The whole sheet is at hand, so all of it decides the column types
+            yield from _conform_chunks(
+                (df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size)),
+                sample_rows=len(df)
+            )
+            return
+        
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+            raw_pieces = []
+            rows = self._trimmed_rows(ws, chunk_size, raw_pieces)
+            for _ in range(skiprows):
+                next(rows, None)
+            
+            names = None
+            if header is not None:
+                first = next(rows, None)
+                names = _header_names(first or ())
+            # Without a header every chunk is numbered to the width of the sheet
+            width = len(names) if names is not None else ws.max_column
+            
+            def chunks():
+                buffer = []
+                for row in rows:
+                    buffer.append(row)
+                    if len(buffer) >= chunk_size:
+                        yield self._rows_to_frame(buffer, names, width, columns)
+                        buffer = []
+                if buffer:
+                    yield self._rows_to_frame(buffer, names, width, columns)
+            
+            yield from _conform_chunks(chunks())
+            
+            if raw_pieces:
+                self.cache.put(key, pd.concat(raw_pieces, ignore_index=True))
+        finally:
+            wb.close()
+    
+    def _trimmed_rows(self, ws, chunk_size, raw_pieces):
+        """Yield the rows of a worksheet without the trailing blank rows.
+        
+        Blank rows are kept only when data follows, as read_excel does. The
+        rows are also collected into raw_pieces, as header-less frames, until
+        they outgrow the cache budget; raw_pieces is then emptied.
+        
+        Args:
+            ws: openpyxl read-only worksheet.
+            chunk_size (int): Number of rows per collected frame.
+            raw_pieces (list): Receives the raw frames.
+            
+        Yields:
+            tuple: Cell values of each row.
+        """
+        pending = []
+        collected = []
+        collected_bytes = 0
+        collecting = self.cache.budget_bytes > 0
+        blank = 0
+        
+        for row in ws.iter_rows(values_only=True):
+            if all(value is None for value in row):
+                blank += 1
+                continue
+            
+            for kept in [(None,) * len(row)] * blank + [row]:
+                if collecting:
+                    pending.append(kept)
+                    if len(pending) >= chunk_size:
+                        piece = pd.DataFrame.from_records(pending)
+                        pending = []
+                        collected.append(piece)
+                        collected_bytes += frame_memory(piece)
+                        if collected_bytes > self.cache.budget_bytes:
+                            # Too large to cache; stop collecting
+                            collecting = False
+                            collected = []
+                yield kept
+            blank = 0
+        
+        if collecting:
+            if pending:
+                collected.append(pd.DataFrame.from_records(pending))
+            raw_pieces.extend(collected)
+    def _rows_to_frame(self, rows, names, width=None, columns=None):
+        """Build a chunk from worksheet rows.
+        
+        Args:
+            rows (list): Tuples of cell values.
+            names (list): Column names, or None to number the columns.
+            width (int): Number of columns; taken from the rows if None.
+            columns (list): Optional column projection.
+            
+        Returns:
+            pandas.DataFrame: The chunk.
+        """
+        width = width or max(len(row) for row in rows)
+        # Parsed like read_excel parses a sheet, so the chunks get the same dtypes
+        data = [[_grid_cell(value) for value in row[:width]] + [''] * (width - len(row)) for row in rows]
+        usecols = None
+        if columns is not None:
+            wanted = set(columns)
+            usecols = lambda col: col in wanted
+        parser = TextParser(
+            data, header=None, names=names if names is not None else list(range(width)),
+            usecols=usecols, skip_blank_lines=False
+        )
+        return parser.read()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Session Store
+
+This module contains the SessionStore class which holds the DataFrames of a
+session within a memory budget. Frames that have not been used recently are
+spilled to a local cache directory and reloaded transparently when accessed.
+"""
+
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+import pandas as pd
+
+from src.data.cache import frame_memory
+from config.settings import SESSION_MEMORY_MB
+
+try:
+    import pyarrow  # noqa: F401  (needed by DataFrame.to_parquet)
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_refs(entry):
+    """Count the references to the frame of a store entry."""
+    return sys.getrefcount(entry['df'])
+
+
+# References held by the store itself, as counted by _frame_refs
+_STORE_REFS = _frame_refs({'df': object()})
+
+
+class SessionStore(MutableMapping):
+    """Dictionary of name -> DataFrame that spills cold frames to disk.
+
+    Frames are written as Parquet when pyarrow is installed and the frame
+    survives the round-trip unchanged, and pickled otherwise. A frame that is
+    still referenced outside the store (e.g. by a step or a background worker)
+    is never spilled: dropping it would free no memory and in-place edits made
+    through that reference would be lost on reload. A frame returned by the
+    store may be modified in place, so a reloaded frame is written again the
+    next time it is spilled. Once the store is cleaned up it ignores new frames.
+    """
+
+    def __init__(self, budget_mb=SESSION_MEMORY_MB, directory=None):
+        """Initialize the store.
+
+        Args:
+            budget_mb (int): Memory budget of the frames kept in memory, in MB.
+            directory (str): Parent directory of the spill files (system temp by default).
+        """
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self.directory = tempfile.mkdtemp(prefix="session_store_", dir=directory)
+        self.resident_bytes = 0
+        self.spills = 0
+        self.reloads = 0
+        self._entries = {}  # name -> {'df', 'size', 'path', 'dtypes'}
+        self._resident = OrderedDict()  # names of the frames in memory, least recently used first
+        self._counter = 0
+        self.closed = False
+
+        # Remove the spill files once the store is no longer referenced
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+
+    def __setitem__(self, name, df):
+        if self.closed:
+            # e.g. a background load finishing after the session was closed
+            logger.warning(f"Ignoring '{name}': the session store has been cleaned up")
+            return
+        self._remove_file(name)
+        size = frame_memory(df)
+        previous = self._entries.get(name)
+        if previous is not None and previous['df'] is not None:
+            self.resident_bytes -= previous['size']
+
+        self._entries[name] = {'df': df, 'size': size, 'path': None, 'dtypes': None}
+        self._resident[name] = True
+        self._resident.move_to_end(name)
+        self.resident_bytes += size
+        self._enforce_budget(keep=name)
+
+    def __getitem__(self, name):
+        entry = self._entries[name]
+        if entry['df'] is None:
+            entry['df'] = self._read(entry['path'], entry['dtypes'])
+            self.resident_bytes += entry['size']
+            self.reloads += 1
+            logger.debug(f"Reloaded '{name}' from {entry['path']}")
+            # The caller may change the frame in place: write it again on the next spill
+            self._remove_file(name)
+        self._resident[name] = True
+        self._resident.move_to_end(name)
+        self._enforce_budget(keep=name)
+        return entry['df']
+
+    def __delitem__(self, name):
+        entry = self._entries.pop(name)
+        if entry['df'] is not None:
+            self.resident_bytes -= entry['size']
+        self._resident.pop(name, None)
+        if entry['path']:
+            self._delete(entry['path'])
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def is_resident(self, name):
+        """Check whether a frame is currently held in memory.
+
+        Args:
+            name (str): Name of the frame.
+
+        Returns:
+            bool: True if the frame does not need to be reloaded.
+        """
+        return self._entries[name]['df'] is not None
+
+    def spill(self, name):
+        """Move a frame out of memory unless it is referenced outside the store.
+
+        Args:
+            name (str): Name of the frame.
+
+        Returns:
+            bool: True if the frame is (now) on disk only.
+        """
+        entry = self._entries[name]
+        if entry['df'] is None:
+            return True
+        if _frame_refs(entry) > _STORE_REFS:
+            logger.debug(f"Not spilling '{name}': the frame is still referenced")
+            return False
+        self._counter += 1
+        entry['path'] = self._write(entry['df'], os.path.join(self.directory, str(self._counter)))
+        entry['dtypes'] = entry['df'].dtypes
+        entry['df'] = None
+        self.resident_bytes -= entry['size']
+        self._resident.pop(name, None)
+        self.spills += 1
+        logger.debug(f"Spilled '{name}' ({entry['size']} bytes) to {entry['path']}")
+        return True
+
+    def stats(self):
+        """Get the memory and spill counters.
+
+        Returns:
+            dict: Frames, resident frames and bytes, budget, spills and reloads.
+        """
+        return {
+            'frames': len(self._entries),
+            'resident': len(self._resident),
+            'resident_bytes': self.resident_bytes,
+            'budget_bytes': self.budget_bytes,
+            'spills': self.spills,
+            'reloads': self.reloads
+        }
+
+    def cleanup(self):
+        """Drop all frames and delete the spill files; later frames are ignored."""
+        self.closed = True
+        self._entries = {}
+        self._resident.clear()
+        self.resident_bytes = 0
+        self._finalizer()
+
+    def _enforce_budget(self, keep=None):
+        """Spill the least recently used unreferenced frames until the store fits its budget."""
+        for name in list(self._resident):
+            if self.resident_bytes <= self.budget_bytes:
+                break
+            if name != keep:
+                self.spill(name)
+
+    def _write(self, df, base):
+        """Write a frame to a spill file and return its path."""
+        if HAS_ARROW and self._parquet_safe(df):
+            path = base + '.parquet'
+            try:
+                df.to_parquet(path)
+                return path
+            except (ValueError, TypeError, ImportError) as e:
+                # e.g. non-string column names or mixed-type object columns
+                logger.debug(f"Parquet spill failed, pickling instead: {str(e)}")
+                self._delete(path)
+        path = base + '.pkl'
+        df.to_pickle(path)
+        return path
+
+    def _parquet_safe(self, df):
+        """Check whether a frame can be written as Parquet without changing it.
+
+        Object columns (e.g. ints mixed with NaN or strings) and non-string
+        column names do not survive the round-trip, so such frames are pickled.
+        """
+        return (all(isinstance(col, str) for col in df.columns)
+                and not any(dtype == object for dtype in df.dtypes))
+
+    def _read(self, path, dtypes=None):
+        if not path.endswith('.parquet'):
+            return pd.read_pickle(path)
+        df = pd.read_parquet(path)
+        if dtypes is not None and not df.dtypes.equals(dtypes):
+            # e.g. datetime resolution or categories changed by Parquet
+            logger.debug(f"Restoring the dtypes of {path}")
+            df = df.astype(dtypes.to_dict())
+        return df
+
+    def _remove_file(self, name):
+        entry = self._entries.get(name)
+        if entry is not None and entry['path']:
+            self._delete(entry['path'])
+            entry['path'] = None
+
+    def _delete(self, path):
+        if os.path.exists(path):
+            os.remove(path)
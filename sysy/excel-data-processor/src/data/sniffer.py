@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Text File Sniffer
+
+This module detects the encoding, delimiter, quoting and header row of
+delimited text files from a bounded sample, so the file can be parsed by the
+C engine of pandas.read_csv without ever being scanned in full.
+
+The file search and merge app at the repository root keeps its own copy of
+these helpers in core/text_sniffer.py, because the two apps are packaged and
+run separately and neither can import the other. check_copies.py at the
+repository root fails when the shared functions drift apart, so change both
+copies together.
+"""
+
+import csv
+import codecs
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the start of a file; nothing beyond this is ever looked at
+SAMPLE_SIZE = 64 * 1024
+# Lines of the sample used to judge delimiters and the header
+SAMPLE_LINES = 50
+CANDIDATE_DELIMITERS = [',', ';', '\t', '|']
+
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def detect_encoding(raw):
+    """Detect the encoding of a byte sample.
+
+    Args:
+        raw (bytes): Bytes from the start of the file.
+
+    Returns:
+        str: 'utf-8-sig'/'utf-16'/'utf-32' when a BOM is present, 'utf-8' when
+             the sample decodes as UTF-8, otherwise 'latin-1'.
+    """
+    for bom, encoding in BOMS:
+        if raw.startswith(bom):
+            return encoding
+
+    try:
+        raw.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the end of the sample is fine
+        if e.start >= len(raw) - 3 and e.reason == 'unexpected end of data':
+            return 'utf-8'
+        return 'latin-1'
+
+
+def _is_number(value):
+    try:
+        float(value.replace(',', ''))
+        return True
+    except ValueError:
+        return False
+
+
+def _detect_delimiter(lines, candidates):
+    """Pick the delimiter that splits the sample lines most consistently.
+
+    Returns:
+        tuple: (delimiter, quotechar); delimiter is None if no candidate fits.
+    """
+    sample = '\n'.join(lines)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=''.join(candidates))
+        return dialect.delimiter, dialect.quotechar or '"'
+    except csv.Error:
+        pass
+
+    # Fall back to the candidate whose field count is the same on most lines
+    best, best_score = None, 0
+    for delimiter in candidates:
+        counts = [len(row) for row in csv.reader(lines, delimiter=delimiter)]
+        if not counts or max(counts) < 2:
+            continue
+        mode = max(set(counts), key=counts.count)
+        score = counts.count(mode) / len(counts)
+        if mode > 1 and score > best_score:
+            best, best_score = delimiter, score
+    return best, '"'
+
+
+def _has_header(rows):
+    """Guess whether the first row is a header, in the manner of csv.Sniffer.has_header.
+
+    Each column of the body rows is typed: numeric when all its values are
+    numbers, otherwise by the length of its values when they share one. A
+    column votes for a header when the first row's field does not fit its
+    type and for data when it does. The first row is taken as data only when
+    every column votes for data: a column that can't tell (text of varying
+    length, e.g. a 'Region' column over year columns) keeps the header, as
+    pandas assumes by default.
+
+    Args:
+        rows (list): Parsed sample rows.
+
+    Returns:
+        bool: True if the first row should be used as the header.
+    """
+    if len(rows) < 2:
+        return True
+    first, body = rows[0], rows[1:]
+
+    data_votes = 0
+    for col, field in enumerate(first):
+        field = field.strip()
+        values = [row[col].strip() for row in body if col < len(row) and row[col].strip()]
+        if not field or not values:
+            continue
+        if all(_is_number(value) for value in values):
+            fits = _is_number(field)
+        else:
+            lengths = {len(value) for value in values}
+            # Text of varying length can't tell a header from data
+            fits = len(lengths) == 1 and len(field) in lengths
+        if not fits:
+            return True
+        data_votes += 1
+    return data_votes == 0
+
+
+def sniff_text_file(file_path, sample_size=SAMPLE_SIZE, encoding=None, delimiters=None):
+    """Sniff the layout of a delimited text file from its first bytes.
+
+    Args:
+        file_path (str): Path to the file.
+        sample_size (int): Number of bytes to sample.
+        encoding (str): Known encoding; detected from the sample if None.
+        delimiters (list): Candidate delimiters (default: , ; tab |).
+
+    Returns:
+        dict: Keys 'encoding', 'sep' (None when the file is not delimited),
+              'quotechar' and 'header' (0 or None), ready for pandas.read_csv.
+    """
+    with open(file_path, 'rb') as f:
+        raw = f.read(sample_size)
+        truncated = bool(f.read(1))
+
+    if encoding is None:
+        encoding = detect_encoding(raw)
+    text = raw.decode(encoding, errors='ignore')
+
+    lines = text.splitlines()
+    if truncated and lines:
+        # The last line of a cut sample is probably incomplete
+        lines = lines[:-1]
+    lines = [line for line in lines if line.strip()][:SAMPLE_LINES]
+
+    result = {'encoding': encoding, 'sep': None, 'quotechar': '"', 'header': 0}
+    if not lines:
+        return result
+
+    delimiter, quotechar = _detect_delimiter(lines, delimiters or CANDIDATE_DELIMITERS)
+    if delimiter is None:
+        return result
+
+    rows = list(csv.reader(lines, delimiter=delimiter, quotechar=quotechar))
+    result.update({
+        'sep': delimiter,
+        'quotechar': quotechar,
+        'header': 0 if _has_header(rows) else None
+    })
+    logger.debug(f"Sniffed {file_path}: {result}")
+    return result
+
+
+def read_csv_options(sniffed, **kwargs):
+    """Build pandas.read_csv arguments from a sniff result.
+
+    Explicit keyword arguments take precedence over the sniffed values.
+
+    Returns:
+        dict: Arguments for pandas.read_csv using the C engine.
+    """
+    options = {
+        'sep': sniffed['sep'] or ',',
+        'quotechar': sniffed['quotechar'],
+        'header': sniffed['header'],
+        'encoding': sniffed['encoding'],
+        'engine': 'c'
+    }
+    if 'delimiter' in kwargs:
+        options.pop('sep')
+    options.update(kwargs)
+    return options
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Workbook Metadata Reader
+
+This module reads sheet names and declared sheet sizes straight from the zip
+container of .xlsx/.xlsm workbooks. Only workbook.xml, its relationships and
+the dimension record at the top of each worksheet are parsed, so no cell data
+or shared strings are ever loaded.
+
+The file search and merge app at the repository root keeps its own copy of
+these helpers in core/xlsx_metadata.py, because the two apps are packaged and
+run separately and neither can import the other. check_copies.py at the
+repository root fails when the shared functions drift apart, so change both
+copies together.
+"""
+
+import re
+import zipfile
+import logging
+import posixpath
+import xml.etree.ElementTree as ET
+
+logger = logging.getLogger(__name__)
+
+CELL_REF = re.compile(r'^\$?([A-Z]+)\$?(\d+)$')
+
+
+def _local_name(tag):
+    """Strip the namespace from a tag or attribute name.
+
+    Elements are matched by local name so Strict OOXML workbooks, whose
+    namespaces differ from the usual Transitional ones, are read as well.
+    """
+    return tag.rsplit('}', 1)[-1]
+
+
+def _column_number(letters):
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - ord('A') + 1
+    return number
+
+
+def parse_dimension(ref):
+    """Get the number of rows and columns spanned by a dimension reference.
+
+    Args:
+        ref (str): Range such as 'A1:D100' or a single cell such as 'A1'.
+
+    Returns:
+        tuple: (rows, columns), or (None, None) if the reference is invalid.
+    """
+    corners = [CELL_REF.match(part) for part in ref.upper().split(':')]
+    if not corners or not all(corners):
+        return None, None
+    first, last = corners[0], corners[-1]
+    rows = int(last.group(2)) - int(first.group(2)) + 1
+    columns = _column_number(last.group(1)) - _column_number(first.group(1)) + 1
+    return rows, columns
+
+
+def _read_dimension(zf, path):
+    """Read the dimension record from the start of a worksheet part."""
+    try:
+        with zf.open(path) as f:
+            for _, elem in ET.iterparse(f, events=('start',)):
+                tag = _local_name(elem.tag)
+                if tag == 'dimension':
+                    return elem.get('ref')
+                if tag == 'sheetData':
+                    # The dimension record always comes before the cell data
+                    return None
+    except KeyError:
+        logger.debug(f"Worksheet part not found: {path}")
+    return None
+
+
+def _read_workbook(zf):
+    """Parse workbook.xml and its relationships.
+
+    Args:
+        zf (zipfile.ZipFile): Open workbook archive.
+
+    Returns:
+        tuple: (sheets, date1904); sheets is a list of dicts with keys 'name',
+               'state' and 'part' (path of the worksheet in the archive, None
+               when its relationship is missing) in workbook order, date1904
+               is True when the workbook counts dates from 1904.
+    """
+    targets = {}
+    try:
+        rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+        for rel in rels.iter():
+            if _local_name(rel.tag) != 'Relationship':
+                continue
+            target = rel.get('Target', '')
+            # Targets are relative to xl/ unless they start with a slash
+            if target.startswith('/'):
+                target = target.lstrip('/')
+            else:
+                target = posixpath.normpath(posixpath.join('xl', target))
+            targets[rel.get('Id')] = target
+    except KeyError:
+        logger.debug("No workbook relationships")
+
+    sheets = []
+    date1904 = False
+    for element in ET.fromstring(zf.read('xl/workbook.xml')).iter():
+        tag = _local_name(element.tag)
+        if tag == 'workbookPr':
+            date1904 = element.get('date1904', '').lower() in ('1', 'true')
+        elif tag == 'sheet':
+            rel_id = next((value for key, value in element.attrib.items() if _local_name(key) == 'id'), None)
+            sheets.append({
+                'name': element.get('name'),
+                'state': element.get('state', 'visible'),
+                'part': targets.get(rel_id)
+            })
+    return sheets, date1904
+
+
+def read_xlsx_metadata(file_path):
+    """Read the sheets of an .xlsx/.xlsm workbook without loading it.
+
+    Sizes come from the dimension each writer declares and include the header
+    row; some writers (e.g. streaming writers) omit it, in which case the
+    counts are None.
+
+    Args:
+        file_path (str): Path to the workbook.
+
+    Returns:
+        list: One dict per sheet in workbook order, with keys 'name', 'state',
+              'dimension', 'rows' and 'columns'.
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        sheets = []
+        for sheet in _read_workbook(zf)[0]:
+            dimension = _read_dimension(zf, sheet['part']) if sheet['part'] else None
+            rows, columns = parse_dimension(dimension) if dimension else (None, None)
+            sheets.append({
+                'name': sheet['name'],
+                'state': sheet['state'],
+                'dimension': dimension,
+                'rows': rows,
+                'columns': columns
+            })
+
+    logger.debug(f"Read metadata of {len(sheets)} sheets from {file_path}")
+    return sheets
+
+
+def describe_sheet_size(info):
+    """Format the size of a sheet for display.
+
+    Args:
+        info (dict): Sheet metadata as returned by read_xlsx_metadata.
+
+    Returns:
+        str: Text such as '~1,204 rows x 12 columns'.
+    """
+    if info.get('rows') is None:
+        return "size unknown"
+    return f"~{info['rows']:,} rows x {info['columns']:,} columns"
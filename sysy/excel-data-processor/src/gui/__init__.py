@@ -7,12 +7,17 @@ Base Step Class
 This module contains the BaseStep class which all step screens should inherit from.
 """
 
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Interval at which callbacks posted by worker threads are run, in milliseconds
+UI_POLL_MS = 50
+
 class BaseStep:
     """Base class for all step screens."""
     
@@ -28,6 +33,12 @@ class BaseStep:
         self.session_data = session_data
         self.update_status = update_status_callback
         self.dependency = None
+        self.state_changed_callback = None  # Set by the StepManager
+        
+        # Callbacks posted by worker threads; only the Tk thread runs them
+        self._ui_queue = queue.Queue()
+        self._ui_poll_job = None
+        self._active_workers = 0
         
         # Create the step frame which will contain all the step's widgets
         self.frame = ttk.Frame(parent)
@@ -114,6 +125,67 @@ class BaseStep:
         """Save the step state to the session data. Can be overridden by subclasses."""
         pass
     
+    def is_ready(self):
+        """Check whether the step allows moving on, e.g. no background work is pending.
+        
+        Returns:
+            bool: True if the Next button can be enabled.
+        """
+        return True
+    
+    def run_in_background(self, work):
+        """Run a function on a worker thread.
+        
+        The worker must not touch Tk widgets; it hands results back with
+        post_to_ui. Must be called from the Tk thread.
+        
+        Args:
+            work (callable): Function run on the worker thread.
+        """
+        def run():
+            try:
+                work()
+            finally:
+                self._ui_queue.put((self._on_worker_done, ()))
+        
+        self._active_workers += 1
+        threading.Thread(target=run, daemon=True).start()
+        if self._ui_poll_job is None:
+            self._ui_poll_job = self.frame.after(UI_POLL_MS, self._poll_ui_queue)
+    
+    def post_to_ui(self, callback, *args):
+        """Have a callback run on the Tk thread (safe to call from worker threads).
+        
+        Args:
+            callback (callable): Function to run.
+            *args: Arguments of the callback.
+        """
+        self._ui_queue.put((callback, args))
+    
+    def _on_worker_done(self):
+        self._active_workers -= 1
+    
+    def _poll_ui_queue(self):
+        """Run the posted callbacks; keeps polling while workers are running."""
+        self._ui_poll_job = None
+        while True:
+            try:
+                callback, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error(f"Error in background callback: {str(e)}", exc_info=True)
+        
+        if self._active_workers:
+            self._ui_poll_job = self.frame.after(UI_POLL_MS, self._poll_ui_queue)
+    
+    def notify_state_changed(self):
+        """Ask the StepManager to refresh the navigation buttons."""
+        if self.state_changed_callback is not None:
+            self.state_changed_callback()
+    
     def set_dependency(self, step):
         """Set the dependency for this step.
         
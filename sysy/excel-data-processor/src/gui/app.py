@@ -18,6 +18,7 @@ from src.gui.steps.step2_quality import DataQualityStep
 from src.gui.steps.step3_merge import MergeColumnsStep
 from src.gui.steps.step4_analyze import AnalyzeDataStep
 from src.gui.steps.step5_save import SaveResultsStep
+from src.data.session_store import SessionStore
 from config.settings import STEP_TITLES, PADDING
 
 logger = logging.getLogger(__name__)
@@ -37,7 +38,7 @@ class ExcelDataProcessorApp:
         # Session data - shared across steps
         self.session_data = {
             "loaded_file": None,
-            "dataframes": {},  # Sheet name -> DataFrame mapping
+            "dataframes": SessionStore(),  # Sheet name -> DataFrame, spilled to disk over budget
             "current_sheet": None,
             "analysis_results": {},
             "quality_results": {},
@@ -224,10 +225,13 @@ class ExcelDataProcessorApp:
     def _new_session(self):
         """Start a new session, clearing all data."""
         if messagebox.askyesno("New Session", "Start a new session? This will clear all current data."):
-            # Reset session data
+            # Reset session data, deleting the spilled frames of the old session
+            # (a background load still running must not write into it)
+            self.step_manager.steps[0].cancel_load()
+            self.session_data["dataframes"].cleanup()
             self.session_data = {
                 "loaded_file": None,
-                "dataframes": {},
+                "dataframes": SessionStore(),
                 "current_sheet": None,
                 "analysis_results": {},
                 "quality_results": {},
@@ -290,5 +294,7 @@ class ExcelDataProcessorApp:
         """Handle application close."""
         if messagebox.askyesno("Exit", "Are you sure you want to exit?"):
             # Clean up resources
+            self.step_manager.steps[0].cancel_load()
+            self.session_data["dataframes"].cleanup()
             logger.info("Excel Data Processor shutting down")
             self.root.destroy()
\ No newline at end of file
@@ -29,6 +29,10 @@ class StepManager:
         
         # Initialize dependencies between steps
         self._setup_dependencies()
+        
+        # Let steps refresh the navigation when their state changes
+        for step in self.steps:
+            step.state_changed_callback = self.refresh_navigation
     
     def _setup_dependencies(self):
         """Setup dependencies between steps."""
@@ -76,12 +80,20 @@ class StepManager:
         """
         return self.steps[self.current_step_index]
     
+    def refresh_navigation(self):
+        """Refresh the navigation buttons, e.g. after a step finished background work."""
+        self._update_ui()
+    
     def _update_ui(self):
         """Update UI elements based on current step."""
         # Update navigation buttons
         can_go_back = self.current_step_index > 0
         can_go_next = self.current_step_index < len(self.steps) - 1
         
+        # The current step may still be working in the background
+        if can_go_next:
+            can_go_next = self.steps[self.current_step_index].is_ready()
+        
         # Check if next step dependencies are met
         if can_go_next:
             next_step = self.steps[self.current_step_index + 1]
@@ -8,13 +8,14 @@ This module contains the LoadDataStep class which handles data loading functiona
 """
 
 import os
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import logging
-import pandas as pd
 
 from src.gui.steps import BaseStep
-from src.data.loader import DataLoader
+from src.data.loader import DataLoader, concat_chunks
+from src.data.xlsx_metadata import describe_sheet_size
 from src.gui.widgets.data_preview import DataPreviewFrame
 from config.settings import SUPPORTED_FILE_TYPES, MAX_PREVIEW_ROWS
 
@@ -51,6 +52,11 @@ class LoadDataStep(BaseStep):
         self.sheet_combo.pack(side=tk.LEFT, padx=5)
         self.sheet_combo.bind("<<ComboboxSelected>>", self.on_sheet_selected)
         
+        # Declared size of the selected sheet, known before the sheet is loaded
+        self.sheet_size_var = tk.StringVar()
+        ttk.Label(self.sheet_frame, textvariable=self.sheet_size_var).pack(side=tk.LEFT, padx=5)
+        self.sheet_info = {}
+        
         # Hide sheet selection initially
         self.sheet_frame.pack_forget()
         
@@ -106,6 +112,10 @@ class LoadDataStep(BaseStep):
         
         # Create DataLoader instance
         self.loader = DataLoader()
+        
+        # Background full load: the current load id and the event cancelling it
+        self._load_id = 0
+        self._cancel_event = None
     
     def select_file(self):
         """Open file dialog to select a file."""
@@ -134,8 +144,9 @@ class LoadDataStep(BaseStep):
             
             # Excel file - show sheet selector
             if ext in ['.xlsx', '.xls', '.xlsm']:
-                # Get sheet names
-                sheet_names = self.loader.get_excel_sheet_names(file_path)
+                # Get sheet names and sizes from the workbook metadata
+                self.sheet_info = {info['name']: info for info in self.loader.get_excel_sheet_info(file_path)}
+                sheet_names = list(self.sheet_info)
                 
                 if not sheet_names:
                     messagebox.showerror("Error", "No sheets found in the Excel file.")
@@ -144,11 +155,15 @@ class LoadDataStep(BaseStep):
                 # Update sheet combo
                 self.sheet_combo['values'] = sheet_names
                 self.sheet_combo.current(0)  # Select first sheet
+                self.show_sheet_size(sheet_names[0])
                 
                 # Show sheet selection
                 self.sheet_frame.grid()
                 
                 # Load the first sheet
+                self.update_status(
+                    f"Loading sheet '{sheet_names[0]}' ({describe_sheet_size(self.sheet_info[sheet_names[0]])})..."
+                )
                 self.load_sheet(file_path, sheet_names[0])
             
             # CSV file - load directly
@@ -169,35 +184,50 @@ class LoadDataStep(BaseStep):
             self.update_status("Error loading file")
     
     def load_sheet(self, file_path, sheet_name):
-        """Load a specific sheet from an Excel file."""
+        """Load a specific sheet from an Excel file.
+        
+        The first MAX_PREVIEW_ROWS rows are shown at once; the full sheet is
+        then read on a background worker.
+        """
         try:
             # Get loading options
             has_header = self.has_header_var.get()
             skip_rows = int(self.skip_rows_var.get())
             
-            # Load the sheet
-            df = self.loader.load_excel_sheet(
+            # Cancel any load still running for another sheet
+            self.cancel_load()
+            
+            # Phase 1: preview rows only
+            preview = self.loader.load_excel_sheet(
                 file_path,
                 sheet_name,
                 header=0 if has_header else None,
-                skiprows=skip_rows
+                skiprows=skip_rows,
+                nrows=MAX_PREVIEW_ROWS
             )
             
-            if df is None or df.empty:
+            if preview is None or preview.empty:
                 messagebox.showwarning("Warning", f"Sheet '{sheet_name}' is empty.")
                 self.update_status(f"Sheet '{sheet_name}' is empty")
                 return
             
-            # Store in session data
-            self.session_data["dataframes"][sheet_name] = df
-            self.session_data["current_sheet"] = sheet_name
+            self.preview.set_dataframe(preview)
             
-            # Update preview
-            self.preview.set_dataframe(df.head(MAX_PREVIEW_ROWS))
-            
-            # Update status
-            self.update_status(
-                f"Loaded sheet '{sheet_name}' ({len(df)} rows, {len(df.columns)} columns)"
+            # Phase 2: full sheet in the background
+            info = self.sheet_info.get(sheet_name) or {}
+            total_rows = info.get('rows')
+            if total_rows is not None:
+                # The declared size counts the skipped rows and the header row too
+                total_rows = max(total_rows - skip_rows - (1 if has_header else 0), 0)
+            self.start_full_load(
+                sheet_name,
+                lambda: self.loader.iter_excel_sheet(
+                    file_path,
+                    sheet_name,
+                    header=0 if has_header else None,
+                    skiprows=skip_rows
+                ),
+                total_rows
             )
             
         except Exception as e:
@@ -206,35 +236,44 @@ class LoadDataStep(BaseStep):
             self.update_status("Error loading sheet")
     
     def load_csv(self, file_path):
-        """Load a CSV file."""
+        """Load a CSV file.
+        
+        The first MAX_PREVIEW_ROWS rows are shown at once; the full file is
+        then read on a background worker.
+        """
         try:
             # Get loading options
             has_header = self.has_header_var.get()
             skip_rows = int(self.skip_rows_var.get())
             
-            # Load the CSV
-            df = self.loader.load_csv(
+            # Cancel any load still running
+            self.cancel_load()
+            
+            # Phase 1: preview rows only
+            preview = self.loader.load_csv(
                 file_path,
                 header=0 if has_header else None,
-                skiprows=skip_rows
+                skiprows=skip_rows,
+                nrows=MAX_PREVIEW_ROWS
             )
             
-            if df is None or df.empty:
+            if preview is None or preview.empty:
                 messagebox.showwarning("Warning", "CSV file is empty.")
                 self.update_status("CSV file is empty")
                 return
             
-            # Store in session data
-            sheet_name = os.path.basename(file_path)
-            self.session_data["dataframes"][sheet_name] = df
-            self.session_data["current_sheet"] = sheet_name
+            self.preview.set_dataframe(preview)
             
-            # Update preview
-            self.preview.set_dataframe(df.head(MAX_PREVIEW_ROWS))
-            
-            # Update status
-            self.update_status(
-                f"Loaded CSV file ({len(df)} rows, {len(df.columns)} columns)"
+            # Phase 2: full file in the background, through the loader's cache
+            # and Arrow reader, so changing the options back is not parsed again
+            sheet_name = os.path.basename(file_path)
+            self.start_full_load(
+                sheet_name,
+                lambda: iter([self.loader.load_csv(
+                    file_path,
+                    header=0 if has_header else None,
+                    skiprows=skip_rows
+                )])
             )
             
         except Exception as e:
@@ -242,6 +281,107 @@ class LoadDataStep(BaseStep):
             messagebox.showerror("Error", f"Failed to load CSV file: {str(e)}")
             self.update_status("Error loading CSV file")
     
+    def start_full_load(self, sheet_name, make_chunks, total_rows=None):
+        """Read a whole sheet or file on a background worker.
+        
+        Progress is reported in the status bar and the Next button stays
+        disabled until the load finishes. Results of a cancelled load are
+        discarded.
+        
+        Args:
+            sheet_name (str): Key of the data in session_data["dataframes"].
+            make_chunks (callable): Returns an iterator of DataFrame chunks.
+            total_rows (int): Expected number of rows, if known.
+        """
+        self._load_id += 1
+        load_id = self._load_id
+        cancel_event = threading.Event()
+        self._cancel_event = cancel_event
+        self.notify_state_changed()
+        self.update_status(f"Loading '{sheet_name}'...")
+        
+        def worker():
+            chunks = []
+            rows = 0
+            try:
+                iterator = make_chunks()
+                try:
+                    for chunk in iterator:
+                        if cancel_event.is_set():
+                            return
+                        chunks.append(chunk)
+                        rows += len(chunk)
+                        self.post_to_ui(self._on_load_progress, load_id, sheet_name, rows, total_rows)
+                finally:
+                    iterator.close()
+                
+                if cancel_event.is_set():
+                    return
+                df = concat_chunks(chunks)
+                chunks = None
+            except Exception as e:
+                logger.error(f"Error loading '{sheet_name}': {str(e)}", exc_info=True)
+                self.post_to_ui(self._on_load_failed, load_id, sheet_name, str(e))
+                return
+            
+            self.post_to_ui(self._on_load_finished, load_id, sheet_name, df)
+        
+        self.run_in_background(worker)
+    
+    def cancel_load(self):
+        """Cancel the background load in progress, if any."""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            self._cancel_event = None
+            self.notify_state_changed()
+    
+    def is_loading(self):
+        """Check whether a background load is in progress.
+        
+        Returns:
+            bool: True while a full load is running.
+        """
+        return self._cancel_event is not None
+    
+    def _on_load_progress(self, load_id, sheet_name, rows, total_rows):
+        """Show the progress of the background load in the status bar."""
+        if load_id != self._load_id or not self.is_loading():
+            return
+        if total_rows:
+            percent = min(rows / total_rows, 1.0) * 100
+            self.update_status(f"Loading '{sheet_name}': {rows:,} of ~{total_rows:,} rows ({percent:.0f}%)")
+        else:
+            self.update_status(f"Loading '{sheet_name}': {rows:,} rows")
+    
+    def _on_load_finished(self, load_id, sheet_name, df):
+        """Store the fully loaded data and unlock the Next button."""
+        if load_id != self._load_id or not self.is_loading():
+            return
+        self._cancel_event = None
+        
+        if df.empty:
+            messagebox.showwarning("Warning", f"'{sheet_name}' is empty.")
+            self.update_status(f"'{sheet_name}' is empty")
+            self.notify_state_changed()
+            return
+        
+        # Store in session data
+        self.session_data["dataframes"][sheet_name] = df
+        self.session_data["current_sheet"] = sheet_name
+        
+        self.update_status(f"Loaded '{sheet_name}' ({len(df)} rows, {len(df.columns)} columns)")
+        logger.debug(f"Loader cache: {self.loader.cache_stats()}")
+        self.notify_state_changed()
+    
+    def _on_load_failed(self, load_id, sheet_name, message):
+        """Report a failed background load."""
+        if load_id != self._load_id or not self.is_loading():
+            return
+        self._cancel_event = None
+        messagebox.showerror("Error", f"Failed to load '{sheet_name}': {message}")
+        self.update_status(f"Error loading '{sheet_name}'")
+        self.notify_state_changed()
+    
     def on_sheet_selected(self, event=None):
         """Handle sheet selection."""
         sheet_name = self.sheet_var.get()
@@ -253,8 +393,14 @@ class LoadDataStep(BaseStep):
             return
         
         # Load the selected sheet
+        self.show_sheet_size(sheet_name)
         self.load_sheet(file_path, sheet_name)
     
+    def show_sheet_size(self, sheet_name):
+        """Show the declared size of a sheet next to the sheet selector."""
+        info = self.sheet_info.get(sheet_name)
+        self.sheet_size_var.set(describe_sheet_size(info) if info else "")
+    
     def refresh_preview(self, event=None):
         """Refresh the data preview based on current options."""
         file_path = self.file_path_var.get()
@@ -297,8 +443,16 @@ class LoadDataStep(BaseStep):
                     f"Showing {current_sheet} ({len(df)} rows, {len(df.columns)} columns)"
                 )
     
+    def is_ready(self):
+        """The Next button stays disabled while a sheet is loading."""
+        return not self.is_loading()
+    
     def validate(self):
         """Validate step data before proceeding."""
+        if self.is_loading():
+            messagebox.showinfo("Info", "The data is still loading. Please wait for it to finish.")
+            return False
+        
         if not self.session_data.get("loaded_file"):
             messagebox.showerror("Error", "Please load a file before proceeding.")
             return False
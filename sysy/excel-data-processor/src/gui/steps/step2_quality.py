@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Data Quality Step
+
+This module contains the DataQualityStep class which assesses the quality of
+the loaded data: completeness, type conformity and distinct values of each
+column, and the rate of duplicate rows.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+import logging
+
+from src.gui.steps import BaseStep
+from src.analysis.quality import profile_frame
+from config.settings import COMPLETENESS_THRESHOLD, DUPLICATES_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+class DataQualityStep(BaseStep):
+    """Step for assessing data quality."""
+
+    def _get_title(self):
+        return "Step 2: Assess Data Quality"
+
+    def _get_description(self):
+        return (
+            "Review the completeness, type conformity and distinct values of each column, "
+            "and the share of duplicate rows in the current sheet."
+        )
+
+    def _init_ui(self):
+        """Initialize the step UI."""
+        # Summary area
+        summary_frame = ttk.LabelFrame(self.content_frame, text="Summary", padding=10)
+        summary_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.summary_var = tk.StringVar(value="No assessment yet")
+        ttk.Label(summary_frame, textvariable=self.summary_var).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(
+            summary_frame,
+            text="Run Assessment",
+            command=self.run_assessment
+        ).pack(side=tk.RIGHT, padx=5)
+
+        # Column results
+        results_frame = ttk.LabelFrame(self.content_frame, text="Columns", padding=10)
+        results_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        columns = ("column", "type", "completeness", "conformity", "distinct", "status")
+        self.results_tree = ttk.Treeview(results_frame, columns=columns, show="headings")
+        headings = {
+            "column": ("Column", 200),
+            "type": ("Expected Type", 100),
+            "completeness": ("Completeness", 100),
+            "conformity": ("Type Conformity", 110),
+            "distinct": ("Distinct Values", 110),
+            "status": ("Status", 200)
+        }
+        for col, (text, width) in headings.items():
+            self.results_tree.heading(col, text=text)
+            self.results_tree.column(col, width=width, anchor="w" if col in ("column", "status") else "e")
+
+        scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.results_tree.yview)
+        self.results_tree.configure(yscrollcommand=scrollbar.set)
+        self.results_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.results_tree.tag_configure("warning", foreground="#b00000")
+
+        # Id of the running assessment; results of older runs are ignored
+        self._run_id = 0
+        self._running = False
+
+    def run_assessment(self):
+        """Profile the current sheet on a background worker."""
+        sheet_name = self.session_data.get("current_sheet")
+        dataframes = self.session_data.get("dataframes", {})
+        if not sheet_name or sheet_name not in dataframes:
+            messagebox.showinfo("Info", "No data loaded to assess.")
+            return
+
+        df = dataframes[sheet_name]
+        total_rows = len(df)
+        self._run_id += 1
+        run_id = self._run_id
+        self._running = True
+        self.notify_state_changed()
+        self.update_status(f"Assessing data quality of '{sheet_name}'...")
+
+        def progress(rows):
+            self.post_to_ui(self._on_progress, run_id, sheet_name, rows, total_rows)
+
+        def worker():
+            try:
+                results = profile_frame(df, progress_callback=progress).results()
+            except Exception as e:
+                logger.error(f"Error assessing data quality: {str(e)}", exc_info=True)
+                self.post_to_ui(self._on_failed, run_id, str(e))
+                return
+            self.post_to_ui(self._on_finished, run_id, sheet_name, results)
+
+        self.run_in_background(worker)
+
+    def _on_progress(self, run_id, sheet_name, rows, total_rows):
+        """Show the progress of the assessment in the status bar."""
+        if run_id != self._run_id:
+            return
+        percent = rows / total_rows * 100 if total_rows else 100
+        self.update_status(f"Assessing '{sheet_name}': {rows:,} of {total_rows:,} rows ({percent:.0f}%)")
+
+    def _on_finished(self, run_id, sheet_name, results):
+        """Store and display the assessment results."""
+        if run_id != self._run_id:
+            return
+        self._running = False
+        self.session_data["quality_results"][sheet_name] = results
+        self.show_results(results)
+        self.update_status(f"Data quality assessed for '{sheet_name}'")
+        self.notify_state_changed()
+
+    def _on_failed(self, run_id, message):
+        """Report a failed assessment."""
+        if run_id != self._run_id:
+            return
+        self._running = False
+        messagebox.showerror("Error", f"Failed to assess data quality: {message}")
+        self.update_status("Error assessing data quality")
+        self.notify_state_changed()
+
+    def show_results(self, results):
+        """Display assessment results.
+
+        Args:
+            results (dict): Results as returned by QualityProfiler.results().
+        """
+        for item in self.results_tree.get_children():
+            self.results_tree.delete(item)
+
+        duplicates_text = (
+            f"{results['duplicate_rows']:,} duplicate rows ({results['duplicate_rate']:.1%})"
+        )
+        if not results['duplicates_ok']:
+            duplicates_text += f" - above the {DUPLICATES_THRESHOLD:.0%} threshold"
+        self.summary_var.set(f"{results['rows']:,} rows, {len(results['columns'])} columns. {duplicates_text}")
+
+        for col, info in results['columns'].items():
+            problems = []
+            if not info['complete_ok']:
+                problems.append(f"below {COMPLETENESS_THRESHOLD:.0%} complete")
+            if info['conformity'] < 1.0:
+                problems.append("mixed types")
+
+            self.results_tree.insert(
+                "",
+                tk.END,
+                values=(
+                    col,
+                    info['kind'],
+                    f"{info['completeness']:.1%}",
+                    f"{info['conformity']:.1%}",
+                    f"{info['distinct']:,}",
+                    ", ".join(problems) or "OK"
+                ),
+                tags=("warning",) if problems else ()
+            )
+
+    def on_show(self):
+        """Called when the step is shown."""
+        sheet_name = self.session_data.get("current_sheet")
+        results = self.session_data.get("quality_results", {}).get(sheet_name)
+        if results is not None:
+            self.show_results(results)
+        elif sheet_name:
+            self.run_assessment()
+
+    def is_ready(self):
+        """The Next button stays disabled while the assessment runs."""
+        return not self._running
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Analyze Data Step
+
+This module contains the AnalyzeDataStep class which shows descriptive
+statistics of every column of the current sheet, computed in a single pass.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+import logging
+
+from src.gui.steps import BaseStep
+from src.analysis.descriptive import describe_frame
+
+logger = logging.getLogger(__name__)
+
+class AnalyzeDataStep(BaseStep):
+    """Step for analyzing the data."""
+
+    def _get_title(self):
+        return "Step 4: Analyze Data"
+
+    def _get_description(self):
+        return (
+            "Review descriptive statistics of each column: counts, range, mean, "
+            "standard deviation and quartiles. Text columns are described by the "
+            "length of their values."
+        )
+
+    def _init_ui(self):
+        """Initialize the step UI."""
+        # Summary area
+        summary_frame = ttk.LabelFrame(self.content_frame, text="Summary", padding=10)
+        summary_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.summary_var = tk.StringVar(value="No analysis yet")
+        ttk.Label(summary_frame, textvariable=self.summary_var).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(
+            summary_frame,
+            text="Run Analysis",
+            command=self.run_analysis
+        ).pack(side=tk.RIGHT, padx=5)
+
+        # Column statistics
+        stats_frame = ttk.LabelFrame(self.content_frame, text="Columns", padding=10)
+        stats_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        columns = ("column", "kind", "count", "missing", "min", "max", "mean", "std", "q1", "median", "q3")
+        self.stats_tree = ttk.Treeview(stats_frame, columns=columns, show="headings")
+        headings = {
+            "column": ("Column", 180),
+            "kind": ("Type", 80),
+            "count": ("Count", 80),
+            "missing": ("Missing", 80),
+            "min": ("Min", 110),
+            "max": ("Max", 110),
+            "mean": ("Mean", 90),
+            "std": ("Std Dev", 90),
+            "q1": ("25%", 80),
+            "median": ("Median", 80),
+            "q3": ("75%", 80)
+        }
+        for col, (text, width) in headings.items():
+            self.stats_tree.heading(col, text=text)
+            self.stats_tree.column(col, width=width, anchor="w" if col in ("column", "kind") else "e")
+
+        y_scrollbar = ttk.Scrollbar(stats_frame, orient=tk.VERTICAL, command=self.stats_tree.yview)
+        x_scrollbar = ttk.Scrollbar(stats_frame, orient=tk.HORIZONTAL, command=self.stats_tree.xview)
+        self.stats_tree.configure(yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
+        y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.stats_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Id of the running analysis; results of older runs are ignored
+        self._run_id = 0
+        self._running = False
+
+    def run_analysis(self):
+        """Describe the columns of the current sheet on a background worker."""
+        sheet_name = self.session_data.get("current_sheet")
+        dataframes = self.session_data.get("dataframes", {})
+        if not sheet_name or sheet_name not in dataframes:
+            messagebox.showinfo("Info", "No data loaded to analyze.")
+            return
+
+        df = dataframes[sheet_name]
+        total_rows = len(df)
+        self._run_id += 1
+        run_id = self._run_id
+        self._running = True
+        self.notify_state_changed()
+        self.update_status(f"Analyzing '{sheet_name}'...")
+
+        def progress(rows):
+            self.post_to_ui(self._on_progress, run_id, sheet_name, rows, total_rows)
+
+        def worker():
+            try:
+                stats = describe_frame(df, progress_callback=progress)
+                results = {col: column_stats.results() for col, column_stats in stats.items()}
+            except Exception as e:
+                logger.error(f"Error analyzing data: {str(e)}", exc_info=True)
+                self.post_to_ui(self._on_failed, run_id, str(e))
+                return
+            self.post_to_ui(self._on_finished, run_id, sheet_name, results)
+
+        self.run_in_background(worker)
+
+    def _on_progress(self, run_id, sheet_name, rows, total_rows):
+        """Show the progress of the analysis in the status bar."""
+        if run_id != self._run_id:
+            return
+        percent = rows / total_rows * 100 if total_rows else 100
+        self.update_status(f"Analyzing '{sheet_name}': {rows:,} of {total_rows:,} rows ({percent:.0f}%)")
+
+    def _on_finished(self, run_id, sheet_name, results):
+        """Store and display the statistics."""
+        if run_id != self._run_id:
+            return
+        self._running = False
+        self.session_data["analysis_results"][sheet_name] = results
+        self.show_results(results)
+        self.update_status(f"Analysis complete for '{sheet_name}'")
+        self.notify_state_changed()
+
+    def _on_failed(self, run_id, message):
+        """Report a failed analysis."""
+        if run_id != self._run_id:
+            return
+        self._running = False
+        messagebox.showerror("Error", f"Failed to analyze data: {message}")
+        self.update_status("Error analyzing data")
+        self.notify_state_changed()
+
+    def show_results(self, results):
+        """Display column statistics.
+
+        Args:
+            results (dict): Column name -> ColumnStats.results().
+        """
+        for item in self.stats_tree.get_children():
+            self.stats_tree.delete(item)
+
+        rows = next(iter(results.values()))['rows'] if results else 0
+        self.summary_var.set(f"{rows:,} rows, {len(results)} columns")
+
+        for col, info in results.items():
+            quantiles = info['quantiles']
+            self.stats_tree.insert(
+                "",
+                tk.END,
+                values=(
+                    col,
+                    info['kind'],
+                    f"{info['count']:,}",
+                    f"{info['missing']:,}",
+                    self._format_value(info['min']),
+                    self._format_value(info['max']),
+                    self._format_value(info['mean']),
+                    self._format_value(info['std']),
+                    self._format_value(quantiles.get(0.25)),
+                    self._format_value(quantiles.get(0.5)),
+                    self._format_value(quantiles.get(0.75))
+                )
+            )
+
+    def _format_value(self, value):
+        """Format a statistic for display."""
+        if value is None:
+            return ""
+        if isinstance(value, float):
+            return f"{value:,.4g}"
+        return str(value)
+
+    def on_show(self):
+        """Called when the step is shown."""
+        sheet_name = self.session_data.get("current_sheet")
+        results = self.session_data.get("analysis_results", {}).get(sheet_name)
+        if results is not None:
+            self.show_results(results)
+        elif sheet_name:
+            self.run_analysis()
+
+    def is_ready(self):
+        """The Next button stays disabled while the analysis runs."""
+        return not self._running
@@ -1,3 +1,4 @@
+import queue
 import tkinter as tk
 from tkinter import ttk
 
@@ -175,4 +176,117 @@ def add_button(frame, text, command, side="left", padx=5):
     """
     button = ttk.Button(frame, text=text, command=command)
     button.pack(side=side, padx=padx)
-    return button
\ No newline at end of file
+    return button
+
+class BatchedTextSink:
+    """
+    Streams (tag, text) messages into a Text widget in bulk.
+
+    Messages are queued by any thread and drained on the Tk thread every
+    ``interval_ms``: each drain writes at most ``max_batch`` messages with a
+    single insert call, so the widget is redrawn once per frame instead of
+    once per message. After ``max_messages`` the remaining messages are only
+    counted and reported in a summary line when the stream is finished.
+    """
+    def __init__(self, text_widget, message_queue=None, on_done=None,
+                 interval_ms=50, max_batch=2000, max_messages=50000, done_type="done", autoscroll=True):
+        self.text_widget = text_widget
+        self.queue = message_queue if message_queue is not None else queue.Queue()
+        self.on_done = on_done
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self.max_messages = max_messages
+        self.done_type = done_type
+        self.autoscroll = autoscroll
+        
+        self.written = 0
+        self.dropped = 0
+        self._job = None
+    
+    def write(self, text, tag=None):
+        """Queue a message (safe to call from worker threads)"""
+        self.queue.put((tag, text))
+    
+    def start(self):
+        """Start draining the queue periodically"""
+        self.written = 0
+        self.dropped = 0
+        if self._job is None:
+            self._job = self.text_widget.after(self.interval_ms, self._drain)
+    
+    def stop(self):
+        """Stop draining and discard the messages still queued"""
+        if self._job is not None:
+            self.text_widget.after_cancel(self._job)
+            self._job = None
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+    
+    def flush(self):
+        """
+        Write everything currently queued
+        
+        Returns:
+            True if the done message was reached
+        """
+        while True:
+            done, remaining = self._write_batch()
+            if done or not remaining:
+                return done
+    
+    def _drain(self):
+        self._job = None
+        done, _ = self._write_batch()
+        if not done:
+            self._job = self.text_widget.after(self.interval_ms, self._drain)
+    
+    def _write_batch(self):
+        """Write one batch; returns (done, more_messages_waiting)"""
+        chunks = []
+        done = False
+        
+        for _ in range(self.max_batch):
+            try:
+                tag, text = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if tag == self.done_type:
+                done = True
+                break
+            if text is None:
+                continue
+            
+            if self.written >= self.max_messages:
+                self.dropped += 1
+                continue
+            
+            # Consecutive messages with the same tag are joined into one chunk
+            if chunks and chunks[-1][1] == tag:
+                chunks[-1][0].append(text)
+            else:
+                chunks.append(([text], tag))
+            self.written += 1
+        
+        if done and self.dropped:
+            chunks.append(([f"\n... {self.dropped} more results not shown (display limit of {self.max_messages} reached)\n"], "summary"))
+        
+        if chunks:
+            args = []
+            for texts, tag in chunks:
+                args.extend(("".join(texts), (tag,) if tag else ()))
+            
+            previous_state = self.text_widget.cget("state")
+            self.text_widget.config(state=tk.NORMAL)
+            self.text_widget.insert(tk.END, *args)
+            self.text_widget.config(state=previous_state)
+            if self.autoscroll:
+                self.text_widget.see(tk.END)
+        
+        if done and self.on_done:
+            self.on_done()
+        
+        return done, not self.queue.empty()
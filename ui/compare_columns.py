@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from ui.common import BatchedTextSink
+
 class CompareColumnsWindow:
     """
     Window for comparing columns for duplicate values
@@ -149,35 +151,42 @@ class CompareColumnsWindow:
         
         # Clear previous results
         self.results_text.delete(1.0, tk.END)
-        self.results_text.insert(tk.END, f"Comparing {len(selected_columns)} columns for duplicate values...\n\n")
+        
+        # Lines are collected and written to the widget in one insert
+        sink = BatchedTextSink(self.results_text, autoscroll=False)
+        sink.write(f"Comparing {len(selected_columns)} columns for duplicate values...\n\n")
         
         # Perform comparison
         try:
             comparison_result = self.merger.compare_columns_for_duplicates(self.sheet_name, selected_columns)
             if not comparison_result:
-                self.results_text.insert(tk.END, "Failed to compare columns.")
+                sink.write("Failed to compare columns.")
+                sink.flush()
                 return
             
             # Display results
-            self.results_text.insert(tk.END, f"Found {comparison_result['duplicate_count']} rows with duplicate values out of {comparison_result['total_rows']} total rows.\n\n")
+            sink.write(f"Found {comparison_result['duplicate_count']} rows with duplicate values out of {comparison_result['total_rows']} total rows.\n\n")
             
             # Show some of the duplicates
             if comparison_result['duplicate_count'] > 0:
-                self.results_text.insert(tk.END, "Sample of rows with duplicate values:\n")
+                sink.write("Sample of rows with duplicate values:\n")
                 dup_rows = comparison_result['duplicate_rows']
                 
                 # Show at most 5 duplicate rows
                 sample_size = min(5, len(dup_rows))
-                for i, (idx, row) in enumerate(dup_rows.iloc[:sample_size].iterrows()):
-                    self.results_text.insert(tk.END, f"Row {idx+1}:\n")
+                sample = dup_rows.iloc[:sample_size]
+                for i, (idx, values) in enumerate(zip(sample.index, sample[selected_columns].itertuples(index=False))):
+                    sink.write(f"Row {idx+1}:\n")
                     
                     # Show only the original columns (not the added metadata)
-                    for col in selected_columns:
-                        self.results_text.insert(tk.END, f"  {col}: {row[col]}\n")
+                    for col, value in zip(selected_columns, values):
+                        sink.write(f"  {col}: {value}\n")
                     
                     # Add separator between rows
                     if i < sample_size - 1:
-                        self.results_text.insert(tk.END, "\n")
+                        sink.write("\n")
+            
+            sink.flush()
             
             # Suggest a name for the new column
             if not self.new_column_var.get():
@@ -185,7 +194,8 @@ class CompareColumnsWindow:
                 
         except Exception as e:
             messagebox.showerror("Error", f"Error comparing columns: {str(e)}")
-            self.results_text.insert(tk.END, f"Error: {str(e)}")
+            sink.write(f"Error: {str(e)}")
+            sink.flush()
     
     def create_common_column(self):
         """Create a common column based on the selected columns"""
@@ -3,6 +3,7 @@ from tkinter import ttk, messagebox
 import os
 
 from core.file_operations import FileOperations
+from core.xlsx_metadata import read_sheet_info, describe_sheet_size
 from ui.manual_merge import ManualMergeWindow
 from ui.compare_columns import CompareColumnsWindow
 from ui.column_preview import ColumnPreviewWindow
@@ -229,8 +230,14 @@ class MainWindow:
             if file_path:
                 self.file_var.set(file_path)
                 
-                # Set the file in the merger
-                self.merger.set_input_file(file_path)
+                # Show the sheet sizes from the workbook metadata before the data loads
+                sheet_info = read_sheet_info(file_path)
+                known_rows = sum(info['rows'] or 0 for info in sheet_info)
+                self.status_var.set(f"Loading {len(sheet_info)} sheets (~{known_rows:,} rows)...")
+                self.root.update_idletasks()
+                
+                # Set the file in the merger; the metadata just read is reused
+                self.merger.set_input_file(file_path, sheet_info=sheet_info)
                 
                 # Clear previous results
                 for item in self.auto_results_tree.get_children():
@@ -239,7 +246,10 @@ class MainWindow:
                 # Update sheet selectors
                 self.update_sheet_selectors()
                 
-                self.status_var.set("File selected. Use tabs to perform different operations.")
+                sizes = ", ".join(
+                    f"{name} ({describe_sheet_size(info)})" for name, info in self.merger.sheet_info.items()
+                )
+                self.status_var.set(f"File selected: {sizes}. Use tabs to perform different operations.")
                 
                 # Enable buttons
                 self.analyze_button.configure(state="normal")
@@ -9,12 +9,19 @@ class ManualMergeWindow:
     """
     Window for manually merging selected columns with enhanced similar column detection
     """
+    PREVIEW_ROWS = 3  # Rows shown in the preview
+    PREVIEW_DELAY_MS = 150  # Quiet period before the preview is refreshed
+    
     def __init__(self, parent, merger, sheet_name, column_list):
         self.parent = parent
         self.merger = merger
         self.sheet_name = sheet_name
         self.column_list = column_list
         
+        # Pending preview refresh and cached sample rows
+        self._preview_job = None
+        self._preview_cache = None
+        
         # Create a new window
         self.window = tk.Toplevel(parent)
         self.window.title(f"Manual Column Merge - {sheet_name}")
@@ -165,7 +172,8 @@ class ManualMergeWindow:
                 strategy_frame, 
                 text=text, 
                 variable=self.strategy_var, 
-                value=value
+                value=value,
+                command=self.schedule_preview
             ).pack(anchor="w", padx=5, pady=2)
         
         # Additional options
@@ -200,7 +208,7 @@ class ManualMergeWindow:
         cancel_button.pack(side="right", padx=5)
         
         # Bind listbox selection to update preview
-        self.columns_listbox.bind('<<ListboxSelect>>', self.update_preview)
+        self.columns_listbox.bind('<<ListboxSelect>>', self.schedule_preview)
         
         # ---- IMPROVED WINDOW SIZING CODE ----
         self.window.update_idletasks()
@@ -436,7 +444,7 @@ class ManualMergeWindow:
                     self.columns_listbox.selection_clear(idx)
             
             # Update preview
-            self.update_preview()
+            self.schedule_preview()
         except ValueError:
             pass  # Column not found
     
@@ -454,7 +462,7 @@ class ManualMergeWindow:
                 pass  # Column not found
         
         # Update preview
-        self.update_preview()
+        self.schedule_preview()
         
         # Auto-create a name for the merged column
         if len(group) > 0:
@@ -485,8 +493,31 @@ class ManualMergeWindow:
             return " ".join(sorted(all_words, key=lambda w: normalized[0].find(w)))
         return ""
     
+    def schedule_preview(self, event=None):
+        """Refresh the preview once the selection has settled"""
+        # Collapse bursts of selection events (e.g. "Select All") into one update
+        if self._preview_job is not None:
+            self.window.after_cancel(self._preview_job)
+        self._preview_job = self.window.after(self.PREVIEW_DELAY_MS, self.update_preview)
+    
+    def get_preview_sample(self):
+        """Return the first rows of the sheet, cached until invalidate_preview is called"""
+        df = self.merger.current_sheets[self.sheet_name]
+        
+        # Frames are also changed in place (e.g. by manual_merge_columns), so the
+        # cache is dropped explicitly by every change; a replaced frame is
+        # caught by its identity
+        if self._preview_cache is None or self._preview_cache[0] is not df:
+            self._preview_cache = (df, df.head(self.PREVIEW_ROWS))
+        return self._preview_cache[1]
+    
+    def invalidate_preview(self):
+        """Forget the cached sample rows; call this whenever the sheet is changed"""
+        self._preview_cache = None
+    
     def update_preview(self, event=None):
         """Update the preview of selected columns"""
+        self._preview_job = None
         self.preview_text.delete(1.0, tk.END)
         
         selected_indices = self.columns_listbox.curselection()
@@ -495,7 +526,7 @@ class ManualMergeWindow:
             return
         
         selected_columns = [self.column_list[i] for i in selected_indices]
-        self.preview_text.insert(tk.END, f"Selected columns: {', '.join(selected_columns)}\n\n")
+        lines = [f"Selected columns: {', '.join(selected_columns)}", ""]
         
         # Suggest a name for the new column based on selection
         if len(selected_columns) > 0 and not self.new_column_var.get():
@@ -510,29 +541,38 @@ class ManualMergeWindow:
         # Show sample data if available
         try:
             if self.sheet_name in self.merger.current_sheets:
-                df = self.merger.current_sheets[self.sheet_name]
-                if all(col in df.columns for col in selected_columns):
-                    sample_data = df[selected_columns].head(3)
-                    self.preview_text.insert(tk.END, "Sample data (first 3 rows):\n")
-                    for i, row in sample_data.iterrows():
-                        row_display = ", ".join([f"{col}: {row[col]}" for col in selected_columns])
-                        self.preview_text.insert(tk.END, f"Row {i+1}: {row_display}\n")
+                sample = self.get_preview_sample()
+                if all(col in sample.columns for col in selected_columns):
+                    sample_data = sample[selected_columns]
+                    lines.append(f"Sample data (first {self.PREVIEW_ROWS} rows):")
+                    for i, row in enumerate(sample_data.itertuples(index=False), start=1):
+                        row_display = ", ".join(f"{col}: {value}" for col, value in zip(selected_columns, row))
+                        lines.append(f"Row {i}: {row_display}")
                     
-                    # If "Stack Values" strategy is selected, show a preview of how it would look
-                    if self.strategy_var.get() == "stack_values":
-                        self.preview_text.insert(tk.END, "\nStack Values Preview (will create new rows):\n")
-                        stack_preview = []
-                        for i, row in sample_data.iterrows():
-                            for col in selected_columns:
-                                if pd.notna(row[col]) and row[col] != "":
-                                    stack_preview.append(f"{row[col]}")
+                    # Show what the selected strategy would produce for the sample rows
+                    strategy = self.strategy_var.get()
+                    if strategy == "stack_values":
+                        lines.append("")
+                        lines.append("Stack Values Preview (will create new rows):")
+                        stacked = self.merger.stack_values(sample_data, selected_columns, "__preview__")
+                        stack_preview = stacked["__preview__"].dropna().tolist()
                         
                         for i, val in enumerate(stack_preview[:5]):  # Show first 5 values
-                            self.preview_text.insert(tk.END, f"New Row {i+1}: {val}\n")
+                            lines.append(f"New Row {i+1}: {val}")
                         
                         if len(stack_preview) > 5:
-                            self.preview_text.insert(tk.END, "... (more rows will be created)\n")
+                            lines.append("... (more rows will be created)")
+                    elif len(selected_columns) > 1:
+                        merged = self.merger.merge_values(sample_data, selected_columns, strategy)
+                        if merged is not None:
+                            lines.append("")
+                            lines.append("Merged Values Preview:")
+                            for i, val in enumerate(merged.tolist(), start=1):
+                                lines.append(f"Row {i}: {val}")
+            
+            self.preview_text.insert(tk.END, "\n".join(lines) + "\n")
         except Exception as e:
+            self.preview_text.insert(tk.END, "\n".join(lines) + "\n")
             self.preview_text.insert(tk.END, f"Error previewing data: {str(e)}")
     
     def merge_selected(self):
@@ -570,6 +610,9 @@ class ManualMergeWindow:
             # Perform the merge
             strategy = self.strategy_var.get()
             
+            # The sheet is about to change, even if the merge fails half-way
+            self.invalidate_preview()
+            
             # Handle stack_values strategy separately
             if strategy == "stack_values":
                 result, empty_cols, rows_added = self.stack_values_merge(
@@ -675,62 +718,15 @@ class ManualMergeWindow:
                 messagebox.showerror("Error", "One or more selected columns don't exist in the sheet")
                 return False, [], 0
             
-            # First, let's create a map of indices where each column has data
-            columns_data = {}
-            for col in columns:
-                # Get indices where the column has data (not empty or NA)
-                has_data = df[col].notna() & (df[col].astype(str).str.strip() != "")
-                columns_data[col] = set(df.index[has_data])
-            
-            # Get all indices where at least one column has data
-            all_data_indices = set()
-            for indices in columns_data.values():
-                all_data_indices.update(indices)
-            
-            # Create a new dataframe with the same schema as the original, but empty
-            non_merge_cols = [c for c in df.columns if c not in columns]
-            
-            # Build the result dataframe as a list of rows and then convert to DataFrame at the end
-            # This avoids the FutureWarning from pandas
-            result_rows = []
-            
-            # For each row in the original dataframe
-            for idx in df.index:
-                row_data = df.loc[idx]
-                
-                # Create a base row with all non-merge columns
-                base_row = {c: row_data[c] for c in non_merge_cols}
-                
-                # Count how many values we added for this row
-                values_added = 0
-                
-                # For each merge column, add its value if non-empty
-                for col in columns:
-                    if idx in columns_data[col]:  # Column has data at this index
-                        new_row = base_row.copy()
-                        new_row[new_column_name] = row_data[col]
-                        # Add the new row to our results list
-                        result_rows.append(new_row)
-                        values_added += 1
-                
-                # If no values were added and we want to preserve row structure
-                if values_added == 0:
-                    # Add a row with empty value in the merged column
-                    base_row[new_column_name] = None
-                    result_rows.append(base_row)
-            
-            # Convert the list of rows to a DataFrame
-            result_df = pd.DataFrame(result_rows)
-            
-            # If the result is empty, create an empty DataFrame with the correct columns
-            if result_df.empty:
-                result_df = pd.DataFrame(columns=non_merge_cols + [new_column_name])
+            # Stack the values with the same kernel the merger uses
+            result_df = self.merger.stack_values(df, columns, new_column_name)
             
             # Calculate how many new rows were added
             rows_added = len(result_df) - len(df)
             
             # Apply the changes to the sheet
             self.merger.current_sheets[sheet_name] = result_df
+            self.invalidate_preview()
             
             # Track empty columns if needed
             empty_cols = []